@@ -6,6 +6,10 @@ from PySide6.QtGui import QIcon, QMouseEvent
 from PySide6.QtWidgets import QWidget, QLabel, QApplication
 from browser_window import BrowserWindow  # Import BrowserWindow from the other module
 
+# window_group.py is shared with the Production app
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Production"))
+from window_group import WindowGroup
+
 def resource_path(relative_path):
     """Get the absolute path to a resource, considering if running from PyInstaller bundle."""
     if hasattr(sys, '_MEIPASS'):
@@ -31,23 +35,10 @@ class DraggableIcon(QWidget):
         self.icon_label.setPixmap(QIcon(image2_path).pixmap(50, 50))
         self.icon_label.setScaledContents(True)
 
-        self.start_position = None
         self.browser_window = None
-
-    def mousePressEvent(self, event: QMouseEvent):
-        if event.button() == Qt.LeftButton:
-            self.start_position = event.globalPos() - self.frameGeometry().topLeft()
-
-    def mouseMoveEvent(self, event: QMouseEvent):
-        if self.start_position is not None and event.buttons() == Qt.LeftButton:
-            new_position = event.globalPos() - self.start_position
-            self.move(new_position)
-            # Move the browser window together with the icon
-            if self.browser_window is not None and self.browser_window.isVisible():
-                self.browser_window.move(new_position.x() + self.width(), new_position.y())
-
-    def mouseReleaseEvent(self, event: QMouseEvent):
-        pass
+        # Moves the icon and the browser as one unit, once per display frame
+        self.window_group = WindowGroup(self, self)
+        self.window_group.add_handle(self)
 
     def mouseDoubleClickEvent(self, event: QMouseEvent):
         if self.browser_window is None:
@@ -62,12 +53,9 @@ class DraggableIcon(QWidget):
         browser_geometry = self.geometry()
         browser_geometry.setRect(x + self.width(), y, 400, 400)
         self.browser_window = BrowserWindow(browser_geometry, self)  # Pass the icon instance
+        # Follow the browser's title bar too; the group ignores the moves it makes itself
+        self.window_group.attach(self.browser_window, follow=True)
         self.browser_window.show()
 
-    def moveEvent(self, event):
-        if self.browser_window is not None and self.browser_window.isVisible():
-            # Ensure the browser window moves with the icon
-            self.browser_window.move(self.x() + self.width(), self.y())
-
     def close_application(self):
         QApplication.quit()  # Ensure the application closes fully
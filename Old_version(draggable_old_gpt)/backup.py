@@ -24,6 +24,10 @@ from PySide6.QtWebEngineWidgets import QWebEngineView
 import sys
 import os
 
+# window_group.py is shared with the Production app
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Production"))
+from window_group import WindowGroup
+
 def resource_path(relative_path):
     """Get the absolute path to a resource, considering if running from PyInstaller bundle."""
     if hasattr(sys, '_MEIPASS'):
@@ -50,23 +54,10 @@ class DraggableIcon(QWidget):
         self.icon_label.setPixmap(QIcon(image2_path).pixmap(50, 50))
         self.icon_label.setScaledContents(True)
 
-        self.start_position = None
         self.browser_window = None
-
-    def mousePressEvent(self, event: QMouseEvent):
-        if event.button() == Qt.LeftButton:
-            self.start_position = event.globalPos() - self.frameGeometry().topLeft()
-
-    def mouseMoveEvent(self, event: QMouseEvent):
-        if self.start_position is not None and event.buttons() == Qt.LeftButton:
-            new_position = event.globalPos() - self.start_position
-            self.move(new_position)
-            # Move the browser window together with the icon
-            if self.browser_window is not None and self.browser_window.isVisible():
-                self.browser_window.move(new_position.x() + self.width(), new_position.y())
-
-    def mouseReleaseEvent(self, event: QMouseEvent):
-        pass
+        # Moves the icon and the browser as one unit, once per display frame
+        self.window_group = WindowGroup(self, self)
+        self.window_group.add_handle(self)
 
     def mouseDoubleClickEvent(self, event: QMouseEvent):
         if self.browser_window is None:
@@ -81,13 +72,10 @@ class DraggableIcon(QWidget):
         browser_geometry = self.geometry()
         browser_geometry.setRect(x + self.width(), y, 400, 400)
         self.browser_window = BrowserWindow(browser_geometry, self)  # Pass the icon instance
+        # Follow the browser's title bar too; the group ignores the moves it makes itself
+        self.window_group.attach(self.browser_window, follow=True)
         self.browser_window.show()
 
-    def moveEvent(self, event):
-        if self.browser_window is not None and self.browser_window.isVisible():
-            # Ensure the browser window moves with the icon
-            self.browser_window.move(self.x() + self.width(), self.y())
-
     def close_application(self):
         QApplication.quit()  # Ensure the application closes fully
 
@@ -154,8 +142,8 @@ class BrowserWindow(QMainWindow):
         self.setGeometry(geometry)
 
         self.draggable_icon = draggable_icon  # Reference to the draggable icon
-        self.is_dragging = False
-        self.drag_position = QPoint()
+        # Dragging the window's background moves it together with the icon
+        draggable_icon.window_group.add_handle(self)
 
         # Set the title and icon
         self.setWindowTitle("EverywearGPT")
@@ -241,24 +229,6 @@ class BrowserWindow(QMainWindow):
         dialog = CreatePromptDialog(self)
         dialog.exec()
 
-    def mousePressEvent(self, event: QMouseEvent):
-        if event.button() == Qt.LeftButton:
-            self.is_dragging = True
-            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
-
-    def mouseMoveEvent(self, event: QMouseEvent):
-        if self.is_dragging and event.buttons() == Qt.LeftButton:
-            new_position = event.globalPos() - self.drag_position
-            self.move(new_position)
-
-    def mouseReleaseEvent(self, event: QMouseEvent):
-        self.is_dragging = False
-
-    def moveEvent(self, event):
-        # Ensure the draggable icon moves with the browser window
-        if self.draggable_icon is not None:
-            self.draggable_icon.move(self.x() - self.draggable_icon.width(), self.y())
-
     def closeEvent(self, event):
         # Close the entire application when the browser window is closed
         self.draggable_icon.close_application()
@@ -0,0 +1,139 @@
+# batch_validate.py
+"""Validate a list of tokens against server.py's /validate_tokens endpoint.
+
+Reads one token per line (from a file or stdin), sends them in batches over a pool
+of HTTP connections and writes ``line,token_sha256,valid`` rows as results stream in:
+
+    python batch_validate.py tokens.txt --batch-size 2000 --concurrency 8 -o results.csv
+
+The endpoint needs the server's admin token, passed with --admin-token or PROMPT_ADMIN_TOKEN.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SERVER_URL = "http://127.0.0.1:1111/validate_tokens"
+MAX_ATTEMPTS = 6  # Per batch, while the server answers 429
+MAX_BACKOFF = 30  # Seconds
+
+
+def read_tokens(path):
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        return [line.strip() for line in stream if line.strip()]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def make_session(pool_size, admin_token=None):
+    session = requests.Session()
+    if admin_token:
+        session.headers["X-Admin-Token"] = admin_token
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=2)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def validate_batch(session, url, tokens, offset, on_result, timeout):
+    """Send one batch and call ``on_result(position, valid)`` for every streamed line."""
+    for attempt in range(MAX_ATTEMPTS):
+        response = session.post(url, json={"tokens": tokens}, stream=True, timeout=timeout)
+        if response.status_code != 429 or attempt == MAX_ATTEMPTS - 1:
+            break
+        response.close()
+        time.sleep(retry_delay(response, attempt))
+
+    # A batch still rate limited after the last attempt fails like any other HTTP error
+    with response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                result = json.loads(line)
+                on_result(offset + result["index"], result["valid"])
+
+
+def retry_delay(response, attempt):
+    """Seconds to wait before retrying: the server's Retry-After, but at least an exponential backoff."""
+    try:
+        retry_after = float(response.headers.get("Retry-After", 0))
+    except ValueError:
+        retry_after = 0  # An HTTP date; the backoff is close enough
+    return min(MAX_BACKOFF, max(retry_after, 2 ** attempt))
+
+
+def token_hash(token):
+    """SHA-256 of the token, as stored in server.py's token table."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate many license tokens in batches")
+    parser.add_argument("tokens", help="File with one token per line, or - for stdin")
+    parser.add_argument("--url", default=SERVER_URL)
+    parser.add_argument("--admin-token", default=os.environ.get("PROMPT_ADMIN_TOKEN"),
+                        help="The server's admin token (default: $PROMPT_ADMIN_TOKEN)")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8, help="Batches in flight (and pooled connections)")
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("-o", "--output", help="CSV file for per-token results (default: stdout)")
+    args = parser.parse_args()
+
+    tokens = read_tokens(args.tokens)
+    if not args.admin_token:
+        parser.error("--admin-token or PROMPT_ADMIN_TOKEN is required")
+    session = make_session(args.concurrency, args.admin_token)
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    writer = csv.writer(output)
+    writer.writerow(["line", "token_sha256", "valid"])
+
+    lock = threading.Lock()
+    counts = {"valid": 0, "invalid": 0}
+
+    def on_result(position, valid):
+        with lock:
+            counts["valid" if valid else "invalid"] += 1
+            # Result files never contain tokens; the hash still finds the row in the server's database
+            writer.writerow([position + 1, token_hash(tokens[position]), valid])
+
+    start = time.perf_counter()
+    failed_batches = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [
+            executor.submit(validate_batch, session, args.url, tokens[offset:offset + args.batch_size],
+                            offset, on_result, args.timeout)
+            for offset in range(0, len(tokens), args.batch_size)
+        ]
+        for future in futures:
+            try:
+                future.result()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                failed_batches += 1
+                print(f"Batch failed: {e}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    if output is not sys.stdout:
+        output.close()
+
+    checked = counts["valid"] + counts["invalid"]
+    print(
+        f"Checked {checked}/{len(tokens)} tokens in {elapsed:.2f}s "
+        f"({checked / elapsed if elapsed else 0:.0f} tokens/s): "
+        f"{counts['valid']} valid, {counts['invalid']} invalid, {failed_batches} failed batches",
+        file=sys.stderr,
+    )
+    return 1 if failed_batches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
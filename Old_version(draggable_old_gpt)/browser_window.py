@@ -95,8 +95,8 @@ class BrowserWindow(QMainWindow):
         self.setGeometry(geometry)
 
         self.draggable_icon = draggable_icon  # Reference to the draggable icon
-        self.is_dragging = False
-        self.drag_position = QPoint()
+        # Dragging the window's background moves it together with the icon
+        draggable_icon.window_group.add_handle(self)
 
         # Set the title and icon
         self.setWindowTitle("✨ EverywearGPT ✨")
@@ -231,24 +231,6 @@ class BrowserWindow(QMainWindow):
         # Set the browser window size to large
         self.setFixedSize(900,750)
 
-    def mousePressEvent(self, event: QMouseEvent):
-        if event.button() == Qt.LeftButton:
-            self.is_dragging = True
-            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
-
-    def mouseMoveEvent(self, event: QMouseEvent):
-        if self.is_dragging and event.buttons() == Qt.LeftButton:
-            new_position = event.globalPos() - self.drag_position
-            self.move(new_position)
-
-    def mouseReleaseEvent(self, event: QMouseEvent):
-        self.is_dragging = False
-
-    def moveEvent(self, event):
-        # Ensure the draggable icon moves with the browser window
-        if self.draggable_icon is not None:
-            self.draggable_icon.move(self.x() - self.draggable_icon.width(), self.y())
-
     def closeEvent(self, event):
         # Close the entire application when the browser window is closed
         self.draggable_icon.close_application()
\ No newline at end of file
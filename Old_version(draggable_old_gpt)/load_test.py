@@ -0,0 +1,87 @@
+# load_test.py
+"""Load test for the /validate_token endpoint of server.py.
+
+Start the server locally first, for example with rate limiting disabled since every
+simulated client shares the same address:
+
+    python server.py --add-token sanyam
+    python server.py --rate-limit 0 --workers 64
+    python load_test.py --clients 1000 --requests 20000 --token sanyam
+"""
+import argparse
+import asyncio
+import json
+import time
+from collections import Counter
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def send_request(host, port, body):
+    """POST one request over a fresh connection and return the HTTP status code."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"POST /validate_token HTTP/1.0\r\n"
+            f"Host: {host}:{port}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()  # HTTP/1.0: the server closes the connection after the body
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def client(host, port, body, remaining, latencies, statuses, timeout):
+    while remaining[0] > 0:
+        remaining[0] -= 1
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(send_request(host, port, body), timeout)
+        except (OSError, asyncio.TimeoutError, IndexError, ValueError) as e:
+            status = type(e).__name__
+        latencies.append(time.perf_counter() - start)
+        statuses[status] += 1
+
+
+async def run(host, port, clients, total_requests, token, timeout):
+    body = json.dumps({"token": token}).encode()
+    remaining = [total_requests]
+    latencies = []
+    statuses = Counter()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, body, remaining, latencies, statuses, timeout) for _ in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"Clients:      {clients}")
+    print(f"Requests:     {len(latencies)} in {elapsed:.2f}s")
+    print(f"Throughput:   {len(latencies) / elapsed:.1f} req/s")
+    print(f"Latency p50:  {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"Latency p99:  {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"Latency max:  {latencies[-1] * 1000:.1f} ms" if latencies else "Latency max:  -")
+    print("Statuses:     " + ", ".join(f"{status}={count}" for status, count in statuses.most_common()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the token validation endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1111)
+    parser.add_argument("--clients", type=int, default=1000, help="Number of concurrent clients")
+    parser.add_argument("--requests", type=int, default=20000, help="Total number of requests")
+    parser.add_argument("--token", default="sanyam")
+    parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout in seconds")
+    args = parser.parse_args()
+
+    asyncio.run(run(args.host, args.port, args.clients, args.requests, args.token, args.timeout))
@@ -2,13 +2,20 @@
 import sys
 import os
 import json
-import requests
+import time
 from PySide6.QtWidgets import QApplication, QDialog, QLabel, QLineEdit, QPushButton, QVBoxLayout, QMessageBox
 from Icon import DraggableIcon
 
+# license_token.py and license_revalidator.py are shared with the Production app
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Production"))
+from license_token import is_signed_token, verify_license
+from license_revalidator import LicenseRevalidator, revalidate_token
+
 # Configuration
 SERVER_URL = "http://127.0.0.1:1111/validate_token"  # Replace with actual server API
 TOKEN_FILE = "token.json"  # Local storage for authenticated users
+# How long a token the server last confirmed is trusted at launch without asking again
+LICENSE_GRACE_PERIOD = int(os.environ.get("LICENSE_GRACE_PERIOD", 7 * 24 * 60 * 60))
 
 
 # First check if token file exists or not and check its validity
@@ -22,7 +29,18 @@ def validate_token_from_file():
 
             # Ensure token_data contains "token" key
             if "token" in token_data:
-                validity_response = check_token_validity(token_data["token"])
+                # Signed licenses and recently verified tokens are trusted right away;
+                # the server is only asked in the background once the app is up
+                if is_signed_token(token_data["token"]):
+                    validity_response = verify_license(token_data["token"]) is not None
+                elif is_recently_verified(token_data):
+                    validity_response = True
+                else:
+                    validity_response = revalidate_token(token_data["token"], SERVER_URL)
+                    if validity_response is None:
+                        return 2  # Server unreachable; launch and let the background check decide
+                    if validity_response:
+                        save_token(token_data["token"])
                 if validity_response:
                     return 1  # Valid token
                 else:
@@ -42,17 +60,50 @@ def validate_token_from_file():
         return 0  # File does not exist
 
 
+def is_recently_verified(token_data):
+    last_verified = token_data.get("last_verified")
+    if not isinstance(last_verified, (int, float)):
+        return False
+    return 0 <= time.time() - last_verified < LICENSE_GRACE_PERIOD
+
+
+def save_token(token):
+    """Store the token together with the time the server last confirmed it."""
+    tmp_file = TOKEN_FILE + ".tmp"
+    with open(tmp_file, "w") as file:
+        json.dump({"token": token, "last_verified": time.time()}, file)
+    os.replace(tmp_file, TOKEN_FILE)
+
+
 def check_token_validity(token):
     """Check the token with the server."""
-    try:
-        response = requests.post(SERVER_URL, json={"token": token}, timeout=5)
+    return revalidate_token(token, SERVER_URL) is True
+
+
+def on_license_revoked():
+    if os.path.exists(TOKEN_FILE):
+        os.remove(TOKEN_FILE)
+    QMessageBox.critical(None, "License Revoked", "Your access token is no longer valid.")
+    QApplication.quit()
 
-        if response.status_code == 200 and response.json().get("valid") == "success":
-            return True
-    except requests.exceptions.RequestException as e:
-        print(f"Server connection error: {e}")
-    
-    return False
+
+def launch(app, token):
+    """Show the icon and keep checking the license in the background."""
+    icon = DraggableIcon()
+    icon.show()
+
+    revalidator = LicenseRevalidator(token, SERVER_URL)
+    revalidator.revoked.connect(on_license_revoked)
+    revalidator.confirmed.connect(lambda: save_token(token))
+    app.aboutToQuit.connect(revalidator.stop)
+    revalidator.start()
+
+    sys.exit(app.exec())
+
+
+def read_saved_token():
+    with open(TOKEN_FILE, "r") as file:
+        return json.load(file)["token"]
 
 
 class AuthWindow(QDialog):
@@ -82,10 +133,14 @@ class AuthWindow(QDialog):
             QMessageBox.warning(self, "Error", "Token cannot be empty!")
             return
 
-        if check_token_validity(token):
+        if is_signed_token(token):
+            token_valid = verify_license(token) is not None
+        else:
+            token_valid = check_token_validity(token)
+
+        if token_valid:
             # Save the validated token
-            with open(TOKEN_FILE, "w") as file:
-                json.dump({"token": token}, file)
+            save_token(token)
 
             self.accept()  # Close auth window and start main app
         else:
@@ -99,17 +154,21 @@ if __name__ == "__main__":
 
     # Case 1: If token is valid, launch the main app
     if result == 1:
-        icon = DraggableIcon()
-        icon.show()
-        sys.exit(app.exec())
+        launch(app, read_saved_token())
+
+    # Case 2: If the server could not be reached, launch anyway; only the server revokes a token
+    elif result == 2:
+        print("License server unreachable. Starting with the saved token; it will be checked in the background.")
+        launch(app, read_saved_token())
 
-    # Case 2: If token file does not exist, show auth window
+    # Case 3: If token file does not exist, show auth window
     elif result == 0:
         auth_window = AuthWindow()
         if auth_window.exec() != QDialog.Accepted:
             sys.exit(0)  # Exit if authentication fails
+        launch(app, read_saved_token())
 
-    # Case 3: If token is invalid, delete file and exit
+    # Case 4: If token is invalid, delete file and exit
     elif result == -1:
         print("Invalid token. Exiting...")
         sys.exit(0)
@@ -1,20 +1,489 @@
-from flask import Flask , request , jsonify
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask , request , jsonify , g , Response , stream_with_context
+from werkzeug.serving import BaseWSGIServer
+
+# license_token.py is shared with the Production app
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "Production"))
+from license_token import (DEFAULT_LICENSE_DAYS, SIGNING_KEY_FILE, generate_signing_key, issue_license,
+                           is_signed_token, verify_license)
 
 
 
 app = Flask(__name__)
 
+# Configuration
+DATABASE_FILE = "server.db"
+# Required for publishing prompts and batch validation; both are disabled when unset
+PROMPT_ADMIN_TOKEN = os.environ.get("PROMPT_ADMIN_TOKEN")
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_CHANGES_PER_REQUEST = 500
+GZIP_MIN_SIZE = 500  # Bytes; smaller bodies are not worth compressing
+VALIDATION_CACHE_SIZE = 10_000
+VALIDATION_CACHE_TTL = 60  # Seconds before a cached result is re-read from the database
+RATE_LIMIT_PER_SECOND = 5  # Sustained validations per client; 0 disables rate limiting
+RATE_LIMIT_BURST = 20
+MAX_BATCH_SIZE = 10_000  # Tokens accepted by one /validate_tokens request
+BATCH_QUERY_SIZE = 500  # Token hashes looked up per SQL query (below SQLite's variable limit)
+
+PROMPT_NAME_PATTERN = re.compile(r"^[\w\- .]{1,100}$")
+RESERVED_PROMPT_NAMES = {"changes"}  # Paths under /prompts/ served by other routes
+
+
+def get_db():
+    """Return the SQLite connection for the current request."""
+    if "db" not in g:
+        g.db = sqlite3.connect(DATABASE_FILE, timeout=10)
+        g.db.row_factory = sqlite3.Row
+    return g.db
+
+
+@app.teardown_appcontext
+def close_db(exception):
+    db = g.pop("db", None)
+    if db is not None:
+        db.close()
+
+
+def init_db():
+    """Create the tables used by the server if they do not exist yet."""
+    with sqlite3.connect(DATABASE_FILE) as db:
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS prompts (
+                name TEXT PRIMARY KEY,
+                content TEXT NOT NULL,
+                etag TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS prompts_seq ON prompts (seq)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS tokens (
+                token_hash TEXT PRIMARY KEY,
+                label TEXT,
+                created_at REAL NOT NULL,
+                revoked INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+
+def hash_token(token):
+    """Tokens are never stored in plain text; only their SHA-256 digest is kept."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.ttl)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def pop(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+class RateLimiter:
+    """Token bucket per client address."""
+
+    def __init__(self, rate, burst, max_clients=100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def allow(self, client):
+        if self.rate <= 0:
+            return True
+        now = time.monotonic()
+        with self.lock:
+            tokens, last = self.buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if len(self.buckets) >= self.max_clients and client not in self.buckets:
+                self.buckets.clear()  # Crude but bounded; idle clients simply start with a full bucket
+            self.buckets[client] = (tokens, now)
+            return allowed
+
+
+validation_cache = LRUCache(VALIDATION_CACHE_SIZE, VALIDATION_CACHE_TTL)
+rate_limiter = RateLimiter(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+
+
+def is_token_valid(token):
+    # Signed licenses carry their own expiry; reject forged or expired ones before any lookup
+    if is_signed_token(token) and verify_license(token) is None:
+        return False
+
+    token_hash = hash_token(token)
+    valid = validation_cache.get(token_hash)
+    if valid is None:
+        row = get_db().execute("SELECT revoked FROM tokens WHERE token_hash = ?", (token_hash,)).fetchone()
+        valid = row is not None and not row["revoked"]
+        validation_cache.put(token_hash, valid)
+    return valid
+
+
+def validate_token_batch(tokens):
+    """Yield (index, valid) for a chunk of tokens, using one query for all cache misses."""
+    results = {}
+    misses = {}
+    for index, token in tokens:
+        if not isinstance(token, str) or not token or (is_signed_token(token) and verify_license(token) is None):
+            results[index] = False
+            continue
+        token_hash = hash_token(token)
+        valid = validation_cache.get(token_hash)
+        if valid is None:
+            misses.setdefault(token_hash, []).append(index)
+        else:
+            results[index] = valid
+
+    if misses:
+        placeholders = ",".join("?" * len(misses))
+        rows = get_db().execute(
+            f"SELECT token_hash, revoked FROM tokens WHERE token_hash IN ({placeholders})", list(misses)
+        ).fetchall()
+        found = {row["token_hash"]: not row["revoked"] for row in rows}
+        for token_hash, indexes in misses.items():
+            valid = found.get(token_hash, False)
+            validation_cache.put(token_hash, valid)
+            for index in indexes:
+                results[index] = valid
+
+    for index, _ in tokens:
+        yield index, results[index]
+
+
+def add_token(token, label=None):
+    with sqlite3.connect(DATABASE_FILE) as db:
+        db.execute(
+            "INSERT OR REPLACE INTO tokens (token_hash, label, created_at, revoked) VALUES (?, ?, ?, 0)",
+            (hash_token(token), label, time.time()),
+        )
+    validation_cache.pop(hash_token(token))
+
+
+def revoke_token(token):
+    with sqlite3.connect(DATABASE_FILE) as db:
+        db.execute("UPDATE tokens SET revoked = 1 WHERE token_hash = ?", (hash_token(token),))
+    validation_cache.pop(hash_token(token))
+
+
+def prompt_etag(content):
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:32]
+
+
+def is_admin_request():
+    return bool(PROMPT_ADMIN_TOKEN) and request.headers.get("X-Admin-Token") == PROMPT_ADMIN_TOKEN
+
+
+def json_object():
+    """The request body if it is a JSON object, else None."""
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else None
+
+
+def int_arg(name, default, minimum, maximum):
+    try:
+        value = int(request.args.get(name, default))
+    except ValueError:
+        value = default
+    return max(minimum, min(value, maximum))
+
+
+def write_prompt(name, content, deleted):
+    """Insert, update or tombstone a prompt under the next change sequence number."""
+    db = get_db()
+    db.execute("BEGIN IMMEDIATE")
+    try:
+        seq = db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM prompts").fetchone()[0]
+        db.execute(
+            "INSERT OR REPLACE INTO prompts (name, content, etag, seq, deleted, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (name, content, prompt_etag(content), seq, int(deleted), time.time()),
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return seq
+
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON bodies for clients that accept it."""
+    accept_encoding = request.headers.get("Accept-Encoding", "").lower()
+    if (
+        "gzip" not in accept_encoding
+        or response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
 
 @app.route("/validate_token", methods = ['POST'])
 def validate_token():
-    token = request.json['token']
+    if not rate_limiter.allow(request.remote_addr):
+        return jsonify({"error" : "Too many requests"}), 429, {"Retry-After": "1"}
 
-    if token == "sanyam":
-        print("Success")
+    data = json_object()
+    if data is None:
+        return jsonify({"error": "Expected a JSON object"}), 400
+    token = data.get("token")
+
+    if isinstance(token, str) and token and is_token_valid(token):
         return jsonify({"valid" : "success"}) , 200
     else:
         return jsonify({"Invalid" : "Fail"}), 400
 
+
+@app.route("/validate_tokens", methods=["POST"])
+def validate_tokens():
+    """Validate many tokens at once, streaming one JSON line per token back as results are ready.
+
+    Admin only: one request checks up to MAX_BATCH_SIZE tokens, which would let any client
+    guess tokens far faster than the per-client rate limit allows on /validate_token.
+    """
+    if not is_admin_request():
+        return jsonify({"error": "Not allowed"}), 403
+    if not rate_limiter.allow(request.remote_addr):
+        return jsonify({"error" : "Too many requests"}), 429, {"Retry-After": "1"}
+
+    data = json_object()
+    tokens = data.get("tokens") if data is not None else None
+    if not isinstance(tokens, list):
+        return jsonify({"error": "Expected a list of tokens"}), 400
+    if len(tokens) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"At most {MAX_BATCH_SIZE} tokens per request"}), 413
+
+    def generate():
+        indexed = list(enumerate(tokens))
+        for start in range(0, len(indexed), BATCH_QUERY_SIZE):
+            chunk = indexed[start:start + BATCH_QUERY_SIZE]
+            yield "".join(
+                json.dumps({"index": index, "valid": valid}) + "\n"
+                for index, valid in validate_token_batch(chunk)
+            )
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+@app.route("/prompts", methods=["GET"])
+def list_prompts():
+    """Paginated listing of live prompts, ordered by name."""
+    page = int_arg("page", 1, 1, 1_000_000)
+    per_page = int_arg("per_page", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+    db = get_db()
+
+    cursor = db.execute("SELECT COALESCE(MAX(seq), 0) FROM prompts").fetchone()[0]
+    etag = f"catalog-{cursor}-{page}-{per_page}"
+    if request.if_none_match.contains_weak(etag):
+        return "", 304, {"ETag": f'W/"{etag}"'}
+
+    total = db.execute("SELECT COUNT(*) FROM prompts WHERE deleted = 0").fetchone()[0]
+    rows = db.execute(
+        "SELECT name, content, etag, seq FROM prompts WHERE deleted = 0 ORDER BY name LIMIT ? OFFSET ?",
+        (per_page, (page - 1) * per_page),
+    ).fetchall()
+
+    response = jsonify({
+        "prompts": [dict(row) for row in rows],
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "cursor": cursor,
+    })
+    response.set_etag(etag, weak=True)
+    return response
+
+
+@app.route("/prompts/changes", methods=["GET"])
+def prompt_changes():
+    """Every prompt written or deleted after the ``since`` cursor, oldest first."""
+    since = int_arg("since", 0, 0, 2**62)
+    limit = int_arg("limit", MAX_CHANGES_PER_REQUEST, 1, MAX_CHANGES_PER_REQUEST)
+
+    rows = get_db().execute(
+        "SELECT name, content, etag, seq, deleted FROM prompts WHERE seq > ? ORDER BY seq LIMIT ?",
+        (since, limit + 1),
+    ).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changes = []
+    for row in rows:
+        change = dict(row)
+        change["deleted"] = bool(change["deleted"])
+        if change["deleted"]:
+            change["content"] = None
+        changes.append(change)
+
+    return jsonify({
+        "changes": changes,
+        "cursor": rows[-1]["seq"] if rows else since,
+        "has_more": has_more,
+    })
+
+
+@app.route("/prompts/<name>", methods=["GET"])
+def get_prompt(name):
+    row = get_db().execute(
+        "SELECT name, content, etag, seq FROM prompts WHERE name = ? AND deleted = 0", (name,)
+    ).fetchone()
+    if row is None:
+        return jsonify({"error": "Prompt not found"}), 404
+
+    if request.if_none_match.contains_weak(row["etag"]):
+        return "", 304, {"ETag": f'W/"{row["etag"]}"'}
+
+    response = jsonify(dict(row))
+    response.set_etag(row["etag"], weak=True)
+    return response
+
+
+@app.route("/prompts/<name>", methods=["PUT", "DELETE"])
+def publish_prompt(name):
+    if not is_admin_request():
+        return jsonify({"error": "Not allowed"}), 403
+    if not PROMPT_NAME_PATTERN.match(name) or ".." in name or name in RESERVED_PROMPT_NAMES:
+        return jsonify({"error": "Invalid prompt name"}), 400
+
+    if request.method == "DELETE":
+        seq = write_prompt(name, "", deleted=True)
+    else:
+        data = json_object()
+        content = data.get("content") if data is not None else None
+        if not isinstance(content, str):
+            return jsonify({"error": "Missing prompt content"}), 400
+        seq = write_prompt(name, content, deleted=False)
+
+    return jsonify({"name": name, "seq": seq}), 200
+
+
+class PooledWSGIServer(BaseWSGIServer):
+    """WSGI server that hands each connection to a fixed pool of worker threads.
+
+    Connections are closed after every response (HTTP/1.0), so a worker is never parked
+    on an idle keep-alive client and the pool size bounds the server's thread count.
+    """
+
+    request_queue_size = 1024  # Listen backlog for bursts of new connections
+
+    def __init__(self, host, port, app, workers=32):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wsgi-worker")
+        super().__init__(host, port, app)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
+init_db()
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EverywearAI license and prompt server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=1111)
+    parser.add_argument("--workers", type=int, default=32, help="Size of the request worker pool")
+    parser.add_argument("--rate-limit", type=float, default=RATE_LIMIT_PER_SECOND,
+                        help="Validations per second allowed per client (0 disables the limit)")
+    parser.add_argument("--add-token", metavar="TOKEN", help="Store a license token and exit")
+    parser.add_argument("--revoke-token", metavar="TOKEN",
+                        help="Revoke a license token and exit; a running server keeps accepting it until its "
+                             f"cached result expires (up to {VALIDATION_CACHE_TTL} seconds)")
+    parser.add_argument("--label", help="Label stored alongside --add-token")
+    parser.add_argument("--issue-license", metavar="SUBJECT",
+                        help="Issue a signed, offline-verifiable license token, store it and print it")
+    parser.add_argument("--days", type=int, default=DEFAULT_LICENSE_DAYS, help="Validity of --issue-license")
+    parser.add_argument("--generate-license-key", action="store_true",
+                        help=f"Create the license signing key in {SIGNING_KEY_FILE} and print the public key "
+                             "to put in license_token.PUBLIC_KEY")
+    args = parser.parse_args()
 
-    app.run(host="0.0.0.0" , port=1111 , debug=False)
\ No newline at end of file
+    if args.add_token:
+        add_token(args.add_token, args.label)
+        print("Token added")
+    elif args.generate_license_key:
+        try:
+            print(generate_signing_key())
+        except FileExistsError:
+            sys.exit(f"{SIGNING_KEY_FILE} already exists; move it away first to rotate the key")
+    elif args.issue_license:
+        token = issue_license(args.issue_license, days=args.days)
+        add_token(token, args.issue_license)
+        print(token)
+    elif args.revoke_token:
+        revoke_token(args.revoke_token)
+        print("Token revoked")
+    else:
+        rate_limiter.rate = args.rate_limit
+        server = PooledWSGIServer(args.host, args.port, app, workers=args.workers)
+        print(f"Serving on {args.host}:{args.port} with {args.workers} workers")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
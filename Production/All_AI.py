@@ -1,17 +1,44 @@
 import sys
 import os
+import json
+from collections import deque
 import requests
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                               QPushButton, QLabel, QGraphicsOpacityEffect, QMenu, QLineEdit, 
                               QTextEdit, QFileDialog, QDialog, QListWidget, QListWidgetItem,
-                              QSplitter, QTextBrowser, QMessageBox)
+                              QSplitter, QTextBrowser, QMessageBox, QStackedLayout)
 from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtGui import QPixmap, QClipboard
-from PySide6.QtCore import Qt, QUrl, QRect, QPropertyAnimation, QEasingCurve, QTimer, QSize
+from PySide6.QtGui import QClipboard, QColor, QPainterPath, QPalette, QRegion
+from PySide6.QtCore import Qt, QUrl, QRect, QRectF, QPropertyAnimation, QEasingCurve, QTimer, QSize, QThread, Signal
 from PySide6.QtGui import QAction
-from PySide6.QtWebEngineCore import QWebEngineProfile
+from PySide6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage, QWebEngineScript
 import hashlib
+import html
+import time
 import uuid
+from prompt_sync import PromptSyncClient
+from license_token import is_signed_token, verify_license
+from license_revalidator import LICENSE_SERVER_URL, LicenseRevalidator
+from request_blocker import install_request_blocker
+from chromium_profiles import apply_chromium_profile
+from memory_watchdog import MemoryWatchdog
+import tracing
+from metrics import (BROWSER_CLOSE_SECONDS, BROWSER_OPEN_SECONDS, PAGE_LOAD_SECONDS, PROMPT_COPIES,
+                     REGISTRATION_ATTEMPTS, REGISTRATION_FAILURES, RENDERER_RESTARTS, MetricsExporter)
+from stall_detector import StallDetector
+from page_timing import TIMING_SCRIPT, PageTimingStore, new_sample
+from page_snapshots import load_snapshot, save_snapshot
+from assistant_automation import ASSISTANTS, PromptRun, assistant_for_url
+from batch_runner import BatchRunner, load_prompt_list
+from runtime_config import load_runtime_config
+from automation_api import AutomationServer
+from conversation_archive import close_archive, get_archive, install_capture
+from theme_engine import APP_PALETTE, apply_theme, set_role
+from assets import asset_pixmap, preload_assets
+from window_group import WindowGroup
+from edge_resizer import EdgeResizer
+from session_store import (SCROLL_CAPTURE_SCRIPT, history_to_text, load_session, load_window_size, restore_history,
+                           save_session, save_window_size, scroll_restore_script)
 
 def resource_path(relative_path):
     """Get the absolute path to a resource, works for development and PyInstaller bundles."""
@@ -21,6 +48,7 @@ def resource_path(relative_path):
         return os.path.join(os.path.dirname(__file__), relative_path)
 
 class RegistrationDialog(QDialog):
+    @tracing.traced("RegistrationDialog", "dialog")
     def __init__(self, parent=None, on_success_callback=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
@@ -45,17 +73,17 @@ class RegistrationDialog(QDialog):
         main_layout = QVBoxLayout()
         
         title_label = QLabel("API Token Registration")
-        title_label.setStyleSheet("color: #F5F5F5; font-size: 16px; font-weight: bold;")
+        set_role(title_label, "title")
         title_label.setAlignment(Qt.AlignCenter)
         
         self.token_input = QLineEdit()
-        self.token_input.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.token_input, "field")
         self.token_input.setPlaceholderText("Paste your API token here")
         
         buttons_layout = QHBoxLayout()
-        self.activate_button = self.create_button("Activate", "#F28C38")
+        self.activate_button = self.create_button("Activate", "primary")
         self.activate_button.clicked.connect(self.verify_token)
-        self.close_button = self.create_button("Close", "#2A2A2A")
+        self.close_button = self.create_button("Close", "neutral")
         self.close_button.clicked.connect(QApplication.quit)
         
         buttons_layout.addWidget(self.activate_button)
@@ -66,29 +94,14 @@ class RegistrationDialog(QDialog):
         main_layout.addLayout(buttons_layout)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #1E1E1E; border-radius: 10px; border: 2px solid #F28C38;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
 
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"""
-            QPushButton {{
-                background-color: {color};
-                color: #F5F5F5;
-                border-radius: 10px;
-                padding: 5px;
-                border: 2px solid transparent;
-            }}
-            QPushButton:hover {{
-                background-color: {color};
-                color: #F5F5F5;
-                border: 2px solid #F5F5F5;
-            }}
-        """)
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
 
     def generate_filename(self, user_secret: str, ext="txt"):
         nonce = uuid.uuid4().hex
@@ -112,6 +125,7 @@ class RegistrationDialog(QDialog):
         if not token:
             QMessageBox.warning(self, "Error", "Please enter an API token.")
             return
+        REGISTRATION_ATTEMPTS.inc()
         
         # Send verification request to server
         try:
@@ -121,10 +135,15 @@ class RegistrationDialog(QDialog):
             all_files = os.listdir(config_dir)
 
             if not any(self.validate_filename(filename=filename, user_secret=self.secret_key) for filename in all_files):
-                response = requests.post("https://everywearai-website.onrender.com/register", json={"token": token})
-                response_data = response.json()
+                if is_signed_token(token):
+                    # Signed licenses are verified locally, no round trip to the server
+                    verified = verify_license(token) is not None
+                else:
+                    with tracing.span("register", "network"):
+                        response = requests.post("https://everywearai-website.onrender.com/register", json={"token": token})
+                        verified = response.json().get("verified") == "yes"
                 
-                if response_data.get("verified") == "yes":
+                if verified:
                     random_filename = self.generate_filename(user_secret=self.secret_key)
                     with open(os.path.join(config_dir, random_filename), "w") as f:
                         f.write(token)
@@ -132,11 +151,13 @@ class RegistrationDialog(QDialog):
                     if self.on_success_callback:
                         self.on_success_callback()
                 else:
+                    REGISTRATION_FAILURES.inc(reason="invalid_token")
                     QMessageBox.critical(self, "Error", "Invalid API token. Please try again.")
             else:
                 if self.on_success_callback:
                     self.on_success_callback()
         except Exception as e:
+            REGISTRATION_FAILURES.inc(reason="error")
             print(f"Verification error: {e}")
             QMessageBox.critical(self, "Error", f"Failed to verify token: {e}")
 
@@ -154,74 +175,139 @@ class RegistrationDialog(QDialog):
         self.animation = animation
 
 class ToastNotification(QWidget):
-    def __init__(self, message, parent=None):
+    """The toast of one window, built once and reused for every message.
+
+    A message that arrives while the toast is up waits its turn; repeating the message on
+    screen only extends it and bumps a counter, so bursts of toasts cost the same as one.
+    """
+    DISPLAY_MS = 2000
+    MAX_PENDING = 3  # Older waiting messages are dropped first
+    
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_ShowWithoutActivating)
         
-        self.init_ui(message)
+        self.message = None
+        self.repeats = 0
+        self.pending = deque(maxlen=self.MAX_PENDING)
+        self.fading_out = False
         
-        if parent:
-            parent_rect = parent.geometry()
-            toast_width = 200
-            toast_height = 50
-            x = parent_rect.x() + (parent_rect.width() - toast_width) // 2
-            y = parent_rect.y() + parent_rect.height() - toast_height - 50
-            self.setGeometry(x, y, toast_width, toast_height)
+        self.init_ui()
         
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.hide_toast)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.next_message)
         self.timer.setSingleShot(True)
         
-        self.show()
-        self.animate_show()
-        self.timer.start(2000)
+        self.effect = QGraphicsOpacityEffect(self)
+        self.effect.setOpacity(0)
+        self.setGraphicsEffect(self.effect)
+        self.animation = QPropertyAnimation(self.effect, b"opacity", self)
+        self.animation.setDuration(300)
+        self.animation.setEasingCurve(QEasingCurve.OutCubic)
+        self.animation.finished.connect(self.on_fade_finished)
     
-    def init_ui(self, message):
+    def init_ui(self):
         layout = QVBoxLayout()
         layout.setContentsMargins(15, 10, 15, 10)
         
-        label = QLabel(message)
-        label.setStyleSheet("""
-            color: #F5F5F5;
-            font-size: 12px;
-            font-weight: bold;
-        """)
-        label.setAlignment(Qt.AlignCenter)
+        self.label = QLabel()
+        self.label.setAlignment(Qt.AlignCenter)
         
-        layout.addWidget(label)
+        layout.addWidget(self.label)
         self.setLayout(layout)
-        
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(30, 30, 30, 0.9);
-                border-radius: 15px;
-                border: 2px solid #F28C38;
-            }
-        """)
+        set_role(self, "toast")
     
-    def animate_show(self):
-        self.effect = QGraphicsOpacityEffect(self)
-        self.setGraphicsEffect(self.effect)
-        
-        self.animation = QPropertyAnimation(self.effect, b"opacity")
-        self.animation.setDuration(300)
-        self.animation.setStartValue(0)
-        self.animation.setEndValue(1)
-        self.animation.setEasingCurve(QEasingCurve.OutCubic)
-        self.animation.start()
+    def show_message(self, message):
+        showing = self.isVisible() and not self.fading_out
+        if showing and message == self.message:
+            self.repeats += 1
+            self.label.setText(f"{message} (x{self.repeats})")
+            self.timer.start(self.DISPLAY_MS)
+        elif showing:
+            if message not in self.pending:
+                self.pending.append(message)
+        else:
+            self.display(message)
     
-    def hide_toast(self):
-        self.animation = QPropertyAnimation(self.effect, b"opacity")
-        self.animation.setDuration(300)
-        self.animation.setStartValue(1)
-        self.animation.setEndValue(0)
-        self.animation.setEasingCurve(QEasingCurve.OutCubic)
-        self.animation.finished.connect(self.deleteLater)
+    def display(self, message):
+        self.message = message
+        self.repeats = 1
+        self.label.setText(message)
+        self.place()
+        if not self.isVisible() or self.fading_out:
+            self.fading_out = False
+            self.show()
+            self.fade_to(1)
+        self.timer.start(self.DISPLAY_MS)
+    
+    def place(self):
+        parent = self.parentWidget()
+        if not parent:
+            return
+        parent_rect = parent.geometry()
+        toast_width = min(parent_rect.width() - 40, max(200, self.label.fontMetrics().horizontalAdvance(self.label.text()) + 40))
+        toast_height = 50
+        x = parent_rect.x() + (parent_rect.width() - toast_width) // 2
+        y = parent_rect.y() + parent_rect.height() - toast_height - 50
+        self.setGeometry(x, y, toast_width, toast_height)
+    
+    def next_message(self):
+        if self.pending:
+            self.display(self.pending.popleft())
+        else:
+            self.fading_out = True
+            self.fade_to(0)
+    
+    def fade_to(self, opacity):
+        # Starts from the current opacity, so a message arriving mid-fade doesn't flicker
+        self.animation.stop()
+        self.animation.setStartValue(self.effect.opacity())
+        self.animation.setEndValue(opacity)
         self.animation.start()
+    
+    def on_fade_finished(self):
+        if self.fading_out:
+            self.fading_out = False
+            self.hide()
+
+def show_toast(window, message):
+    """Show ``message`` on the toast of ``window``, creating it on first use."""
+    toast = getattr(window, "toast", None)
+    if toast is None:
+        toast = window.toast = ToastNotification(window)
+    toast.show_message(message)
+
+# How the browser window is composited; set "browser_rendering" in the runtime config.
+# "masked" and "native" keep the window opaque, so the compositor doesn't alpha-blend the page
+# on every frame; "translucent" is the per-pixel alpha window, kept for comparison.
+RENDERING_MODES = ("masked", "native", "translucent")
+CORNER_RADIUS = 10  # Matches the panel's border-radius
+
+ASSISTANT_THEMES = {
+    "chatgpt": {
+        "border_color": "#10a37f",
+        "button_color": "#10a37f",
+        "submenu_color": "#0d846b",
+        "size_color": "#0b6d58"
+    },
+    "grok": {
+        "border_color": "#1DA1F2",
+        "button_color": "#1DA1F2",
+        "submenu_color": "#0C7ABF",
+        "size_color": "#0A5C8F"
+    },
+    "claude": {
+        "border_color": "#F28C38",
+        "button_color": "#F28C38",
+        "submenu_color": "#D97530",
+        "size_color": "#C1622A"
+    },
+}
 
 class IconSelectionDialog(QDialog):
+    @tracing.traced("IconSelectionDialog", "dialog")
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog | Qt.WindowStaysOnTopHint)
@@ -264,8 +350,8 @@ class IconSelectionDialog(QDialog):
             }
         """)
         
-        if os.path.exists(resource_path("chatgpt.png")):
-            chatgpt_icon = QPixmap(resource_path("chatgpt.png")).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        chatgpt_icon = asset_pixmap("chatgpt")
+        if not chatgpt_icon.isNull():
             self.chatgpt_button.setIcon(chatgpt_icon)
             self.chatgpt_button.setIconSize(QSize(80, 80))
         else:
@@ -296,8 +382,8 @@ class IconSelectionDialog(QDialog):
             }
         """)
         
-        if os.path.exists(resource_path("grok.png")):
-            grok_icon = QPixmap(resource_path("grok.png")).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        grok_icon = asset_pixmap("grok")
+        if not grok_icon.isNull():
             self.grok_button.setIcon(grok_icon)
             self.grok_button.setIconSize(QSize(80, 80))
         else:
@@ -328,8 +414,8 @@ class IconSelectionDialog(QDialog):
             }
         """)
         
-        if os.path.exists(resource_path("claude.png")):
-            claude_icon = QPixmap(resource_path("claude.png")).scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        claude_icon = asset_pixmap("claude")
+        if not claude_icon.isNull():
             self.claude_button.setIcon(claude_icon)
             self.claude_button.setIconSize(QSize(80, 80))
         else:
@@ -356,61 +442,73 @@ class IconSelectionDialog(QDialog):
         main_layout.addLayout(icons_layout)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #1E1E1E; border-radius: 10px; border: 2px solid #F28C38;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
     
-    def select_chatgpt(self):
-        self.selected_url = "https://chat.openai.com"
-        self.selected_theme = {
-            "border_color": "#10a37f",
-            "button_color": "#10a37f",
-            "submenu_color": "#0d846b",
-            "size_color": "#0b6d58"
-        }
+    def select_assistant(self, assistant):
+        self.selected_url = ASSISTANTS[assistant]["url"]
+        self.selected_theme = ASSISTANT_THEMES[assistant]
         self.accept()
     
+    def select_chatgpt(self):
+        self.select_assistant("chatgpt")
+    
     def select_grok(self):
-        self.selected_url = "https://grok.com/"
-        self.selected_theme = {
-            "border_color": "#1DA1F2",
-            "button_color": "#1DA1F2",
-            "submenu_color": "#0C7ABF",
-            "size_color": "#0A5C8F"
-        }
-        self.accept()
+        self.select_assistant("grok")
     
     def select_claude(self):
-        self.selected_url = "https://claude.ai"
-        self.selected_theme = {
-            "border_color": "#F28C38",
-            "button_color": "#F28C38",
-            "submenu_color": "#D97530",
-            "size_color": "#C1622A"
-        }
-        self.accept()
+        self.select_assistant("claude")
+
+def place_dialog(dialog, default_width, default_height, width_ratio=0.9, height_ratio=0.8):
+    """Centre ``dialog`` over its parent at ``width_ratio`` x ``height_ratio`` of the parent's size."""
+    parent = dialog.parentWidget()
+    if parent:
+        parent_geo = parent.geometry()
+        dialog_width = int(parent_geo.width() * width_ratio)
+        dialog_height = int(parent_geo.height() * height_ratio)
+        x = parent_geo.x() + (parent_geo.width() - dialog_width) // 2
+        y = parent_geo.y() + (parent_geo.height() - dialog_height) // 2
+        dialog.setGeometry(x, y, dialog_width, dialog_height)
+    else:
+        dialog.setGeometry(100, 100, default_width, default_height)
+
+class PromptSyncThread(QThread):
+    synced = Signal(int)
+
+    def __init__(self, prompts_dir, parent=None):
+        super().__init__(parent)
+        self.prompts_dir = prompts_dir
+
+    def run(self):
+        try:
+            with tracing.span("prompt sync", "network"):
+                changed = PromptSyncClient(self.prompts_dir).sync()
+        except Exception as e:
+            print(f"Prompt sync error: {e}")
+            changed = 0
+        self.synced.emit(changed)
 
 class PromptCreatorDialog(QDialog):
-    def __init__(self, parent=None, theme=None):
+    """Built once per browser window and reused; present() resets it for the next prompt."""
+    @tracing.traced("PromptCreatorDialog", "dialog")
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setModal(True)
-        self.theme = theme if theme else {"button_color": "#10a37f", "border_color": "#10a37f"}
-        
-        if parent:
-            parent_geo = parent.geometry()
-            dialog_width = int(parent_geo.width() * 0.9)
-            dialog_height = int(parent_geo.height() * 0.8)
-            x = parent_geo.x() + (parent_geo.width() - dialog_width) // 2
-            y = parent_geo.y() + (parent_geo.height() - dialog_height) // 2
-            self.setGeometry(x, y, dialog_width, dialog_height)
-        else:
-            self.setGeometry(100, 100, 500, 400)
-        
         self.init_ui()
+        self.init_animation()
+    
+    @tracing.traced("PromptCreatorDialog.present", "dialog")
+    def present(self):
+        place_dialog(self, 500, 400)
+        self.filename_input.clear()
+        self.content_text.clear()
+        self.show()
+        self.filename_input.setFocus()
         self.animate_open()
     
     def init_ui(self):
@@ -419,24 +517,23 @@ class PromptCreatorDialog(QDialog):
         
         filename_layout = QHBoxLayout()
         filename_label = QLabel("File Name:")
-        filename_label.setStyleSheet("color: #F5F5F5;")
         self.filename_input = QLineEdit()
-        self.filename_input.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.filename_input, "field")
         self.filename_input.setPlaceholderText("Enter file name (without extension)")
         
         filename_layout.addWidget(filename_label)
         filename_layout.addWidget(self.filename_input)
         
         self.content_text = QTextEdit()
-        self.content_text.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.content_text, "field")
         self.content_text.setPlaceholderText("Write your prompt here...")
         
         buttons_layout = QHBoxLayout()
         
-        self.save_button = self.create_button("Save", self.theme["button_color"])
+        self.save_button = self.create_button("Save", "primary")
         self.save_button.clicked.connect(self.save_prompt)
         
-        self.cancel_button = self.create_button("Cancel", "#2A2A2A")
+        self.cancel_button = self.create_button("Cancel", "neutral")
         self.cancel_button.clicked.connect(self.close)
         
         buttons_layout.addWidget(self.save_button)
@@ -447,18 +544,14 @@ class PromptCreatorDialog(QDialog):
         main_layout.addLayout(buttons_layout)
         
         container.setLayout(main_layout)
-        container.setStyleSheet(f"background-color: #1E1E1E; border-radius: 10px; border: 2px solid {self.theme['border_color']};")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid #F5F5F5;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def save_prompt(self):
         filename = self.filename_input.text().strip()
@@ -477,96 +570,74 @@ class PromptCreatorDialog(QDialog):
         file_path = os.path.join(save_dir, filename)
         
         try:
-            with open(file_path, 'w') as file:
+            with tracing.span("save prompt", "io"), open(file_path, 'w') as file:
                 file.write(content)
             self.close()
         except Exception as e:
             print(f"Error saving file: {e}")
             QMessageBox.critical(self, "Error", f"Failed to save prompt: {e}")
     
-    def animate_open(self):
+    def init_animation(self):
         effect = QGraphicsOpacityEffect(self)
         self.setGraphicsEffect(effect)
         
-        animation = QPropertyAnimation(effect, b"opacity")
-        animation.setDuration(300)
-        animation.setStartValue(0)
-        animation.setEndValue(1)
-        animation.setEasingCurve(QEasingCurve.OutCubic)
-        animation.start()
-        
-        self.animation = animation
+        self.animation = QPropertyAnimation(effect, b"opacity")
+        self.animation.setDuration(300)
+        self.animation.setStartValue(0)
+        self.animation.setEndValue(1)
+        self.animation.setEasingCurve(QEasingCurve.OutCubic)
+    
+    def animate_open(self):
+        self.animation.stop()
+        self.animation.start()
 
 class PromptViewerDialog(QDialog):
-    def __init__(self, parent=None, theme=None):
+    """Built once per browser window and reused; reopening only rescans the prompts folder."""
+    @tracing.traced("PromptViewerDialog", "dialog")
+    def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setModal(True)
-        self.theme = theme if theme else {"button_color": "#10a37f", "border_color": "#10a37f"}
-        
-        if parent:
-            parent_geo = parent.geometry()
-            dialog_width = int(parent_geo.width() * 0.9)
-            dialog_height = int(parent_geo.height() * 0.8)
-            x = parent_geo.x() + (parent_geo.width() - dialog_width) // 2
-            y = parent_geo.y() + (parent_geo.height() - dialog_height) // 2
-            self.setGeometry(x, y, dialog_width, dialog_height)
-        else:
-            self.setGeometry(100, 100, 700, 500)
-        
+        self.prompt_items = {}  # File name -> (list item, modification time)
+        self.sync_thread = None
         self.init_ui()
-        self.animate_open()
+        self.init_animation()
+    
+    @tracing.traced("PromptViewerDialog.present", "dialog")
+    def present(self):
+        place_dialog(self, 700, 500)
+        self.file_list.setCurrentItem(None)
+        self.content_viewer.clear()
+        self.copy_button.setEnabled(False)
         self.load_prompts()
+        self.show()
+        self.animate_open()
+        self.sync_prompts()
     
     def init_ui(self):
         container = QWidget()
         main_layout = QVBoxLayout()
         
         title_label = QLabel("Prompts")
-        title_label.setStyleSheet("color: #F5F5F5; font-size: 16px; font-weight: bold;")
+        set_role(title_label, "title")
         
         self.splitter = QSplitter(Qt.Horizontal)
-        self.splitter.setStyleSheet(f"QSplitter::handle {{ background-color: {self.theme['submenu_color']}; width: 2px; }}")
+        set_role(self.splitter, "split")
         
         self.file_list = QListWidget()
-        self.file_list.setStyleSheet("""
-            QListWidget {
-                background-color: #2A2A2A; 
-                color: #F5F5F5; 
-                border-radius: 5px;
-                outline: none;
-                border: 1px solid #4A4A4A;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #4A4A4A;
-                background-color: #2A2A2A;
-            }
-            QListWidget::item:hover {
-                background-color: #3A3A3A;
-                color: #F5F5F5;
-            }
-            QListWidget::item:selected {
-                background-color: #F28C38;
-                color: #F5F5F5;
-            }
-            QListWidget::item:selected:hover {
-                background-color: #E07B30;
-                color: #F5F5F5;
-            }
-        """)
+        set_role(self.file_list, "list")
         self.file_list.itemClicked.connect(self.show_file_content)
         
         right_widget = QWidget()
         right_layout = QVBoxLayout()
         
         self.content_viewer = QTextBrowser()
-        self.content_viewer.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.content_viewer, "field")
         self.content_viewer.setReadOnly(True)
         self.content_viewer.setPlaceholderText("Select a prompt to view its content")
         
-        self.copy_button = self.create_button("Copy Content", self.theme["button_color"])
+        self.copy_button = self.create_button("Copy Content", "primary")
         self.copy_button.clicked.connect(self.copy_content)
         self.copy_button.setEnabled(False)
         
@@ -579,7 +650,7 @@ class PromptViewerDialog(QDialog):
         
         self.splitter.setSizes([30, 70])
         
-        self.close_button = self.create_button("Close", "#2A2A2A")
+        self.close_button = self.create_button("Close", "neutral")
         self.close_button.clicked.connect(self.close)
         
         main_layout.addWidget(title_label)
@@ -587,19 +658,16 @@ class PromptViewerDialog(QDialog):
         main_layout.addWidget(self.close_button)
         
         container.setLayout(main_layout)
-        container.setStyleSheet(f"background-color: #1E1E1E; border-radius: 10px; border: 2px solid {self.theme['border_color']};")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid #F5F5F5;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
+    @tracing.traced("load prompts", "io")
     def load_prompts(self):
         prompts_dir = resource_path("Prompts")
         if not os.path.exists(prompts_dir):
@@ -607,18 +675,49 @@ class PromptViewerDialog(QDialog):
             with open(os.path.join(prompts_dir, "sample.txt"), "w") as f:
                 f.write("This is a sample prompt.\nYou can create your own prompts using the Create option.")
         
-        self.file_list.clear()
-        
-        for filename in sorted(os.listdir(prompts_dir)):
-            if filename.endswith('.txt'):
-                item = QListWidgetItem(filename)
-                item.setData(Qt.UserRole, os.path.join(prompts_dir, filename))
-                self.file_list.addItem(item)
+        # Only touch the rows for files that were added, removed or changed since the last scan
+        current = {entry.name: entry.stat().st_mtime for entry in os.scandir(prompts_dir)
+                   if entry.is_file() and entry.name.endswith('.txt')}
+        for filename in list(self.prompt_items):
+            item, mtime = self.prompt_items[filename]
+            if filename not in current:
+                self.file_list.takeItem(self.file_list.row(item))
+                del self.prompt_items[filename]
+            elif current[filename] != mtime:
+                self.prompt_items[filename] = (item, current[filename])
+                if item is self.file_list.currentItem():
+                    self.show_file_content(item)
+        added = sorted(set(current) - set(self.prompt_items))
+        for filename in added:
+            item = QListWidgetItem(filename)
+            item.setData(Qt.UserRole, os.path.join(prompts_dir, filename))
+            self.file_list.addItem(item)
+            self.prompt_items[filename] = (item, current[filename])
+        if added:
+            self.file_list.sortItems()
+    
+    def sync_prompts(self):
+        # Pull shared prompts from the team server without blocking the dialog
+        # Parented to the application so a closed dialog cannot destroy a running thread
+        if self.sync_thread is not None:
+            return  # Still syncing from an earlier open
+        self.sync_thread = PromptSyncThread(resource_path("Prompts"), QApplication.instance())
+        self.sync_thread.synced.connect(self.on_prompts_synced)
+        self.sync_thread.finished.connect(self.on_sync_finished)
+        self.sync_thread.start()
+    
+    def on_sync_finished(self):
+        self.sync_thread.deleteLater()
+        self.sync_thread = None
+    
+    def on_prompts_synced(self, changed):
+        if changed:
+            self.load_prompts()
     
     def show_file_content(self, item):
         file_path = item.data(Qt.UserRole)
         try:
-            with open(file_path, 'r') as file:
+            with tracing.span("read prompt", "io"), open(file_path, 'r') as file:
                 content = file.read()
                 self.content_viewer.setPlainText(content)
                 self.copy_button.setEnabled(True)
@@ -631,35 +730,280 @@ class PromptViewerDialog(QDialog):
         if content:
             clipboard = QApplication.clipboard()
             clipboard.setText(content)
-            self.toast = ToastNotification("Content copied to clipboard!", self)
+            PROMPT_COPIES.inc()
+            show_toast(self, "Content copied to clipboard!")
     
-    def animate_open(self):
+    def init_animation(self):
         effect = QGraphicsOpacityEffect(self)
         self.setGraphicsEffect(effect)
         
-        animation = QPropertyAnimation(effect, b"opacity")
-        animation.setDuration(300)
-        animation.setStartValue(0)
-        animation.setEndValue(1)
-        animation.setEasingCurve(QEasingCurve.OutCubic)
-        animation.start()
+        self.animation = QPropertyAnimation(effect, b"opacity")
+        self.animation.setDuration(300)
+        self.animation.setStartValue(0)
+        self.animation.setEndValue(1)
+        self.animation.setEasingCurve(QEasingCurve.OutCubic)
+    
+    def animate_open(self):
+        self.animation.stop()
+        self.animation.start()
+
+class PageStatsDialog(QDialog):
+    @tracing.traced("PageStatsDialog", "dialog")
+    def __init__(self, timing_store, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setModal(True)
+        self.timing_store = timing_store
         
-        self.animation = animation
+        place_dialog(self, 600, 300, 0.8, 0.5)
+        
+        self.init_ui()
+        self.load_stats()
+    
+    def init_ui(self):
+        container = QWidget()
+        main_layout = QVBoxLayout()
+        
+        title_label = QLabel("Page Load Stats")
+        set_role(title_label, "title")
+        
+        self.stats_viewer = QTextBrowser()
+        set_role(self.stats_viewer, "field")
+        
+        self.close_button = QPushButton("Close")
+        set_role(self.close_button, "primary")
+        self.close_button.clicked.connect(self.close)
+        
+        main_layout.addWidget(title_label)
+        main_layout.addWidget(self.stats_viewer)
+        main_layout.addWidget(self.close_button)
+        
+        container.setLayout(main_layout)
+        set_role(container, "panel")
+        
+        dialog_layout = QVBoxLayout(self)
+        dialog_layout.setContentsMargins(0, 0, 0, 0)
+        dialog_layout.addWidget(container)
+    
+    def load_stats(self):
+        rows = self.timing_store.summary()
+        if not rows:
+            self.stats_viewer.setPlainText("No page loads recorded yet.")
+            return
+        
+        def ms(value):
+            return "-" if value is None else f"{value:,} ms"
+        
+        html = ["<table width='100%' cellpadding='4'><tr><th align='left'>Assistant</th><th align='left'>Network</th>"
+                "<th>Loads</th><th>TTI p50</th><th>TTI p95</th><th>Load p50</th></tr>"]
+        for assistant, network, count, tti_p50, tti_p95, load_p50 in rows:
+            html.append(f"<tr><td>{assistant}</td><td>{network}</td><td align='center'>{count}</td>"
+                        f"<td align='center'>{ms(tti_p50)}</td><td align='center'>{ms(tti_p95)}</td><td align='center'>{ms(load_p50)}</td></tr>")
+        html.append("</table>")
+        self.stats_viewer.setHtml("".join(html))
+
+class ArchiveDialog(QDialog):
+    """Searches the conversations captured from the assistant pages."""
+    @tracing.traced("ArchiveDialog", "dialog")
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.Dialog)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.archive = get_archive()
+        
+        place_dialog(self, 700, 500)
+        
+        # Search once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.run_search)
+        
+        self.init_ui()
+        self.run_search()
+    
+    def init_ui(self):
+        container = QWidget()
+        main_layout = QVBoxLayout()
+        
+        title_label = QLabel("Conversation Archive")
+        set_role(title_label, "title")
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search past conversations")
+        set_role(self.search_input, "field")
+        self.search_input.textChanged.connect(self.search_timer.start)
+        
+        splitter = QSplitter(Qt.Horizontal)
+        set_role(splitter, "split")
+        
+        self.results_list = QListWidget()
+        self.results_list.setWordWrap(True)
+        set_role(self.results_list, "list")
+        self.results_list.currentItemChanged.connect(self.show_conversation)
+        
+        self.conversation_viewer = QTextBrowser()
+        set_role(self.conversation_viewer, "field")
+        self.conversation_viewer.setPlaceholderText("Select a result to read the conversation")
+        self.conversation_viewer.setOpenExternalLinks(True)
+        
+        splitter.addWidget(self.results_list)
+        splitter.addWidget(self.conversation_viewer)
+        splitter.setSizes([35, 65])
+        
+        self.close_button = QPushButton("Close")
+        set_role(self.close_button, "primary")
+        self.close_button.clicked.connect(self.close)
+        
+        main_layout.addWidget(title_label)
+        main_layout.addWidget(self.search_input)
+        main_layout.addWidget(splitter)
+        main_layout.addWidget(self.close_button)
+        
+        container.setLayout(main_layout)
+        set_role(container, "panel")
+        
+        dialog_layout = QVBoxLayout(self)
+        dialog_layout.setContentsMargins(0, 0, 0, 0)
+        dialog_layout.addWidget(container)
+    
+    def run_search(self):
+        self.results_list.clear()
+        try:
+            rows = self.archive.search(self.search_input.text())
+        except Exception as e:
+            self.conversation_viewer.setPlainText(f"Error searching archive: {e}")
+            return
+        for row in rows:
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["captured_at"]))
+            snippet = " ".join(row["snippet"].split())
+            item = QListWidgetItem(f"{row['title'] or row['assistant']}  ({when})\n{row['role']}: {snippet}")
+            item.setData(Qt.UserRole, row["conversation"])
+            self.results_list.addItem(item)
+    
+    def show_conversation(self, item):
+        if not item:
+            return
+        conversation = item.data(Qt.UserRole)
+        link = html.escape(conversation, quote=True)
+        parts = [f"<p><a href=\"{link}\">{link}</a></p>"]
+        for row in self.archive.conversation(conversation):
+            speaker = "You" if row["role"] == "user" else "Assistant"
+            text = html.escape(row["text"], quote=False).replace("\n", "<br>")
+            parts.append(f"<p><b>{speaker}</b><br>{text}</p>")
+        self.conversation_viewer.setHtml("".join(parts))
+
+class CompareWindow(QMainWindow):
+    """Sends one prompt to every assistant side by side and times each reply."""
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Compare Assistants")
+        screen = QApplication.primaryScreen().availableGeometry()
+        self.setGeometry(screen.x() + 40, screen.y() + 40, screen.width() - 80, screen.height() - 80)
+        self.views = {}
+        self.status_labels = {}
+        self.runs = {}
+        self.init_ui()
+    
+    def init_ui(self):
+        container = QWidget()
+        main_layout = QVBoxLayout()
+        
+        input_layout = QHBoxLayout()
+        self.prompt_input = QTextEdit()
+        self.prompt_input.setFixedHeight(70)
+        set_role(self.prompt_input, "field")
+        self.prompt_input.setPlaceholderText("Prompt to send to every assistant")
+        self.send_button = QPushButton("Send to all")
+        set_role(self.send_button, "primary")
+        self.send_button.clicked.connect(self.send_prompt)
+        input_layout.addWidget(self.prompt_input)
+        input_layout.addWidget(self.send_button)
+        
+        splitter = QSplitter(Qt.Horizontal)
+        for key, adapter in ASSISTANTS.items():
+            panel = QWidget()
+            panel_layout = QVBoxLayout(panel)
+            panel_layout.setContentsMargins(2, 2, 2, 2)
+            
+            name_label = QLabel(adapter["name"])
+            set_role(name_label, "heading")
+            view = QWebEngineView()
+            view.setUrl(QUrl(adapter["url"]))
+            status_label = QLabel("Ready")
+            
+            panel_layout.addWidget(name_label)
+            panel_layout.addWidget(view)
+            panel_layout.addWidget(status_label)
+            splitter.addWidget(panel)
+            self.views[key] = view
+            self.status_labels[key] = status_label
+        
+        main_layout.addLayout(input_layout)
+        main_layout.addWidget(splitter)
+        container.setLayout(main_layout)
+        set_role(container, "window")
+        self.setCentralWidget(container)
+    
+    def send_prompt(self):
+        prompt = self.prompt_input.toPlainText().strip()
+        if not prompt:
+            return
+        # Runs from an earlier Send would otherwise keep writing to the same status labels
+        for run in self.runs.values():
+            run.cancel()
+            run.deleteLater()
+        # All runs start in the same event loop turn, so each assistant sees the prompt at once
+        for key, view in self.views.items():
+            run = PromptRun(view.page(), ASSISTANTS[key], self)
+            run.first_token.connect(lambda ms, key=key: self.set_status(key, f"First token: {ms:,.0f} ms, streaming..."))
+            run.completed.connect(lambda ms, text, key=key: self.on_completed(key, ms, len(text)))
+            run.failed.connect(lambda reason, key=key: self.set_status(key, f"Failed: {reason}"))
+            self.runs[key] = run
+            self.set_status(key, "Sending...")
+            run.start(prompt)
+    
+    def on_completed(self, key, ms, length):
+        first_token_ms = self.runs[key].first_token_ms or 0
+        self.set_status(key, f"First token: {first_token_ms:,.0f} ms | Complete: {ms:,.0f} ms | {length:,} chars")
+    
+    def set_status(self, key, text):
+        self.status_labels[key].setText(text)
 
 class FloatingBrowser(QMainWindow):
-    def __init__(self, icon_geometry, close_callback, url="https://www.google.com", theme=None):
+    hidden = Signal()
+    
+    @tracing.traced("FloatingBrowser", "dialog")
+    def __init__(self, icon_geometry, close_callback, url="https://www.google.com", theme=None, busy_callback=None):
+        created_at = time.perf_counter()
         super().__init__()
-        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
-        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.rendering_mode = load_runtime_config().get("browser_rendering", "masked")
+        if self.rendering_mode not in RENDERING_MODES:
+            self.rendering_mode = "masked"
+        if self.rendering_mode == "native":
+            self.setWindowFlags(Qt.WindowStaysOnTopHint | Qt.Tool)
+        else:
+            self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        if self.rendering_mode == "translucent":
+            self.setAttribute(Qt.WA_TranslucentBackground)
+        else:
+            # Whatever the mask leaves of the corners is painted in the panel colour
+            palette = self.palette()
+            palette.setColor(QPalette.Window, QColor(APP_PALETTE["background"]))
+            self.setPalette(palette)
         self.close_callback = close_callback
+        self.busy_callback = busy_callback  # True while automation jobs are using the page
         self.icon_geometry = icon_geometry
         self.url = url
+        self.assistant = QUrl(url).host()
         self.theme = theme if theme else {
             "border_color": "#10a37f",
             "button_color": "#10a37f",
             "submenu_color": "#0d846b",
             "size_color": "#0b6d58"
         }
+        apply_theme(self.theme)
         
         self.screen = QApplication.primaryScreen()
         self.screen_geometry = self.screen.availableGeometry()
@@ -668,32 +1012,71 @@ class FloatingBrowser(QMainWindow):
         
         self.browser_width = int(self.screen_width * 0.5)
         self.browser_height = int(self.screen_height * 0.6)
+        saved_size = load_window_size(self.assistant)
+        if saved_size:
+            self.browser_width = min(saved_size[0], self.screen_width)
+            self.browser_height = min(saved_size[1], self.screen_height)
         
         new_x = icon_geometry.x() - self.browser_width
         new_y = icon_geometry.y() - self.browser_height + icon_geometry.height() // 2
         self.setGeometry(new_x, new_y, self.browser_width, self.browser_height)
         self.init_ui()
-        self.animate_open()
+        self.animate_open(created_at)
 
     def init_ui(self):
         profile = QWebEngineProfile.defaultProfile()
         profile.setHttpUserAgent("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36")
+        self.request_blocker = install_request_blocker(profile)
+
+        self.timing_store = PageTimingStore()
+        self.load_started_at = None
+        self.first_progress_ms = None
+        self.load_span = None
 
         self.browser = QWebEngineView()
-        self.browser.setUrl(QUrl(self.url))
+        self.browser.loadStarted.connect(self.on_load_started)
+        self.browser.loadProgress.connect(self.on_load_progress)
+        self.browser.loadFinished.connect(self.on_load_finished)
+        self.browser.page().renderProcessTerminated.connect(self.on_render_process_terminated)
+        adapter_key = assistant_for_url(self.url)
+        if adapter_key:
+            # Installed before the first navigation so every load of the page is captured
+            self.capture_bridge = install_capture(self.browser.page(), ASSISTANTS[adapter_key], adapter_key)
+        self.restore_session()
         self.browser.setStyleSheet("background-color: #1E1E1E; border-radius: 10px;")
 
-        self.prompt_button = self.create_button("Prompt", self.theme["submenu_color"])
-        self.size_button = self.create_button("Size", self.theme["size_color"])
-        # self.back_button = self.create_button("Back", "#2A2A2A")
+        # Last rendered state of this assistant, shown until the live page has loaded
+        self.page_loaded = False
+        self.snapshot_label = QLabel()
+        self.snapshot_label.setScaledContents(True)
+        snapshot = load_snapshot(self.assistant)
+        if snapshot:
+            self.snapshot_label.setPixmap(snapshot)
+            QTimer.singleShot(15000, self, self.fade_out_snapshot)  # Don't hide a slow page forever
+        else:
+            self.snapshot_label.hide()
+
+        browser_host = QWidget()
+        browser_stack = QStackedLayout(browser_host)
+        browser_stack.setStackingMode(QStackedLayout.StackAll)
+        browser_stack.addWidget(self.browser)
+        browser_stack.addWidget(self.snapshot_label)
+        browser_stack.setCurrentWidget(self.snapshot_label)
+
+        self.prompt_button = self.create_button("Prompt", "submenu")
+        self.size_button = self.create_button("Size", "size")
+        # self.back_button = self.create_button("Back", "neutral")
         # self.back_button.clicked.connect(self.return_to_selection)
-        self.close_button = self.create_button("Close", self.theme["button_color"])
+        self.stats_button = self.create_button("Stats", "size")
+        self.stats_button.clicked.connect(self.show_page_stats)
+        self.close_button = self.create_button("Close", "primary")
         self.close_button.clicked.connect(self.close_callback)
 
         submenu_layout = QHBoxLayout()
         submenu_layout.addWidget(self.prompt_button)
         submenu_layout.addWidget(self.size_button)
         # submenu_layout.addWidget(self.back_button)
+        submenu_layout.addWidget(self.stats_button)
         
         submenu_layout.setStretch(0, 1)
         submenu_layout.setStretch(1, 1)
@@ -707,7 +1090,7 @@ class FloatingBrowser(QMainWindow):
         large_height = int(self.screen_height * 0.9)
         
         self.size_menu = QMenu(self)
-        self.size_menu.setStyleSheet(f"background-color: #1E1E1E; color: #F5F5F5; border-radius: 10px; border: 2px solid {self.theme['size_color']};")
+        set_role(self.size_menu, "size")
 
         small_action = self.create_menu_action("Small", self.theme["size_color"], self.resize_browser, small_width, small_height)
         medium_action = self.create_menu_action("Medium", self.theme["size_color"], self.resize_browser, medium_width, medium_height)
@@ -719,38 +1102,71 @@ class FloatingBrowser(QMainWindow):
         self.size_button.setMenu(self.size_menu)
         
         self.prompt_menu = QMenu(self)
-        self.prompt_menu.setStyleSheet(f"background-color: #1E1E1E; color: #F5F5F5; border-radius: 10px; border: 2px solid {self.theme['submenu_color']};")
+        set_role(self.prompt_menu, "submenu")
         
         create_action = self.create_menu_action("Create", self.theme["submenu_color"], self.show_prompt_creator)
         open_action = self.create_menu_action("Open", self.theme["submenu_color"], self.open_prompt)
+        compare_action = self.create_menu_action("Compare", self.theme["submenu_color"], self.open_compare)
+        self.batch_action = self.create_menu_action("Batch", self.theme["submenu_color"], self.toggle_batch)
+        archive_action = self.create_menu_action("Archive", self.theme["submenu_color"], self.open_archive)
+        self.batch_runner = None
+        # Built on first use and reused
+        self.prompt_creator = None
+        self.prompt_viewer = None
         
         self.prompt_menu.addAction(create_action)
         self.prompt_menu.addAction(open_action)
+        self.prompt_menu.addAction(compare_action)
+        self.prompt_menu.addAction(self.batch_action)
+        self.prompt_menu.addAction(archive_action)
         self.prompt_button.setMenu(self.prompt_menu)
 
         container = QWidget()
         layout = QVBoxLayout()
         layout.addLayout(submenu_layout)
-        layout.addWidget(self.browser)
+        layout.addWidget(browser_host)
         layout.addWidget(self.close_button)
         
         container.setLayout(layout)
-        container.setStyleSheet(f"background-color: #1E1E1E; border-radius: 10px; border: 2px solid {self.theme['border_color']};")
+        set_role(container, "panel")
         self.setCentralWidget(container)
+        # The panel's margin around the content is the resize border
+        self.edge_resizer = EdgeResizer(self, container, self.browser)
+        self.edge_resizer.finished.connect(self.on_resized)
         
         self.showEvent = self.on_show
+        self.hideEvent = self.on_hide
 
     def on_show(self, event):
         self.size_menu.setFixedWidth(self.size_button.width())
         self.prompt_menu.setFixedWidth(self.prompt_button.width())
+        # A page discarded by the memory watchdog reloads when it becomes active again
+        if self.browser.page().lifecycleState() == QWebEnginePage.LifecycleState.Discarded:
+            self.browser.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
         super().showEvent(event)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid #F5F5F5;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def on_hide(self, event):
+        super().hideEvent(event)
+        self.hidden.emit()
+    
+    def discard_page(self):
+        # Frees the renderer's memory; only allowed while the page is not visible or running a batch
+        page = self.browser.page()
+        if self.batch_runner or page.isVisible() or page.lifecycleState() == QWebEnginePage.LifecycleState.Discarded:
+            return False
+        page.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+        # Nothing may use the page until it has reloaded on the next show
+        self.page_loaded = False
+        RENDERER_RESTARTS.inc(assistant=self.assistant, reason="discarded")
+        return True
+    
+    def on_render_process_terminated(self, status, exit_code):
+        if status != QWebEnginePage.RenderProcessTerminationStatus.NormalTerminationStatus:
+            print(f"Renderer process ended ({status.name}, exit code {exit_code})")
+            RENDERER_RESTARTS.inc(assistant=self.assistant, reason=status.name)
+    
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def create_menu_action(self, text, color, slot, *args):
         action = QAction(text, self)
@@ -762,17 +1178,181 @@ class FloatingBrowser(QMainWindow):
         return action
     
     def show_prompt_creator(self):
-        self.prompt_creator = PromptCreatorDialog(self, self.theme)
-        self.prompt_creator.show()
+        if self.prompt_creator is None:
+            self.prompt_creator = PromptCreatorDialog(self)
+        self.prompt_creator.present()
     
     def open_prompt(self):
-        self.prompt_viewer = PromptViewerDialog(self, self.theme)
-        self.prompt_viewer.show()
+        if self.prompt_viewer is None:
+            self.prompt_viewer = PromptViewerDialog(self)
+        self.prompt_viewer.present()
+    
+    def open_compare(self):
+        self.compare_window = CompareWindow()
+        self.compare_window.show()
+    
+    def open_archive(self):
+        self.archive_dialog = ArchiveDialog(self)
+        self.archive_dialog.show()
+    
+    def toggle_batch(self):
+        if self.batch_runner:
+            self.batch_runner.stop()
+            return
+        if self.busy_callback and self.busy_callback():
+            show_toast(self, "Wait for the automation prompts to finish")
+            return
+        
+        adapter_key = assistant_for_url(self.url)
+        if not adapter_key:
+            show_toast(self, "Batch needs ChatGPT, Grok or Claude")
+            return
+        
+        prompts_path, _ = QFileDialog.getOpenFileName(self, "Open Prompt List", "", "Prompt lists (*.txt *.csv *.xlsx)")
+        if not prompts_path:
+            return
+        try:
+            prompts = load_prompt_list(prompts_path)
+        except Exception as e:
+            print(f"Error reading prompt list: {e}")
+            prompts = []
+        if not prompts:
+            show_toast(self, "No prompts found in that file")
+            return
+        
+        # Picking an existing results file resumes it, so don't ask to overwrite
+        default_output = os.path.splitext(prompts_path)[0] + "_results.csv"
+        output_path, _ = QFileDialog.getSaveFileName(self, "Save Results", default_output, "CSV (*.csv);;Excel (*.xlsx)",
+                                                     options=QFileDialog.DontConfirmOverwrite)
+        if not output_path:
+            return
+        
+        pace_seconds = float(load_runtime_config().get("batch_pace_seconds", 5))
+        self.batch_runner = BatchRunner(self.browser, ASSISTANTS[adapter_key], prompts, output_path, pace_seconds, parent=self)
+        self.batch_runner.progress.connect(self.on_batch_progress)
+        self.batch_runner.finished.connect(self.on_batch_finished)
+        self.batch_action.setText("Stop Batch")
+        self.prompt_button.setText(f"Batch 0/{len(prompts)}")
+        self.batch_runner.start()
+    
+    def on_batch_progress(self, done, total, per_minute):
+        self.prompt_button.setText(f"Batch {done}/{total} ({per_minute:.1f}/min)")
+    
+    def on_batch_finished(self, summary):
+        print(summary)
+        self.batch_runner.deleteLater()
+        self.batch_runner = None
+        self.batch_action.setText("Batch")
+        self.prompt_button.setText("Prompt")
+        show_toast(self, summary.split(":")[0] + " batch run")
+    
+    def show_page_stats(self):
+        self.page_stats = PageStatsDialog(self.timing_store, self)
+        self.page_stats.show()
+    
+    def on_load_started(self):
+        tracing.end(self.load_span, "page load", "page", ok=False)  # Superseded by this navigation
+        self.load_span = tracing.begin("page load", "page", assistant=self.assistant)
+        self.load_started_at = time.perf_counter()
+        self.first_progress_ms = None
+    
+    def on_load_progress(self, progress):
+        if self.first_progress_ms is None and progress > 0 and self.load_started_at is not None:
+            self.first_progress_ms = (time.perf_counter() - self.load_started_at) * 1000
+    
+    def on_load_finished(self, ok):
+        tracing.end(self.load_span, "page load", "page", ok=ok)
+        self.load_span = None
+        # An error page must never become the snapshot or the page automation works on
+        self.page_loaded = ok
+        self.fade_out_snapshot()
+        if ok and self.pending_scroll:
+            self.restore_scroll(self.pending_scroll, attempts=10)
+            self.pending_scroll = None
+        if self.load_started_at is None:
+            return
+        load_ms = (time.perf_counter() - self.load_started_at) * 1000
+        PAGE_LOAD_SECONDS.observe(load_ms / 1000, assistant=self.assistant, outcome="ok" if ok else "failed")
+        first_progress_ms = self.first_progress_ms
+        self.load_started_at = None
+        
+        def record(timing_json):
+            self.timing_store.add(self.assistant, new_sample(load_ms, first_progress_ms, ok, timing_json))
+        
+        # Run in an isolated world so the page's own scripts cannot interfere
+        self.browser.page().runJavaScript(TIMING_SCRIPT, QWebEngineScript.ScriptWorldId.ApplicationWorld, record)
+    
+    def fade_out_snapshot(self):
+        if not self.snapshot_label.isVisible() or hasattr(self, "snapshot_animation"):
+            return
+        effect = QGraphicsOpacityEffect(self.snapshot_label)
+        self.snapshot_label.setGraphicsEffect(effect)
+        animation = QPropertyAnimation(effect, b"opacity")
+        animation.setDuration(250)
+        animation.setStartValue(1)
+        animation.setEndValue(0)
+        animation.setEasingCurve(QEasingCurve.OutCubic)
+        animation.finished.connect(self.snapshot_label.hide)
+        tracing.trace_animation(animation, "snapshot fade")
+        animation.start()
+        self.snapshot_animation = animation
+    
+    @tracing.traced("capture snapshot", "io")
+    def capture_snapshot(self):
+        # Only a fully loaded, visible page is worth showing on the next open
+        if self.page_loaded and self.isVisible():
+            save_snapshot(self.browser, self.assistant)
+    
+    @tracing.traced("restore session", "io")
+    def restore_session(self):
+        # Reopen on the last conversation with one navigation instead of home page + manual navigation
+        session = load_session(self.assistant) or {}
+        self.pending_scroll = session.get("scroll")
+        if session.get("history"):
+            try:
+                if restore_history(self.browser.history(), session["history"]):
+                    return
+            except Exception as e:
+                print(f"Error restoring history: {e}")
+        self.browser.setUrl(QUrl(session.get("url") or self.url))
+    
+    def restore_scroll(self, scroll, attempts):
+        # Chat pages render their messages after load, so retry until the container exists
+        def done(restored):
+            if not restored and attempts > 1:
+                QTimer.singleShot(300, self, lambda: self.restore_scroll(scroll, attempts - 1))
+        self.browser.page().runJavaScript(scroll_restore_script(scroll), QWebEngineScript.ScriptWorldId.ApplicationWorld, done)
+    
+    @tracing.traced("save session", "io")
+    def save_session(self, callback=None):
+        if not self.page_loaded:
+            if callback:
+                callback()
+            return
+        session = {"url": self.browser.url().toString(), "history": history_to_text(self.browser.history())}
+        
+        def write(scroll_json):
+            try:
+                session["scroll"] = json.loads(scroll_json) if scroll_json else None
+            except ValueError:
+                pass
+            save_session(self.assistant, session)
+            if callback:
+                callback()
+        
+        save_session(self.assistant, session)  # Written now in case the scroll query never returns
+        self.browser.page().runJavaScript(SCROLL_CAPTURE_SCRIPT, QWebEngineScript.ScriptWorldId.ApplicationWorld, write)
     
     def return_to_selection(self):
         self.animate_close(self.hide)
     
+    def on_resized(self, size):
+        self.browser_width, self.browser_height = size.width(), size.height()
+        save_window_size(self.assistant, self.browser_width, self.browser_height)
+    
     def resize_browser(self, width, height):
+        self.browser_width, self.browser_height = width, height
+        save_window_size(self.assistant, width, height)
         new_x = self.icon_geometry.x() - width
         new_y = self.icon_geometry.y() - height + self.icon_geometry.height() // 2
         new_x = max(0, new_x)
@@ -785,33 +1365,55 @@ class FloatingBrowser(QMainWindow):
         animation.setStartValue(self.geometry())
         animation.setEndValue(QRect(x, y, width, height))
         animation.setEasingCurve(QEasingCurve.OutCubic)
+        tracing.trace_animation(animation, "browser resize")
         animation.start()
         self.resize_animation = animation
     
-    def animate_open(self):
-        effect = QGraphicsOpacityEffect(self)
-        self.setGraphicsEffect(effect)
-        animation = QPropertyAnimation(effect, b"opacity")
+    def resizeEvent(self, event):
+        if self.rendering_mode == "masked":
+            self.update_mask()
+        super().resizeEvent(event)
+    
+    def update_mask(self):
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(self.rect()), CORNER_RADIUS, CORNER_RADIUS)
+        self.setMask(QRegion(path.toFillPolygon().toPolygon()))
+    
+    def fade_animation(self, start, end):
+        if self.rendering_mode == "translucent":
+            if start == 0:
+                self.setGraphicsEffect(QGraphicsOpacityEffect(self))
+            animation = QPropertyAnimation(self.graphicsEffect(), b"opacity")
+        else:
+            # An opacity effect renders the window, page included, through an offscreen buffer
+            # for as long as it is installed; fading the native window costs nothing once done
+            animation = QPropertyAnimation(self, b"windowOpacity")
         animation.setDuration(300)
-        animation.setStartValue(0)
-        animation.setEndValue(1)
+        animation.setStartValue(start)
+        animation.setEndValue(end)
         animation.setEasingCurve(QEasingCurve.OutCubic)
+        return animation
+    
+    def animate_open(self, requested_at=None):
+        """Fade in; ``requested_at`` (perf_counter) is when the user asked for the window."""
+        requested_at = requested_at or time.perf_counter()
+        animation = self.fade_animation(0, 1)
+        animation.finished.connect(lambda: BROWSER_OPEN_SECONDS.observe(time.perf_counter() - requested_at, assistant=self.assistant))
+        tracing.trace_animation(animation, "browser fade in")
         animation.start()
         self.animation = animation
     
-    def animate_close(self, callback):
-        effect = self.graphicsEffect()
-        animation = QPropertyAnimation(effect, b"opacity")
-        animation.setDuration(300)
-        animation.setStartValue(1)
-        animation.setEndValue(0)
-        animation.setEasingCurve(QEasingCurve.OutCubic)
+    def animate_close(self, callback, requested_at=None):
+        requested_at = requested_at or time.perf_counter()
+        animation = self.fade_animation(1, 0)
         animation.finished.connect(callback)
+        animation.finished.connect(lambda: BROWSER_CLOSE_SECONDS.observe(time.perf_counter() - requested_at, assistant=self.assistant))
+        tracing.trace_animation(animation, "browser fade out")
         animation.start()
         self.animation = animation
 
 class FloatingIcon(QWidget):
-    def __init__(self, icon_path):
+    def __init__(self, icon_name="icon"):
         super().__init__()
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
         self.setAttribute(Qt.WA_TranslucentBackground)
@@ -819,20 +1421,27 @@ class FloatingIcon(QWidget):
         self.setGeometry(screen_geometry.width() - 100, screen_geometry.height() - 100, 80, 80)
         self.secret_key = "SANYAMsuyashKARNAVATallai"
 
-        self.icon_path = icon_path
+        self.icon_name = icon_name
         self.browser_window = None
         self.selected_url = None
         self.selected_theme = None
+        self.memory_watchdog = None
+        self.automation_server = None
+        self.license_revalidator = None
+        self.reclaim_pending = False
         self.check_token()
     
     def init_ui(self):
         layout = QVBoxLayout()
         self.icon_label = QLabel()
-        self.icon_label.setPixmap(QPixmap(self.icon_path).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        self.icon_label.setStyleSheet("border-radius: 32px; background-color: rgba(30, 30, 30, 0.5);")
+        self.icon_label.setPixmap(asset_pixmap(self.icon_name))
+        set_role(self.icon_label, "icon")
         layout.addWidget(self.icon_label)
         self.setLayout(layout)
-        self.icon_label.mousePressEvent = self.toggle_browser
+        # Dragging the icon or the browser panel moves both; a click on the icon toggles the browser
+        self.window_group = WindowGroup(self, self)
+        self.window_group.add_handle(self.icon_label, self.toggle_browser)
+        self.window_group.moved.connect(self.on_group_moved)
 
     def validate_filename(self, filename: str, user_secret: str):
         try:
@@ -846,16 +1455,57 @@ class FloatingIcon(QWidget):
         except Exception:
             return False
 
+    @tracing.traced("check license", "license")
     def check_token(self):
+        path = self.license_file()
+        if path and self.license_still_valid(path):
+            self.show_main_ui()
+        else:
+            self.show_registration()
+
+    def license_file(self):
         config_dir = "config"
         os.makedirs(config_dir, exist_ok=True)
         all_files = os.listdir(config_dir)
         
         # Check if any file in config directory is valid
-        if any(self.validate_filename(filename=filename, user_secret=self.secret_key) for filename in all_files):
-            self.show_main_ui()
-        else:
-            self.show_registration()
+        valid_files = [filename for filename in all_files if self.validate_filename(filename=filename, user_secret=self.secret_key)]
+        return os.path.join(config_dir, valid_files[0]) if valid_files else None
+
+    def read_license(self, path):
+        try:
+            with open(path, "r") as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def license_still_valid(self, path):
+        # Signed licenses expire; drop an expired one so the user can register a new token
+        token = self.read_license(path)
+        if token is None:
+            return False
+        if is_signed_token(token) and verify_license(token) is None:
+            os.remove(path)
+            return False
+        return True
+
+    def start_license_revalidator(self):
+        # Only signed licenses are on the team server's token list; tokens registered through
+        # the website would all be rejected there, so they are not rechecked
+        path = self.license_file()
+        token = self.read_license(path) if path else None
+        if self.license_revalidator or not is_signed_token(token):
+            return
+        server_url = load_runtime_config().get("license_server_url", LICENSE_SERVER_URL)
+        self.license_revalidator = LicenseRevalidator(token, server_url, parent=self)
+        self.license_revalidator.revoked.connect(lambda: self.on_license_revoked(path))
+        self.license_revalidator.start()
+
+    def on_license_revoked(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+        QMessageBox.critical(None, "License Revoked", "Your license is no longer valid.")
+        self.close_application()
 
     
 
@@ -866,10 +1516,50 @@ class FloatingIcon(QWidget):
     def show_main_ui(self):
         self.init_ui()
         self.show()
+        self.start_memory_watchdog()
+        self.start_automation_server()
+        self.start_license_revalidator()
 
-    def toggle_browser(self, event):
+    def start_memory_watchdog(self):
+        if self.memory_watchdog or not MemoryWatchdog.is_supported():
+            return
+        self.memory_watchdog = MemoryWatchdog()
+        self.memory_watchdog.warning.connect(self.on_memory_warning)
+        self.memory_watchdog.reclaim.connect(self.on_memory_reclaim)
+        self.memory_watchdog.start()
+
+    def start_automation_server(self):
+        if self.automation_server or not load_runtime_config().get("automation_api", True):
+            return
+        self.automation_server = AutomationServer(self, parent=self)
+        self.automation_server.start()
+
+    def on_memory_warning(self, total_rss):
+        print(f"Memory warning: {total_rss / 2**20:.0f} MB in use, budget is {self.memory_watchdog.budget / 2**20:.0f} MB")
+
+    def on_memory_reclaim(self, total_rss):
+        print(f"Memory budget exceeded ({total_rss / 2**20:.0f} MB)")
+        self.reclaim_pending = self.browser_window is not None
+        self.reclaim_page()
+
+    def automation_busy(self):
+        return bool(self.automation_server and (self.automation_server.current or self.automation_server.jobs))
+
+    def reclaim_page(self):
+        # Never reload the page under the user; a visible or busy page is reclaimed once it is hidden
+        if self.reclaim_pending and not self.automation_busy() and self.browser_window.discard_page():
+            self.reclaim_pending = False
+            print("Discarded the hidden page")
+
+    def on_group_moved(self):
+        if self.browser_window:
+            # Size changes keep the browser anchored beside the icon's new position
+            self.browser_window.icon_geometry = self.geometry()
+
+    @tracing.traced("toggle browser", "toggle")
+    def toggle_browser(self):
         if self.browser_window and self.browser_window.isVisible():
-            self.browser_window.animate_close(self.browser_window.hide)
+            self.hide_browser()
         else:
             if not self.selected_url:
                 selection_dialog = IconSelectionDialog()
@@ -878,23 +1568,106 @@ class FloatingIcon(QWidget):
                     self.selected_theme = selection_dialog.selected_theme
                 else:
                     return
-            
-            self.browser_window = FloatingBrowser(
-                self.geometry(), 
-                self.close_application, 
-                self.selected_url, 
-                self.selected_theme
-            )
-            self.browser_window.show()
+            self.show_browser()
+
+    @tracing.traced("show browser", "toggle")
+    def show_browser(self, assistant=None):
+        requested_at = time.perf_counter()
+        if assistant:
+            self.selected_url = ASSISTANTS[assistant]["url"]
+            self.selected_theme = ASSISTANT_THEMES[assistant]
+        # Reuse the hidden window so its page, and any automation running on it, stays alive
+        if self.browser_window and self.browser_window.url == self.selected_url:
+            if not self.browser_window.isVisible():
+                self.browser_window.show()
+                self.browser_window.animate_open(requested_at)
+            return
+        
+        if self.browser_window:
+            self.window_group.detach(self.browser_window)
+        self.browser_window = FloatingBrowser(
+            self.geometry(), 
+            self.close_application, 
+            self.selected_url, 
+            self.selected_theme,
+            self.automation_busy
+        )
+        self.browser_window.hidden.connect(self.reclaim_page)
+        # A native title bar moves the window by itself, so the icon has to follow it
+        self.window_group.attach(self.browser_window, follow=self.browser_window.rendering_mode == "native")
+        # On the window rather than the panel, so the panel's resize border sees presses first
+        self.window_group.add_handle(self.browser_window)
+        self.browser_window.show()
+
+    @tracing.traced("hide browser", "toggle")
+    def hide_browser(self):
+        if self.browser_window and self.browser_window.isVisible():
+            requested_at = time.perf_counter()
+            self.browser_window.capture_snapshot()
+            self.browser_window.save_session()
+            self.browser_window.animate_close(self.browser_window.hide, requested_at)
+
+    @tracing.traced("switch assistant", "toggle")
+    def switch_assistant(self, assistant):
+        if self.browser_window:
+            old_browser = self.browser_window
+            if old_browser.batch_runner:
+                # Finalizes the results file before the page it runs on is deleted
+                old_browser.batch_runner.stop()
+            self.window_group.detach(old_browser)
+            old_browser.capture_snapshot()
+            old_browser.save_session()
+            old_browser.hidden.disconnect(self.reclaim_page)
+            old_browser.hide()
+            old_browser.deleteLater()
+            self.browser_window = None
+            self.reclaim_pending = False  # Closing the old page frees its memory anyway
+        self.show_browser(assistant)
     
     def close_application(self):
+        if self.memory_watchdog:
+            self.memory_watchdog.stop()
+        if self.license_revalidator:
+            self.license_revalidator.stop()
+        if self.automation_server:
+            self.automation_server.close()
+        close_archive()
+        if self.browser_window:
+            self.browser_window.capture_snapshot()
+            # A stats file that can't be written must not stop the app from quitting
+            try:
+                self.browser_window.request_blocker.save_stats()
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Could not save request blocker stats: {e}")
+            # Quit once the scroll position is saved, or after a short wait if the page doesn't answer
+            self.browser_window.save_session(QApplication.quit)
+            QTimer.singleShot(500, QApplication.quit)
+            return
         QApplication.quit()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # Chromium flags are read once at startup, so the profile must be applied before QApplication
+    qt_args = apply_chromium_profile(sys.argv)
+    app = QApplication(qt_args)
     app.setQuitOnLastWindowClosed(False)
+    # The app's own orange until an assistant is chosen
+    apply_theme(ASSISTANT_THEMES["claude"])
+    # Decode the pre-scaled icons once; dialogs and the icon only reuse the cached pixmaps
+    preload_assets()
+    # Started before the icon, so the license check at startup is watched too
+    stall_detector = StallDetector() if StallDetector.is_enabled() else None
+    if stall_detector:
+        stall_detector.start()
+    
+    metrics_exporter = MetricsExporter()
+    if metrics_exporter.is_enabled():
+        metrics_exporter.start()
     
-    icon_path = resource_path("icon.png")
-    floating_icon = FloatingIcon(icon_path)
+    floating_icon = FloatingIcon()
     
-    sys.exit(app.exec())
\ No newline at end of file
+    exit_code = app.exec()
+    if stall_detector:
+        stall_detector.stop()
+    if metrics_exporter.is_enabled():
+        metrics_exporter.stop()
+    sys.exit(exit_code)
\ No newline at end of file
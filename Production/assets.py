@@ -0,0 +1,81 @@
+import os
+import sys
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QGuiApplication, QImage, QPixmap
+
+try:
+    import assets_rc  # noqa: F401  Generated by build_assets.py; registers the :/assets resources
+except ImportError:
+    assets_rc = None
+
+# Logical size each image is drawn at, and the device pixel ratios variants are built for
+ASSETS = {"icon": 64, "chatgpt": 80, "grok": 80, "claude": 80}
+SCALE_FACTORS = (1, 1.25, 1.5, 2, 3)
+ASSET_DIR = "assets"
+
+_pixmaps = {}
+
+
+def app_dir():
+    if hasattr(sys, '_MEIPASS'):
+        return sys._MEIPASS
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+def variant_name(name, scale):
+    return f"{name}@{scale:g}x.png"
+
+
+def scaled_image(name, scale):
+    """Scale the original image for ``scale``; done by the build, or once at startup without it.
+
+    Images not listed in ASSETS are returned at their original size.
+    """
+    source = QImage(os.path.join(app_dir(), f"{name}.png"))
+    if source.isNull() or name not in ASSETS:
+        return source
+    size = round(ASSETS[name] * scale)
+    return source.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def best_scale(device_pixel_ratio):
+    """The smallest built variant that is at least as dense as the screen."""
+    for scale in SCALE_FACTORS:
+        if scale >= device_pixel_ratio:
+            return scale
+    return SCALE_FACTORS[-1]
+
+
+def load_variant(name, scale):
+    filename = variant_name(name, scale)
+    for path in (f":/assets/{filename}", os.path.join(app_dir(), ASSET_DIR, filename)):
+        image = QImage(path)
+        if not image.isNull():
+            return image
+    return scaled_image(name, scale)
+
+
+def asset_pixmap(name, device_pixel_ratio=None):
+    """The cached pixmap of ``name`` for the screen density; a null pixmap if the image is missing.
+
+    The pixmap carries its device pixel ratio, so it draws at the logical size in ASSETS.
+    """
+    if device_pixel_ratio is None:
+        device_pixel_ratio = QGuiApplication.primaryScreen().devicePixelRatio()
+    key = (name, best_scale(device_pixel_ratio))
+    if key not in _pixmaps:
+        image = load_variant(*key)
+        pixmap = QPixmap.fromImage(image)
+        if name in ASSETS:
+            pixmap.setDevicePixelRatio(key[1])
+        _pixmaps[key] = pixmap
+    return _pixmaps[key]
+
+
+def preload_assets():
+    """Decode every asset for every connected screen, so nothing is decoded or scaled later."""
+    ratios = {screen.devicePixelRatio() for screen in QGuiApplication.screens()}
+    for name in ASSETS:
+        for ratio in ratios:
+            asset_pixmap(name, ratio)
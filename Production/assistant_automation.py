@@ -0,0 +1,248 @@
+import json
+import time
+
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal
+from PySide6.QtWebEngineCore import QWebEngineScript
+
+from metrics import PROMPT_INSERTS
+
+# Per-assistant DOM knowledge. Selectors are lists tried in order, since the sites change markup
+# from time to time; update them here when an assistant stops responding to automation.
+ASSISTANTS = {
+    "chatgpt": {
+        "name": "ChatGPT",
+        "url": "https://chat.openai.com",
+        "hosts": ["chat.openai.com", "chatgpt.com"],
+        "composer": ["#prompt-textarea", "div.ProseMirror[contenteditable='true']", "textarea"],
+        "send": ["button[data-testid='send-button']", "button[aria-label='Send prompt']"],
+        "stop": ["button[data-testid='stop-button']", "button[aria-label='Stop streaming']"],
+        "message": "[data-message-author-role='assistant']",
+        "user_message": "[data-message-author-role='user']",
+        "message_id": ["data-message-id"],  # Attributes holding the site's id of a message, if it has one
+    },
+    "grok": {
+        "name": "Grok",
+        "url": "https://grok.com/",
+        "hosts": ["grok.com"],
+        "composer": ["textarea", "div.ProseMirror[contenteditable='true']", "div[contenteditable='true']"],
+        "send": ["button[type='submit']", "button[aria-label='Submit']"],
+        "stop": ["button[aria-label='Stop model response']", "button[aria-label='Stop']"],
+        "message": "div.message-bubble",
+        "user_message": "div.items-end div.message-bubble",
+    },
+    "claude": {
+        "name": "Claude",
+        "url": "https://claude.ai",
+        "hosts": ["claude.ai"],
+        "composer": ["div.ProseMirror[contenteditable='true']", "div[contenteditable='true']"],
+        "send": ["button[aria-label='Send message']", "button[aria-label='Send Message']"],
+        "stop": ["button[aria-label='Stop response']", "[data-is-streaming='true']"],
+        "message": "div.font-claude-message, div.font-claude-response",
+        "user_message": "[data-testid='user-message']",
+    },
+}
+
+
+def assistant_for_url(url):
+    """Return the ASSISTANTS key whose hosts match ``url``, or None."""
+    host = QUrl(url).host()
+    for key, adapter in ASSISTANTS.items():
+        if any(host == h or host.endswith("." + h) for h in adapter["hosts"]):
+            return key
+    return None
+
+
+INSERT_TEMPLATE = """
+(function (selectors, text) {
+    var el = null;
+    for (var i = 0; i < selectors.length && !el; i++) el = document.querySelector(selectors[i]);
+    if (!el) return false;
+    el.focus();
+    if (el.tagName === 'TEXTAREA' || el.tagName === 'INPUT') {
+        // Use the native setter so framework-controlled inputs notice the change
+        var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value').set;
+        setter.call(el, text);
+        el.dispatchEvent(new Event('input', {bubbles: true}));
+    } else {
+        document.execCommand('selectAll', false, null);
+        document.execCommand('insertText', false, text);
+    }
+    return true;
+})(%s, %s);
+"""
+
+SUBMIT_TEMPLATE = """
+(function (sendSelectors, composerSelectors) {
+    for (var i = 0; i < sendSelectors.length; i++) {
+        var button = document.querySelector(sendSelectors[i]);
+        if (button && !button.disabled) { button.click(); return true; }
+    }
+    for (var j = 0; j < composerSelectors.length; j++) {
+        var el = document.querySelector(composerSelectors[j]);
+        if (el) {
+            el.dispatchEvent(new KeyboardEvent('keydown', {key: 'Enter', code: 'Enter', keyCode: 13, bubbles: true}));
+            return true;
+        }
+    }
+    return false;
+})(%s, %s);
+"""
+
+STATE_TEMPLATE = """
+(function (messageSelector, stopSelectors, withText) {
+    var messages = document.querySelectorAll(messageSelector);
+    var last = messages.length ? messages[messages.length - 1] : null;
+    var streaming = false;
+    for (var i = 0; i < stopSelectors.length && !streaming; i++) streaming = !!document.querySelector(stopSelectors[i]);
+    var text = last ? last.innerText : '';
+    return JSON.stringify({count: messages.length, length: text.length, streaming: streaming,
+                           text: withText ? text : null});
+})(%s, %s, %s);
+"""
+
+
+def insert_script(adapter, text):
+    return INSERT_TEMPLATE % (json.dumps(adapter["composer"]), json.dumps(text))
+
+
+def submit_script(adapter):
+    return SUBMIT_TEMPLATE % (json.dumps(adapter["send"]), json.dumps(adapter["composer"]))
+
+
+def state_script(adapter, with_text=False):
+    return STATE_TEMPLATE % (json.dumps(adapter["message"]), json.dumps(adapter["stop"]), json.dumps(with_text))
+
+
+class PromptRun(QObject):
+    """Inserts a prompt into an assistant page, submits it and follows the streamed reply.
+
+    Timings are milliseconds since the prompt was submitted. A reply counts as complete when
+    the assistant no longer shows its stop button and the text has not changed for
+    ``settle_ms``. With ``stream_text`` the reply so far is also emitted on every change.
+    """
+    first_token = Signal(float)
+    progressed = Signal(int)  # Length of the reply so far
+    streamed = Signal(str)  # Reply text so far, only when stream_text is set
+    completed = Signal(float, str)
+    failed = Signal(str)
+
+    POLL_INTERVAL = 150
+    SUBMIT_RETRIES = 10
+
+    def __init__(self, page, adapter, parent=None, settle_ms=1500, timeout_ms=5 * 60 * 1000, stream_text=False):
+        super().__init__(parent)
+        self.page = page
+        self.adapter = adapter
+        self.stream_text = stream_text
+        self.settle_ms = settle_ms
+        self.timeout_ms = timeout_ms
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.poll)
+        self.finished = False
+        self.cancelled = False
+
+    def run_js(self, script, callback):
+        self.page.runJavaScript(script, QWebEngineScript.ScriptWorldId.ApplicationWorld, callback)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.submitted_at) * 1000
+
+    def start(self, prompt, submit=True):
+        self.prompt = prompt
+        self.submit = submit
+        self.submitted_at = None
+        self.first_token_ms = None
+        self.last_length = -1
+        self.stable_since = None
+        self.finished = False
+        self.run_js(state_script(self.adapter), self.on_baseline)
+
+    def on_baseline(self, state_json):
+        if self.finished:
+            return
+        try:
+            self.baseline_count = json.loads(state_json)["count"]
+        except (TypeError, ValueError, KeyError):
+            self.fail("Assistant page is not ready")
+            return
+        self.run_js(insert_script(self.adapter, self.prompt), self.on_inserted)
+
+    def on_inserted(self, inserted):
+        if self.finished:
+            return
+        if not inserted:
+            self.fail("Could not find the message box")
+            return
+        PROMPT_INSERTS.inc(assistant=QUrl(self.adapter["url"]).host())  # Same label as the browser's metrics
+        if self.submit:
+            # The send button is enabled only after the page has processed the input
+            QTimer.singleShot(200, self, lambda: self.try_submit(self.SUBMIT_RETRIES))
+        else:
+            self.finished = True
+            self.completed.emit(0.0, "")
+
+    def try_submit(self, retries):
+        def on_submitted(ok):
+            if self.finished:
+                return
+            if ok:
+                self.submitted_at = time.perf_counter()
+                self.poll_timer.start()
+            elif retries > 1:
+                QTimer.singleShot(200, self, lambda: self.try_submit(retries - 1))
+            else:
+                self.fail("Could not submit the prompt")
+        self.run_js(submit_script(self.adapter), on_submitted)
+
+    def poll(self):
+        if self.elapsed_ms() > self.timeout_ms:
+            self.fail("Timed out waiting for the reply")
+            return
+        self.run_js(state_script(self.adapter, with_text=self.stream_text), self.on_state)
+
+    def on_state(self, state_json):
+        if self.finished:
+            return
+        try:
+            state = json.loads(state_json)
+        except (TypeError, ValueError):
+            return
+        if state["count"] <= self.baseline_count or state["length"] == 0:
+            return
+
+        if self.first_token_ms is None:
+            self.first_token_ms = self.elapsed_ms()
+            self.first_token.emit(self.first_token_ms)
+
+        if state["length"] != self.last_length:
+            self.last_length = state["length"]
+            self.stable_since = time.perf_counter()
+            self.progressed.emit(state["length"])
+            if self.stream_text:
+                self.streamed.emit(state["text"] or "")
+            return
+
+        stable_ms = (time.perf_counter() - self.stable_since) * 1000
+        if not state["streaming"] and stable_ms >= self.settle_ms:
+            self.poll_timer.stop()
+            self.finished = True
+            # Completion time excludes the settle period used to confirm it
+            complete_ms = self.elapsed_ms() - stable_ms
+            self.run_js(state_script(self.adapter, with_text=True), lambda final: self.on_final(complete_ms, final))
+
+    def on_final(self, complete_ms, final_json):
+        if not self.cancelled:
+            self.completed.emit(complete_ms, json.loads(final_json)["text"] if final_json else "")
+
+    def cancel(self):
+        """Stop following the reply; nothing is emitted afterwards, even by callbacks already queued."""
+        self.poll_timer.stop()
+        self.finished = True
+        self.cancelled = True
+
+    def fail(self, reason):
+        self.poll_timer.stop()
+        if not self.finished:
+            self.finished = True
+            self.failed.emit(reason)
@@ -0,0 +1,294 @@
+import json
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from PySide6.QtWebEngineCore import QWebEngineScript
+
+from assistant_automation import ASSISTANTS, PromptRun, assistant_for_url, submit_script
+
+# Configuration
+AUTOMATION_SOCKET = "all_ai_automation"  # A Unix socket in the temp directory (a named pipe on Windows)
+MAX_REQUEST_BYTES = 4 * 1024 * 1024
+PAGE_READY_TIMEOUT_MS = 30000
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+APP_ERROR = -32000
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+class AutomationConnection(QObject):
+    """One client connection, framed as one JSON-RPC message per line in each direction.
+
+    Requests are handled as they arrive and answered when they finish, so a client can keep
+    several in flight and match replies by id.
+    """
+
+    def __init__(self, socket, server):
+        super().__init__(server)
+        self.socket = socket
+        self.server = server
+        self.buffer = b""
+        socket.readyRead.connect(self.on_ready_read)
+        socket.disconnected.connect(self.on_disconnected)
+
+    def on_ready_read(self):
+        self.buffer += bytes(self.socket.readAll())
+        while b"\n" in self.buffer:
+            line, self.buffer = self.buffer.split(b"\n", 1)
+            if line.strip():
+                self.server.handle(self, line)
+        if len(self.buffer) > MAX_REQUEST_BYTES:
+            self.send({"jsonrpc": "2.0", "id": None, "error": {"code": INVALID_REQUEST, "message": "Request too large"}})
+            self.socket.disconnectFromServer()
+
+    def send(self, message):
+        if self.socket.state() == QLocalSocket.LocalSocketState.ConnectedState:
+            self.socket.write(json.dumps(message).encode("utf-8") + b"\n")
+
+    def on_disconnected(self):
+        self.server.drop_connection(self)
+        self.socket.deleteLater()
+        self.deleteLater()
+
+
+class AutomationServer(QObject):
+    """Local JSON-RPC service that drives the assistant window of a running FloatingIcon.
+
+    Methods: list_assistants, status, show, hide, switch_assistant, insert, submit, prompt
+    and cancel. Page work (insert, submit, prompt) is queued and run one request at a time,
+    since the page has a single message box. ``prompt`` with ``"stream": true`` sends
+    ``reply`` notifications carrying the new text as it arrives, before the final response.
+    """
+
+    def __init__(self, icon, name=AUTOMATION_SOCKET, parent=None):
+        super().__init__(parent)
+        self.icon = icon
+        self.name = name
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self.server.newConnection.connect(self.on_new_connection)
+        self.jobs = []
+        self.current = None
+        self.methods = {
+            "list_assistants": self.list_assistants,
+            "status": self.status,
+            "show": self.show,
+            "hide": self.hide,
+            "switch_assistant": self.switch_assistant,
+            "insert": self.queue_page_job,
+            "submit": self.queue_page_job,
+            "prompt": self.queue_page_job,
+            "cancel": self.cancel,
+        }
+
+    def start(self):
+        if self.server.listen(self.name):
+            print(f"Automation API listening on {self.server.fullServerName()}")
+            return True
+        # A socket file left behind by a crash blocks listen(); remove it unless another instance answers
+        probe = QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(200):
+            probe.disconnectFromServer()
+            print("Automation API is already served by another instance")
+            return False
+        QLocalServer.removeServer(self.name)
+        if self.server.listen(self.name):
+            print(f"Automation API listening on {self.server.fullServerName()}")
+            return True
+        print(f"Error starting automation API: {self.server.errorString()}")
+        return False
+
+    def close(self):
+        self.server.close()
+
+    def on_new_connection(self):
+        while self.server.hasPendingConnections():
+            AutomationConnection(self.server.nextPendingConnection(), self)
+
+    def drop_connection(self, connection):
+        self.jobs = [job for job in self.jobs if job["connection"] is not connection]
+        if self.current and self.current["connection"] is connection:
+            self.current["connection"] = None
+            if self.current.get("run"):
+                self.current["run"].fail("Client disconnected")
+
+    def handle(self, connection, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            connection.send({"jsonrpc": "2.0", "id": None, "error": {"code": PARSE_ERROR, "message": "Parse error"}})
+            return
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            request_id = request.get("id") if isinstance(request, dict) else None
+            connection.send({"jsonrpc": "2.0", "id": request_id, "error": {"code": INVALID_REQUEST, "message": "Invalid request"}})
+            return
+
+        request_id = request.get("id")
+        params = request.get("params") or {}
+        handler = self.methods.get(request["method"])
+        try:
+            if handler is None:
+                raise RpcError(METHOD_NOT_FOUND, f"Unknown method: {request['method']}")
+            if not isinstance(params, dict):
+                raise RpcError(INVALID_PARAMS, "params must be an object")
+            result = handler(connection, request_id, request["method"], params)
+        except RpcError as e:
+            self.reply_error(connection, request_id, e.code, e.message)
+            return
+        if result is not None:
+            self.reply(connection, request_id, result)
+
+    def reply(self, connection, request_id, result):
+        # Requests without an id are notifications and get no response
+        if connection and request_id is not None:
+            connection.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def reply_error(self, connection, request_id, code, message):
+        if connection and request_id is not None:
+            connection.send({"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}})
+
+    def assistant_param(self, params):
+        key = params.get("assistant")
+        if key not in ASSISTANTS:
+            raise RpcError(INVALID_PARAMS, f"assistant must be one of: {', '.join(ASSISTANTS)}")
+        return key
+
+    # Window methods answer immediately
+
+    def list_assistants(self, connection, request_id, method, params):
+        return [{"assistant": key, "name": adapter["name"], "url": adapter["url"]} for key, adapter in ASSISTANTS.items()]
+
+    def status(self, connection, request_id, method, params):
+        browser = self.icon.browser_window
+        return {
+            "assistant": assistant_for_url(self.icon.selected_url) if self.icon.selected_url else None,
+            "visible": bool(browser and browser.isVisible()),
+            "loaded": bool(browser and browser.page_loaded),
+            "pending": len(self.jobs) + (1 if self.current else 0),
+        }
+
+    def show(self, connection, request_id, method, params):
+        key = self.assistant_param(params) if "assistant" in params else None
+        if key and self.icon.selected_url and assistant_for_url(self.icon.selected_url) != key:
+            return self.switch_assistant(connection, request_id, method, params)
+        if not key and not self.icon.selected_url:
+            raise RpcError(INVALID_PARAMS, "No assistant selected yet; pass assistant")
+        self.icon.show_browser(key)
+        return True
+
+    def hide(self, connection, request_id, method, params):
+        self.icon.hide_browser()
+        return True
+
+    def switch_assistant(self, connection, request_id, method, params):
+        key = self.assistant_param(params)
+        if self.current or self.jobs:
+            raise RpcError(APP_ERROR, "Prompts are still running on the current assistant")
+        if self.icon.browser_window and self.icon.browser_window.batch_runner:
+            raise RpcError(APP_ERROR, "A batch run is using the current assistant")
+        self.icon.switch_assistant(key)
+        return True
+
+    # Page methods run in order, one at a time
+
+    def queue_page_job(self, connection, request_id, method, params):
+        if method in ("insert", "prompt") and not isinstance(params.get("text"), str):
+            raise RpcError(INVALID_PARAMS, "text must be a string")
+        self.jobs.append({"connection": connection, "id": request_id, "method": method, "params": params, "waited_ms": 0})
+        self.run_next_job()
+        return None
+
+    def cancel(self, connection, request_id, method, params):
+        target = params.get("id")
+        for job in self.jobs:
+            if job["connection"] is connection and job["id"] == target:
+                self.jobs.remove(job)
+                self.reply_error(connection, target, APP_ERROR, "Cancelled")
+                return True
+        if self.current and self.current["connection"] is connection and self.current["id"] == target:
+            if self.current.get("run"):
+                self.current["run"].fail("Cancelled")
+                return True
+        return False
+
+    def run_next_job(self):
+        if self.current or not self.jobs:
+            return
+        job = self.jobs[0]
+        browser = self.icon.browser_window
+        if not browser:
+            self.jobs.pop(0)
+            self.reply_error(job["connection"], job["id"], APP_ERROR, "The assistant is not open; call show first")
+            self.run_next_job()
+            return
+        if browser.batch_runner:
+            # Both would type into the same message box
+            self.jobs.pop(0)
+            self.reply_error(job["connection"], job["id"], APP_ERROR, "A batch run is using the assistant")
+            self.run_next_job()
+            return
+        if not browser.page_loaded:
+            # A page that was just opened needs to finish loading before it has a message box
+            if job["waited_ms"] >= PAGE_READY_TIMEOUT_MS:
+                self.jobs.pop(0)
+                self.reply_error(job["connection"], job["id"], APP_ERROR, "The assistant page did not finish loading")
+                self.run_next_job()
+            else:
+                job["waited_ms"] += 250
+                QTimer.singleShot(250, self, self.run_next_job)
+            return
+
+        self.jobs.pop(0)
+        self.current = job
+        adapter = ASSISTANTS[assistant_for_url(browser.url)]
+        page = browser.browser.page()
+        if job["method"] == "submit":
+            page.runJavaScript(submit_script(adapter), QWebEngineScript.ScriptWorldId.ApplicationWorld,
+                               lambda ok: self.finish_job(bool(ok)))
+            return
+
+        stream = job["method"] == "prompt" and bool(job["params"].get("stream"))
+        run = PromptRun(page, adapter, self, stream_text=stream)
+        job["run"] = run
+        job["sent"] = ""
+        if stream:
+            run.streamed.connect(self.send_delta)
+        run.completed.connect(lambda ms, text: self.finish_job(
+            True if job["method"] == "insert" else
+            {"text": text, "first_token_ms": run.first_token_ms, "complete_ms": ms}))
+        run.failed.connect(lambda reason: self.finish_job(error=reason))
+        run.start(job["params"]["text"], submit=job["method"] == "prompt")
+
+    def send_delta(self, text):
+        job = self.current
+        if not job or not job["connection"]:
+            return
+        # Rendering can rewrite earlier text (e.g. markdown); resend it whole when that happens
+        if text.startswith(job["sent"]):
+            params = {"id": job["id"], "delta": text[len(job["sent"]):]}
+        else:
+            params = {"id": job["id"], "text": text}
+        job["sent"] = text
+        job["connection"].send({"jsonrpc": "2.0", "method": "reply", "params": params})
+
+    def finish_job(self, result=None, error=None):
+        job = self.current
+        self.current = None
+        if job.get("run"):
+            job["run"].deleteLater()
+        if error is not None:
+            self.reply_error(job["connection"], job["id"], APP_ERROR, error)
+        else:
+            self.reply(job["connection"], job["id"], result)
+        self.run_next_job()
@@ -0,0 +1,68 @@
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# Must match AUTOMATION_SOCKET in automation_api.py; Qt puts a bare socket name in the temp directory
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "all_ai_automation")
+
+
+class AutomationClient:
+    """Minimal client for the automation API of a running All_AI instance (Unix socket only)."""
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.reader = self.sock.makefile("r", encoding="utf-8")
+        self.ids = itertools.count(1)
+
+    def send(self, method, **params):
+        request_id = next(self.ids)
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+        self.sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        return request_id
+
+    def wait(self, request_id, on_reply=None):
+        """Read messages until ``request_id`` is answered; ``reply`` notifications go to on_reply."""
+        for line in self.reader:
+            message = json.loads(line)
+            if message.get("method") == "reply" and on_reply:
+                on_reply(message["params"])
+            elif message.get("id") == request_id:
+                if "error" in message:
+                    raise RuntimeError(message["error"]["message"])
+                return message["result"]
+        raise ConnectionError("Automation API closed the connection")
+
+    def call(self, method, **params):
+        return self.wait(self.send(method, **params))
+
+    def close(self):
+        self.sock.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send a prompt to the running assistant and print the reply as it streams")
+    parser.add_argument("prompt")
+    parser.add_argument("--assistant", help="chatgpt, grok or claude; defaults to the one already open")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET)
+    args = parser.parse_args()
+
+    client = AutomationClient(args.socket)
+    client.call("show", **({"assistant": args.assistant} if args.assistant else {}))
+
+    def on_reply(params):
+        # A full "text" replaces what was printed so far; print it on a new line
+        sys.stdout.write(params["delta"] if "delta" in params else "\n" + params["text"])
+        sys.stdout.flush()
+
+    result = client.wait(client.send("prompt", text=args.prompt, stream=True), on_reply)
+    print(f"\n\nFirst token: {result['first_token_ms'] or 0:,.0f} ms | Complete: {result['complete_ms']:,.0f} ms")
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
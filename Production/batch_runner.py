@@ -0,0 +1,183 @@
+import csv
+import os
+import time
+
+from PySide6.QtCore import QObject, QTimer, QUrl, Signal
+
+from assistant_automation import PromptRun
+
+RESULT_COLUMNS = ["index", "prompt", "response", "first_token_ms", "complete_ms", "status", "finished_at"]
+
+
+def load_prompt_list(path):
+    """Prompts from a .txt file (one per line) or the 'prompt' (else first) column of a .csv/.xlsx."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xlsx":
+        from openpyxl import load_workbook
+        sheet = load_workbook(path, read_only=True).active
+        rows = [[("" if cell is None else str(cell)) for cell in row] for row in sheet.iter_rows(values_only=True)]
+    elif extension == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f if line.strip()]
+
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    column = header.index("prompt") if "prompt" in header else 0
+    body = rows[1:] if "prompt" in header else rows
+    return [row[column].strip() for row in body if len(row) > column and row[column].strip()]
+
+
+class BatchResultWriter:
+    """Appends one row per finished prompt so a crash loses at most the prompt in flight.
+
+    XLSX output is assembled from a sidecar CSV once the batch is done.
+    """
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.is_xlsx = output_path.lower().endswith(".xlsx")
+        self.csv_path = output_path + ".partial.csv" if self.is_xlsx else output_path
+
+    def completed_indexes(self):
+        """Indexes that already have a successful result, for resuming."""
+        if not os.path.exists(self.csv_path):
+            return set()
+        with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
+            return {int(row["index"]) for row in csv.DictReader(f) if row.get("status") == "ok"}
+
+    def append(self, row):
+        new_file = not os.path.exists(self.csv_path)
+        with open(self.csv_path, "a", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+            if new_file:
+                writer.writeheader()
+            writer.writerow(row)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def finalize(self):
+        if not self.is_xlsx or not os.path.exists(self.csv_path):
+            return
+        from openpyxl import Workbook
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Results")
+        with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
+            for row in csv.reader(f):
+                sheet.append(row)
+        workbook.save(self.output_path)
+
+
+class BatchRunner(QObject):
+    """Runs a list of prompts one after another through an assistant page."""
+    progress = Signal(int, int, float)  # Finished, total, prompts per minute
+    finished = Signal(str)
+
+    LOAD_SETTLE_MS = 1500  # Time for the chat page to render its message box after loadFinished
+    MAX_ATTEMPTS = 2
+
+    def __init__(self, view, adapter, prompts, output_path, pace_seconds=5.0, new_chat_per_prompt=True, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.adapter = adapter
+        self.prompts = prompts
+        self.pace_seconds = pace_seconds
+        self.new_chat_per_prompt = new_chat_per_prompt
+        self.writer = BatchResultWriter(output_path)
+        self.stopped = False
+        self.closed = False
+        self.current_run = None
+
+    def start(self):
+        done = self.writer.completed_indexes()
+        self.queue = [i for i in range(len(self.prompts)) if i not in done]
+        self.resumed = len(done)
+        self.processed = 0
+        self.started_at = time.perf_counter()
+        self.last_submit_at = 0.0
+        self.view.loadFinished.connect(self.on_load_finished)
+        self.waiting_for_load = False
+        self.next_prompt()
+
+    def stop(self):
+        """Stop and write the results file before returning; ``finished`` is emitted by then."""
+        self.stopped = True
+        if self.current_run:
+            # Records the prompt in flight, which finishes the run
+            self.current_run.fail("Stopped")
+        self.finish()
+
+    def next_prompt(self):
+        if self.stopped or not self.queue:
+            self.finish()
+            return
+        self.index = self.queue[0]
+        self.attempt = 1
+        # Pace submissions so the assistant is not flooded
+        wait = self.pace_seconds - (time.perf_counter() - self.last_submit_at)
+        QTimer.singleShot(max(0, int(wait * 1000)), self, self.open_chat)
+
+    def open_chat(self):
+        if self.stopped:
+            self.finish()
+        elif self.new_chat_per_prompt:
+            self.waiting_for_load = True
+            self.view.setUrl(QUrl(self.adapter["url"]))
+        else:
+            self.run_prompt()
+
+    def on_load_finished(self, ok):
+        if self.waiting_for_load:
+            self.waiting_for_load = False
+            QTimer.singleShot(self.LOAD_SETTLE_MS, self, self.run_prompt)
+
+    def run_prompt(self):
+        if self.stopped:
+            self.finish()
+            return
+        self.last_submit_at = time.perf_counter()
+        run = PromptRun(self.view.page(), self.adapter, self)
+        run.completed.connect(lambda ms, text: self.record(text, ms, "ok"))
+        run.failed.connect(self.on_failed)
+        self.current_run = run
+        run.start(self.prompts[self.index])
+
+    def on_failed(self, reason):
+        if not self.stopped and self.attempt < self.MAX_ATTEMPTS:
+            self.attempt += 1
+            QTimer.singleShot(2000, self, self.open_chat)
+        else:
+            self.record("", None, f"failed: {reason}")
+
+    def record(self, text, complete_ms, status):
+        run = self.current_run
+        self.current_run = None
+        self.writer.append({
+            "index": self.index,
+            "prompt": self.prompts[self.index],
+            "response": text,
+            "first_token_ms": round(run.first_token_ms) if run and run.first_token_ms else "",
+            "complete_ms": round(complete_ms) if complete_ms is not None else "",
+            "status": status,
+            "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        self.queue.pop(0)
+        self.processed += 1
+        minutes = (time.perf_counter() - self.started_at) / 60
+        self.progress.emit(self.resumed + self.processed, len(self.prompts), self.processed / minutes if minutes else 0.0)
+        self.next_prompt()
+
+    def finish(self):
+        # Timers still pending from before a stop land here too
+        if self.closed:
+            return
+        self.closed = True
+        self.view.loadFinished.disconnect(self.on_load_finished)
+        self.writer.finalize()
+        minutes = (time.perf_counter() - self.started_at) / 60
+        rate = self.processed / minutes if minutes else 0.0
+        state = "Stopped" if self.stopped and self.queue else "Finished"
+        self.finished.emit(f"{state}: {self.processed} prompts this run ({self.resumed} resumed), {rate:.1f} prompts/min")
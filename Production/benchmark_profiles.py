@@ -0,0 +1,93 @@
+"""Measure page load time and total RSS of the app's QtWebEngine setup under each Chromium profile.
+
+Every run starts a fresh process, so profiles cannot influence each other:
+
+    python benchmark_profiles.py --url https://claude.ai --runs 3
+
+RSS is the sum over the Python process and all QtWebEngineProcess children (Linux /proc).
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from chromium_profiles import PROFILES
+
+SETTLE_SECONDS = 5  # Time after loadFinished before memory is sampled
+
+
+def run_child(profile, url, timeout):
+    """Load ``url`` once under ``profile`` and print a JSON result line."""
+    from chromium_profiles import apply_chromium_profile
+    qt_args = apply_chromium_profile([sys.argv[0], "--chromium-profile", profile])
+
+    from PySide6.QtCore import QTimer, QUrl
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtWebEngineWidgets import QWebEngineView
+    from process_stats import process_tree_rss
+
+    app = QApplication(qt_args)
+    view = QWebEngineView()
+    view.resize(1000, 700)
+    result = {"profile": profile}
+    start = time.perf_counter()
+
+    def report():
+        tree = process_tree_rss()
+        result["rss_mb"] = sum(rss for _, rss in tree.values()) / 2**20
+        result["processes"] = len(tree)
+        print(json.dumps(result), flush=True)
+        app.quit()
+
+    def on_load_finished(ok):
+        result["load_ms"] = (time.perf_counter() - start) * 1000
+        result["ok"] = ok
+        QTimer.singleShot(SETTLE_SECONDS * 1000, report)
+
+    view.loadFinished.connect(on_load_finished)
+    QTimer.singleShot(int(timeout * 1000), report)
+    view.show()
+    view.setUrl(QUrl(url))
+    app.exec()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Chromium runtime profiles")
+    parser.add_argument("--url", default="https://chat.openai.com")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.url, args.timeout)
+        return
+
+    print(f"{'profile':<12} {'load p50 ms':>12} {'RSS p50 MB':>11} {'processes':>10}")
+    for profile in args.profiles:
+        results = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", profile, "--url", args.url, "--timeout", str(args.timeout)],
+                capture_output=True, text=True, timeout=args.timeout + SETTLE_SECONDS + 30,
+            ).stdout
+            lines = [line for line in output.splitlines() if line.startswith("{")]
+            if lines:
+                results.append(json.loads(lines[-1]))
+
+        loaded = [r for r in results if "load_ms" in r]
+        if not loaded:
+            print(f"{profile:<12} {'failed':>12}")
+            continue
+        print(
+            f"{profile:<12} {statistics.median(r['load_ms'] for r in loaded):>12.0f} "
+            f"{statistics.median(r['rss_mb'] for r in loaded):>11.0f} "
+            f"{max(r['processes'] for r in loaded):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
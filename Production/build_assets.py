@@ -0,0 +1,41 @@
+"""Build the pre-scaled icon variants and compile them into the assets_rc.py resource module.
+
+Run before packaging, from any directory:  python build_assets.py
+"""
+import os
+import subprocess
+import sys
+
+from assets import ASSET_DIR, ASSETS, SCALE_FACTORS, app_dir, scaled_image, variant_name
+
+
+def main():
+    asset_dir = os.path.join(app_dir(), ASSET_DIR)
+    os.makedirs(asset_dir, exist_ok=True)
+
+    files = []
+    for name in ASSETS:
+        for scale in SCALE_FACTORS:
+            image = scaled_image(name, scale)
+            if image.isNull():
+                print(f"Missing {name}.png, skipped")
+                break
+            filename = variant_name(name, scale)
+            image.save(os.path.join(asset_dir, filename), "PNG")
+            files.append(filename)
+
+    qrc_path = os.path.join(app_dir(), "assets.qrc")
+    with open(qrc_path, "w") as f:
+        f.write('<RCC>\n  <qresource prefix="/assets">\n')
+        for filename in files:
+            f.write(f'    <file alias="{filename}">{ASSET_DIR}/{filename}</file>\n')
+        f.write('  </qresource>\n</RCC>\n')
+
+    result = subprocess.run(["pyside6-rcc", qrc_path, "-o", os.path.join(app_dir(), "assets_rc.py")])
+    if result.returncode != 0:
+        sys.exit("pyside6-rcc failed")
+    print(f"Built {len(files)} variants into assets_rc.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+
+from runtime_config import load_runtime_config
+
+DEFAULT_PROFILE = "balanced"
+
+# Chromium switches applied through QTWEBENGINE_CHROMIUM_FLAGS. They only take effect if set
+# before QtWebEngine starts, i.e. before the QApplication is created.
+PROFILES = {
+    # 8 GB thin clients: one renderer, software rendering, small V8 heap, throttled background work
+    "low-memory": [
+        "--renderer-process-limit=1",
+        "--process-per-site",
+        "--disable-gpu",
+        "--disable-gpu-compositing",
+        "--enable-low-end-device-mode",
+        "--js-flags=--max-old-space-size=256",
+    ],
+    # Close to Chromium defaults, with a bounded number of renderers and V8 heap
+    "balanced": [
+        "--renderer-process-limit=2",
+        "--js-flags=--max-old-space-size=512",
+    ],
+    # Workstations: GPU rasterization and no throttling of the hidden assistant page
+    "performance": [
+        "--enable-gpu-rasterization",
+        "--ignore-gpu-blocklist",
+        "--disable-background-timer-throttling",
+        "--disable-renderer-backgrounding",
+        "--disable-backgrounding-occluded-windows",
+        "--js-flags=--max-old-space-size=2048",
+    ],
+}
+
+
+def apply_chromium_profile(argv):
+    """Pick the profile from ``--chromium-profile`` or the runtime config and export its flags.
+
+    Returns the remaining arguments, to be passed on to QApplication.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--chromium-profile", choices=sorted(PROFILES))
+    args, remaining = parser.parse_known_args(argv[1:])
+
+    name = args.chromium_profile or load_runtime_config().get("chromium_profile", DEFAULT_PROFILE)
+    if name not in PROFILES:
+        print(f"Unknown Chromium profile '{name}', using '{DEFAULT_PROFILE}'")
+        name = DEFAULT_PROFILE
+
+    # Flags the user already exported come last so they can override the profile
+    flags = PROFILES[name] + os.environ.get("QTWEBENGINE_CHROMIUM_FLAGS", "").split()
+    os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = " ".join(flags)
+    print(f"Chromium profile: {name} ({os.environ['QTWEBENGINE_CHROMIUM_FLAGS']})")
+    return [argv[0]] + remaining
@@ -12,6 +12,13 @@ from PySide6.QtGui import QAction
 from PySide6.QtWebEngineCore import QWebEngineProfile
 import hashlib
 import uuid
+from theme_engine import APP_PALETTE, apply_theme, set_role
+
+
+# Colours of this app, compiled by the theme engine into the application stylesheet
+PALETTE = dict(APP_PALETTE, text="#F5F5F5", background="#1E1E1E", field="#2A2A2A", field_border="#4A4A4A", hover="#3A3A3A",
+               neutral="#2A2A2A", panel_border=2, toast_background="rgba(30, 30, 30, 0.9)", icon_background="rgba(30, 30, 30, 0.5)")
+THEME = {"border_color": "#F28C38", "button_color": "#F28C38", "submenu_color": "#2A2A2A", "size_color": "#2A2A2A"}
 
 def resource_path(relative_path):
     """Get the absolute path to a resource, works for development and PyInstaller bundles."""
@@ -48,19 +55,19 @@ class RegistrationDialog(QDialog):
         
         # Title
         title_label = QLabel("API Token Registration")
-        title_label.setStyleSheet("color: #F5F5F5; font-size: 16px; font-weight: bold;")
+        set_role(title_label, "title")
         title_label.setAlignment(Qt.AlignCenter)
         
         # API token input
         self.token_input = QLineEdit()
-        self.token_input.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.token_input, "field")
         self.token_input.setPlaceholderText("Paste your API token here")
         
         # Buttons
         buttons_layout = QHBoxLayout()
-        self.activate_button = self.create_button("Activate", "#F28C38")
+        self.activate_button = self.create_button("Activate", "primary")
         self.activate_button.clicked.connect(self.verify_token)
-        self.close_button = self.create_button("Close", "#2A2A2A")
+        self.close_button = self.create_button("Close", "neutral")
         self.close_button.clicked.connect(QApplication.quit)
         
         buttons_layout.addWidget(self.activate_button)
@@ -71,18 +78,14 @@ class RegistrationDialog(QDialog):
         main_layout.addLayout(buttons_layout)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #1E1E1E; border-radius: 10px; border: 2px solid #F28C38;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
 
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid #F5F5F5;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
 
     def generate_filename(self, user_secret: str, ext="txt"):
         nonce = uuid.uuid4().hex
@@ -177,23 +180,11 @@ class ToastNotification(QWidget):
         layout.setContentsMargins(15, 10, 15, 10)
         
         label = QLabel(message)
-        label.setStyleSheet("""
-            color: #F5F5F5;
-            font-size: 12px;
-            font-weight: bold;
-        """)
         label.setAlignment(Qt.AlignCenter)
         
         layout.addWidget(label)
         self.setLayout(layout)
-        
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(30, 30, 30, 0.9);
-                border-radius: 15px;
-                border: 2px solid #F28C38;
-            }
-        """)
+        set_role(self, "toast")
     
     def animate_show(self):
         self.effect = QGraphicsOpacityEffect(self)
@@ -241,24 +232,23 @@ class PromptCreatorDialog(QDialog):
         
         filename_layout = QHBoxLayout()
         filename_label = QLabel("File Name:")
-        filename_label.setStyleSheet("color: #F5F5F5;")
         self.filename_input = QLineEdit()
-        self.filename_input.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.filename_input, "field")
         self.filename_input.setPlaceholderText("Enter file name (without extension)")
         
         filename_layout.addWidget(filename_label)
         filename_layout.addWidget(self.filename_input)
         
         self.content_text = QTextEdit()
-        self.content_text.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.content_text, "field")
         self.content_text.setPlaceholderText("Write your prompt here...")
         
         buttons_layout = QHBoxLayout()
         
-        self.save_button = self.create_button("Save", "#F28C38")
+        self.save_button = self.create_button("Save", "primary")
         self.save_button.clicked.connect(self.save_prompt)
         
-        self.cancel_button = self.create_button("Cancel", "#2A2A2A")
+        self.cancel_button = self.create_button("Cancel", "neutral")
         self.cancel_button.clicked.connect(self.close)
         
         buttons_layout.addWidget(self.save_button)
@@ -269,18 +259,14 @@ class PromptCreatorDialog(QDialog):
         main_layout.addLayout(buttons_layout)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #1E1E1E; border-radius: 10px; border: 2px solid #F28C38;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid #F5F5F5;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def save_prompt(self):
         filename = self.filename_input.text().strip()
@@ -343,49 +329,24 @@ class PromptViewerDialog(QDialog):
         main_layout = QVBoxLayout()
         
         title_label = QLabel("Prompts")
-        title_label.setStyleSheet("color: #F5F5F5; font-size: 16px; font-weight: bold;")
+        set_role(title_label, "title")
         
         self.splitter = QSplitter(Qt.Horizontal)
-        self.splitter.setStyleSheet("QSplitter::handle { background-color: #2A2A2A; width: 2px; }")
+        set_role(self.splitter, "split")
         
         self.file_list = QListWidget()
-        self.file_list.setStyleSheet("""
-            QListWidget {
-                background-color: #2A2A2A; 
-                color: #F5F5F5; 
-                border-radius: 5px;
-                outline: none;
-                border: 1px solid #4A4A4A;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #4A4A4A;
-                background-color: #2A2A2A;
-            }
-            QListWidget::item:hover {
-                background-color: #3A3A3A;
-                color: #F5F5F5;
-            }
-            QListWidget::item:selected {
-                background-color: #F28C38;
-                color: #F5F5F5;
-            }
-            QListWidget::item:selected:hover {
-                background-color: #E07B30;
-                color: #F5F5F5;
-            }
-        """)
+        set_role(self.file_list, "list")
         self.file_list.itemClicked.connect(self.show_file_content)
         
         right_widget = QWidget()
         right_layout = QVBoxLayout()
         
         self.content_viewer = QTextBrowser()
-        self.content_viewer.setStyleSheet("background-color: #2A2A2A; color: #F5F5F5; border-radius: 5px; padding: 5px; border: 1px solid #4A4A4A;")
+        set_role(self.content_viewer, "field")
         self.content_viewer.setReadOnly(True)
         self.content_viewer.setPlaceholderText("Select a prompt to view its content")
         
-        self.copy_button = self.create_button("Copy Content", "#F28C38")
+        self.copy_button = self.create_button("Copy Content", "primary")
         self.copy_button.clicked.connect(self.copy_content)
         self.copy_button.setEnabled(False)
         
@@ -398,7 +359,7 @@ class PromptViewerDialog(QDialog):
         
         self.splitter.setSizes([30, 70])
         
-        self.close_button = self.create_button("Close", "#2A2A2A")
+        self.close_button = self.create_button("Close", "neutral")
         self.close_button.clicked.connect(self.close)
         
         main_layout.addWidget(title_label)
@@ -406,18 +367,14 @@ class PromptViewerDialog(QDialog):
         main_layout.addWidget(self.close_button)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #1E1E1E; border-radius: 10px; border: 2px solid #F28C38;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid #F5F5F5;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def load_prompts(self):
         prompts_dir = "Prompts"
@@ -496,9 +453,9 @@ class FloatingBrowser(QMainWindow):
         self.browser.setUrl(QUrl("https://claude.ai"))
         self.browser.setStyleSheet("background-color: #1E1E1E; border-radius: 10px;")
 
-        self.prompt_button = self.create_button("Prompt", "#2A2A2A")
-        self.size_button = self.create_button("Size", "#2A2A2A")
-        self.close_button = self.create_button("Close", "#F28C38")
+        self.prompt_button = self.create_button("Prompt", "submenu")
+        self.size_button = self.create_button("Size", "size")
+        self.close_button = self.create_button("Close", "primary")
         self.close_button.clicked.connect(self.close_callback)
 
         submenu_layout = QHBoxLayout()
@@ -518,7 +475,7 @@ class FloatingBrowser(QMainWindow):
         large_height = int(self.screen_height * 0.8)
         
         self.size_menu = QMenu(self)
-        self.size_menu.setStyleSheet("background-color: #1E1E1E; color: #F5F5F5; border-radius: 10px; border: 2px solid #4A4A4A;")
+        set_role(self.size_menu, "size")
 
         small_action = self.create_menu_action("Small", "#2A2A2A", self.resize_browser, small_width, small_height)
         medium_action = self.create_menu_action("Medium", "#2A2A2A", self.resize_browser, medium_width, medium_height)
@@ -531,7 +488,7 @@ class FloatingBrowser(QMainWindow):
         self.size_button.setMenu(self.size_menu)
         
         self.prompt_menu = QMenu(self)
-        self.prompt_menu.setStyleSheet("background-color: #1E1E1E; color: #F5F5F5; border-radius: 10px; border: 2px solid #4A4A4A;")
+        set_role(self.prompt_menu, "submenu")
         
         create_action = self.create_menu_action("Create", "#2A2A2A", self.show_prompt_creator)
         open_action = self.create_menu_action("Open", "#2A2A2A", self.open_prompt)
@@ -548,7 +505,7 @@ class FloatingBrowser(QMainWindow):
         layout.addWidget(self.close_button)
         
         container.setLayout(layout)
-        container.setStyleSheet("background-color: #1E1E1E; border-radius: 10px; border: 2px solid #F28C38;")
+        set_role(container, "panel")
 
         self.setCentralWidget(container)
         
@@ -559,12 +516,8 @@ class FloatingBrowser(QMainWindow):
         self.prompt_menu.setFixedWidth(self.prompt_button.width())
         super().showEvent(event)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid #F5F5F5;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #F5F5F5; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def create_menu_action(self, text, color, slot, *args):
         action = QAction(text, self)
@@ -640,7 +593,7 @@ class FloatingIcon(QWidget):
         
         self.icon_label = QLabel()
         self.icon_label.setPixmap(QPixmap(self.icon_path).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        self.icon_label.setStyleSheet("border-radius: 32px; background-color: rgba(30, 30, 30, 0.5);")
+        set_role(self.icon_label, "icon")
         layout.addWidget(self.icon_label)
         
         self.setLayout(layout)
@@ -692,6 +645,7 @@ class FloatingIcon(QWidget):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
+    apply_theme(THEME, PALETTE)
     
     icon_path = resource_path("icon.png")
     floating_icon = FloatingIcon(icon_path)
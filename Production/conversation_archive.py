@@ -0,0 +1,297 @@
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from PySide6.QtCore import QFile, QIODevice, QObject, Slot
+from PySide6.QtWebChannel import QWebChannel
+from PySide6.QtWebEngineCore import QWebEngineScript
+
+# Configuration
+ARCHIVE_FILE = os.path.join("config", "archive.db")
+FLUSH_INTERVAL = 2.0  # Seconds between batched writes
+CAPTURE_QUIET_MS = 2000  # How long the page must be idle before it is scanned for finished messages
+
+# Runs in the isolated world, so the page's own scripts see neither the observer nor the channel.
+# The mutation callback only arms a timer; the DOM is read once per quiet period, during idle time,
+# and never while a reply is still streaming, so typing and streaming are not slowed down.
+CAPTURE_TEMPLATE = """
+(function (config) {
+    if (window.__allAiCapture) return;
+    window.__allAiCapture = true;
+    var bridge = null;
+    var sent = new WeakMap();
+    var pending = null;
+    new QWebChannel(qt.webChannelTransport, function (channel) { bridge = channel.objects.archive; });
+
+    function streaming() {
+        for (var i = 0; i < config.stop.length; i++) {
+            if (document.querySelector(config.stop[i])) return true;
+        }
+        return false;
+    }
+    function siteId(el) {
+        for (var i = 0; i < config.ids.length; i++) {
+            var holder = el.closest('[' + config.ids[i] + ']');
+            if (holder) return holder.getAttribute(config.ids[i]);
+        }
+        return null;
+    }
+    function scan() {
+        pending = null;
+        if (!bridge || streaming()) { schedule(); return; }
+        var nodes = document.querySelectorAll(config.user + ', ' + config.message);
+        var batch = [], seen = new Map(), last = null;
+        for (var i = 0; i < nodes.length; i++) {
+            var el = nodes[i];
+            if (last && last.contains(el)) continue;
+            last = el;
+            var text = el.innerText;
+            if (!text) continue;
+            var role = el.matches(config.user) ? 'user' : 'assistant';
+            // Repeats of the same message in one conversation are told apart by their count so far
+            var seq = (seen.get(role + '\n' + text) || 0) + 1;
+            seen.set(role + '\n' + text, seq);
+            if (sent.get(el) === text) continue;
+            sent.set(el, text);
+            batch.push({id: siteId(el), seq: seq, role: role, text: text});
+        }
+        if (batch.length) {
+            bridge.capture(JSON.stringify({conversation: location.origin + location.pathname,
+                                           title: document.title, messages: batch}));
+        }
+    }
+    function schedule() {
+        if (pending) return;
+        pending = setTimeout(function () {
+            (window.requestIdleCallback || function (f) { f(); })(scan, {timeout: 5000});
+        }, config.quiet);
+    }
+    new MutationObserver(schedule).observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    schedule();
+})(%s);
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    assistant TEXT NOT NULL,
+    conversation TEXT NOT NULL,
+    title TEXT,
+    message_key TEXT NOT NULL,
+    role TEXT NOT NULL,
+    text TEXT NOT NULL,
+    captured_at REAL NOT NULL,
+    UNIQUE (conversation, message_key)
+);
+CREATE INDEX IF NOT EXISTS messages_captured_at ON messages (captured_at);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(text, content='messages', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS messages_ai AFTER INSERT ON messages BEGIN
+    INSERT INTO messages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_ad AFTER DELETE ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE OF text ON messages BEGIN
+    INSERT INTO messages_fts (messages_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO messages_fts (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+# A message already archived keeps its text; only the conversation title follows the page
+UPSERT = """
+INSERT INTO messages (assistant, conversation, title, message_key, role, text, captured_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (conversation, message_key) DO UPDATE SET title = excluded.title
+WHERE messages.title IS NOT excluded.title
+"""
+
+
+def message_key(role, text, site_id=None, seq=1):
+    """Identity of a message within its conversation: the site's own message id where it has one,
+    else a hash of the role and text plus how many times that content occurred up to it.
+
+    Positions in the page are not used: the sites lazy-load and virtualize older turns, so the
+    same position holds different messages over time.
+    """
+    if site_id:
+        return f"id:{site_id}"
+    digest = hashlib.sha256(f"{role}\n{text}".encode("utf-8")).hexdigest()[:32]
+    return f"sha:{digest}:{seq}"
+
+
+def fts_query(text):
+    """Quote each word so user input can't break FTS syntax; the last word also matches as a prefix."""
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+class ConversationArchive:
+    """SQLite archive of captured messages.
+
+    Captures are queued from the GUI thread and written by one background thread in a single
+    transaction per batch. Searches use their own connection; WAL lets them run during writes.
+    """
+
+    def __init__(self, path=ARCHIVE_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = self.connect()
+        db.executescript(SCHEMA)
+        try:
+            db.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5; search falls back to LIKE
+            self.has_fts = False
+        db.close()
+        self.reader = None
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self.write_loop, name="archive-writer", daemon=True)
+        self.writer.start()
+
+    def connect(self):
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def add(self, assistant, capture_json):
+        """Queue a capture from the page; parsing and writing happen on the writer thread."""
+        self.pending.put((assistant, capture_json, time.time()))
+
+    def write_loop(self):
+        db = self.connect()
+        stop = False
+        while not stop:
+            item = self.pending.get()
+            if item is None:
+                break
+            # Collect what arrives in the next FLUSH_INTERVAL so it shares one transaction
+            batch = [item]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self.pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self.write_batch(db, batch)
+        db.close()
+
+    def write_batch(self, db, batch):
+        rows = []
+        for assistant, capture_json, captured_at in batch:
+            try:
+                capture = json.loads(capture_json)
+                for message in capture["messages"]:
+                    key = message_key(message["role"], message["text"], message.get("id"), int(message.get("seq", 1)))
+                    rows.append((assistant, capture["conversation"], capture.get("title"), key,
+                                 message["role"], message["text"], captured_at))
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"Ignoring malformed capture: {e}")
+        try:
+            with db:
+                db.executemany(UPSERT, rows)
+        except sqlite3.Error as e:
+            print(f"Error writing archive: {e}")
+
+    def close(self):
+        """Write whatever is queued and stop the writer."""
+        self.pending.put(None)
+        self.writer.join(timeout=3)
+
+    def read_connection(self):
+        if self.reader is None:
+            self.reader = sqlite3.connect(self.path, timeout=10)
+            self.reader.row_factory = sqlite3.Row
+        return self.reader
+
+    def search(self, text, limit=200):
+        """Newest matching messages, or the newest messages when ``text`` is empty."""
+        db = self.read_connection()
+        if not text.strip():
+            return db.execute("SELECT id, assistant, conversation, title, role, substr(text, 1, 200) AS snippet, captured_at "
+                              "FROM messages ORDER BY captured_at DESC LIMIT ?", (limit,)).fetchall()
+        if self.has_fts:
+            return db.execute("SELECT m.id, m.assistant, m.conversation, m.title, m.role, "
+                              "snippet(messages_fts, 0, '[', ']', '...', 16) AS snippet, m.captured_at "
+                              "FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid "
+                              "WHERE messages_fts MATCH ? ORDER BY rank LIMIT ?", (fts_query(text), limit)).fetchall()
+        return db.execute("SELECT id, assistant, conversation, title, role, substr(text, 1, 200) AS snippet, captured_at "
+                          "FROM messages WHERE text LIKE ? ORDER BY captured_at DESC LIMIT ?",
+                          (f"%{text.strip()}%", limit)).fetchall()
+
+    def conversation(self, conversation):
+        db = self.read_connection()
+        # Capture order; turns lazy-loaded later in a long conversation are listed after the others
+        return db.execute("SELECT role, text FROM messages WHERE conversation = ? ORDER BY id",
+                          (conversation,)).fetchall()
+
+
+class CaptureBridge(QObject):
+    """Receives finished messages from the page over the web channel."""
+
+    def __init__(self, archive, assistant, parent=None):
+        super().__init__(parent)
+        self.archive = archive
+        self.assistant = assistant
+
+    @Slot(str)
+    def capture(self, capture_json):
+        self.archive.add(self.assistant, capture_json)
+
+
+_archive = None
+
+
+def get_archive():
+    """The process-wide archive, opened on first use."""
+    global _archive
+    if _archive is None:
+        _archive = ConversationArchive()
+    return _archive
+
+
+def install_capture(page, adapter, assistant):
+    """Inject the message observer into ``page`` and connect it to the archive.
+
+    Must run before the page navigates; the script then applies to every load of the page.
+    """
+    archive = get_archive()
+    channel = QWebChannel(page)
+    bridge = CaptureBridge(archive, assistant, channel)
+    channel.registerObject("archive", bridge)
+    page.setWebChannel(channel, QWebEngineScript.ScriptWorldId.ApplicationWorld)
+
+    webchannel_js = QFile(":/qtwebchannel/qwebchannel.js")
+    webchannel_js.open(QIODevice.ReadOnly)
+    config = {"message": adapter["message"], "user": adapter["user_message"], "stop": adapter["stop"],
+              "ids": adapter.get("message_id", []), "quiet": CAPTURE_QUIET_MS}
+    script = QWebEngineScript()
+    script.setName("conversation-capture")
+    script.setSourceCode(bytes(webchannel_js.readAll()).decode("utf-8") + CAPTURE_TEMPLATE % json.dumps(config))
+    script.setInjectionPoint(QWebEngineScript.InjectionPoint.DocumentReady)
+    script.setWorldId(QWebEngineScript.ScriptWorldId.ApplicationWorld)
+    script.setRunsOnSubFrames(False)
+    page.scripts().insert(script)
+    return bridge
+
+
+def close_archive():
+    if _archive is not None:
+        _archive.close()
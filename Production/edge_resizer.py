@@ -0,0 +1,135 @@
+from PySide6.QtCore import QElapsedTimer, QEvent, QObject, QRect, QSize, Qt, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+# Configuration
+BORDER = 8  # Width of the grab zone along each edge
+MIN_SIZE = QSize(360, 240)
+LIVE_RELAYOUT_MS = 100  # How often the content follows the window while dragging
+QWIDGETSIZE_MAX = (1 << 24) - 1
+
+
+def cursor_for(edges):
+    dx, dy = edges
+    if dx and dy:
+        return Qt.SizeFDiagCursor if dx == dy else Qt.SizeBDiagCursor
+    return Qt.SizeHorCursor if dx else Qt.SizeVerCursor
+
+
+class EdgeResizer(QObject):
+    """Resizes a frameless window by dragging the edges and corners of ``handle``.
+
+    The window geometry changes at most once per display frame. ``content``, typically the
+    web view, keeps its size during the drag and re-lays out only every LIVE_RELAYOUT_MS and
+    when the drag ends, so the page isn't re-laid out on every mouse event.
+    """
+
+    finished = Signal(QSize)
+
+    def __init__(self, window, handle, content=None, parent=None):
+        super().__init__(parent or window)
+        self.window = window
+        self.handle = handle
+        self.content = content
+        self.edges = None  # (dx, dy) of the edges being dragged, -1 for left/top and 1 for right/bottom
+        self.press_pos = None
+        self.start_geometry = None
+        self.target = None
+        self.relayout_clock = QElapsedTimer()
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.timeout.connect(self.apply)
+
+        handle.setMouseTracking(True)
+        handle.installEventFilter(self)
+
+    def edges_at(self, pos):
+        pos = self.handle.mapTo(self.window, pos)
+        width, height = self.window.width(), self.window.height()
+        dx = -1 if pos.x() < BORDER else 1 if pos.x() >= width - BORDER else 0
+        dy = -1 if pos.y() < BORDER else 1 if pos.y() >= height - BORDER else 0
+        return dx, dy
+
+    def geometry_for(self, global_pos):
+        delta = global_pos - self.press_pos
+        geometry = QRect(self.start_geometry)
+        dx, dy = self.edges
+        if dx < 0:
+            geometry.setLeft(min(geometry.left() + delta.x(), geometry.right() + 1 - MIN_SIZE.width()))
+        elif dx > 0:
+            geometry.setRight(max(geometry.right() + delta.x(), geometry.left() - 1 + MIN_SIZE.width()))
+        if dy < 0:
+            geometry.setTop(min(geometry.top() + delta.y(), geometry.bottom() + 1 - MIN_SIZE.height()))
+        elif dy > 0:
+            geometry.setBottom(max(geometry.bottom() + delta.y(), geometry.top() - 1 + MIN_SIZE.height()))
+        return geometry
+
+    def freeze_content(self):
+        if self.content is not None:
+            self.content.setFixedSize(self.content.size())
+
+    def release_content(self):
+        if self.content is not None:
+            self.content.setMinimumSize(0, 0)
+            self.content.setMaximumSize(QWIDGETSIZE_MAX, QWIDGETSIZE_MAX)
+
+    def update_frame_interval(self):
+        screen = self.window.screen() or QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 60
+        self.frame_timer.setInterval(max(1, round(1000 / (rate or 60))))
+
+    def schedule(self, geometry):
+        self.target = geometry
+        if not self.frame_timer.isActive():
+            self.apply()
+
+    def apply(self):
+        if self.target is None:
+            return
+        geometry, self.target = self.target, None
+        if self.relayout_clock.elapsed() >= LIVE_RELAYOUT_MS:
+            # Let the content take the window's size once, then hold it again on the next frame
+            self.release_content()
+            self.relayout_clock.restart()
+        else:
+            self.freeze_content()
+        self.window.setGeometry(geometry)
+        self.frame_timer.start()
+
+    def finish(self):
+        self.apply()
+        self.edges = None
+        self.release_content()
+        self.handle.unsetCursor()
+        self.finished.emit(self.window.size())
+
+    def eventFilter(self, watched, event):
+        kind = event.type()
+        if kind == QEvent.MouseMove and self.edges is not None:
+            self.schedule(self.geometry_for(event.globalPosition().toPoint()))
+            return True
+        if kind == QEvent.MouseMove and event.buttons() == Qt.NoButton:
+            edges = self.edges_at(event.position().toPoint())
+            if edges != (0, 0):
+                self.handle.setCursor(cursor_for(edges))
+            else:
+                self.handle.unsetCursor()
+            return False
+        if kind == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            edges = self.edges_at(event.position().toPoint())
+            if edges == (0, 0):
+                return False
+            self.edges = edges
+            self.press_pos = event.globalPosition().toPoint()
+            self.start_geometry = self.window.geometry()
+            self.update_frame_interval()
+            self.relayout_clock.start()
+            self.freeze_content()
+            return True
+        if kind == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and self.edges is not None:
+            self.finish()
+            return True
+        if kind == QEvent.Leave and self.edges is None:
+            self.handle.unsetCursor()
+        return False
@@ -12,6 +12,13 @@ from PySide6.QtGui import QAction
 from PySide6.QtWebEngineCore import QWebEngineProfile
 import hashlib
 import uuid
+from theme_engine import APP_PALETTE, apply_theme, set_role
+
+
+# Colours of this app, compiled by the theme engine into the application stylesheet
+PALETTE = dict(APP_PALETTE, text="#E6F3FF", background="#0A1A2F", field="#2C1B47", field_border=None, hover="#4a4a4a",
+               neutral="#2C1B47", panel_border=3, toast_background="rgba(10, 26, 47, 0.9)", icon_background="rgba(10, 26, 47, 0.5)")
+THEME = {"border_color": "#4AB8F4", "button_color": "#4AB8F4", "submenu_color": "#2C1B47", "size_color": "#2C1B47"}
 
 
 def resource_path(relative_path):
@@ -49,19 +56,19 @@ class RegistrationDialog(QDialog):
         
         # Title
         title_label = QLabel("API Token Registration")
-        title_label.setStyleSheet("color: #E6F3FF; font-size: 16px; font-weight: bold;")
+        set_role(title_label, "title")
         title_label.setAlignment(Qt.AlignCenter)
         
         # API token input
         self.token_input = QLineEdit()
-        self.token_input.setStyleSheet("background-color: #2C1B47; color: #E6F3FF; border-radius: 5px; padding: 5px;")
+        set_role(self.token_input, "field")
         self.token_input.setPlaceholderText("Paste your API token here")
         
         # Buttons
         buttons_layout = QHBoxLayout()
-        self.activate_button = self.create_button("Activate", "#4AB8F4")
+        self.activate_button = self.create_button("Activate", "primary")
         self.activate_button.clicked.connect(self.verify_token)
-        self.close_button = self.create_button("Close", "#2C1B47")
+        self.close_button = self.create_button("Close", "neutral")
         self.close_button.clicked.connect(QApplication.quit)
         
         buttons_layout.addWidget(self.activate_button)
@@ -72,18 +79,14 @@ class RegistrationDialog(QDialog):
         main_layout.addLayout(buttons_layout)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #0A1A2F; border-radius: 10px; border: 3px solid #4AB8F4;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
 
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid #E6F3FF;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
 
 
     def generate_filename(self, user_secret: str, ext="txt"):
@@ -179,23 +182,11 @@ class ToastNotification(QWidget):
         layout.setContentsMargins(15, 10, 15, 10)
         
         label = QLabel(message)
-        label.setStyleSheet("""
-            color: #E6F3FF;
-            font-size: 12px;
-            font-weight: bold;
-        """)
         label.setAlignment(Qt.AlignCenter)
         
         layout.addWidget(label)
         self.setLayout(layout)
-        
-        self.setStyleSheet("""
-            QWidget {
-                background-color: rgba(10, 26, 47, 0.9);
-                border-radius: 15px;
-                border: 2px solid #4AB8F4;
-            }
-        """)
+        set_role(self, "toast")
     
     def animate_show(self):
         self.effect = QGraphicsOpacityEffect(self)
@@ -243,24 +234,23 @@ class PromptCreatorDialog(QDialog):
         
         filename_layout = QHBoxLayout()
         filename_label = QLabel("File Name:")
-        filename_label.setStyleSheet("color: #E6F3FF;")
         self.filename_input = QLineEdit()
-        self.filename_input.setStyleSheet("background-color: #2C1B47; color: #E6F3FF; border-radius: 5px; padding: 5px;")
+        set_role(self.filename_input, "field")
         self.filename_input.setPlaceholderText("Enter file name (without extension)")
         
         filename_layout.addWidget(filename_label)
         filename_layout.addWidget(self.filename_input)
         
         self.content_text = QTextEdit()
-        self.content_text.setStyleSheet("background-color: #2C1B47; color: #E6F3FF; border-radius: 5px; padding: 5px;")
+        set_role(self.content_text, "field")
         self.content_text.setPlaceholderText("Write your prompt here...")
         
         buttons_layout = QHBoxLayout()
         
-        self.save_button = self.create_button("Save", "#4AB8F4")
+        self.save_button = self.create_button("Save", "primary")
         self.save_button.clicked.connect(self.save_prompt)
         
-        self.cancel_button = self.create_button("Cancel", "#2C1B47")
+        self.cancel_button = self.create_button("Cancel", "neutral")
         self.cancel_button.clicked.connect(self.close)
         
         buttons_layout.addWidget(self.save_button)
@@ -271,18 +261,14 @@ class PromptCreatorDialog(QDialog):
         main_layout.addLayout(buttons_layout)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #0A1A2F; border-radius: 10px; border: 3px solid #4AB8F4;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid #E6F3FF;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def save_prompt(self):
         filename = self.filename_input.text().strip()
@@ -345,47 +331,23 @@ class PromptViewerDialog(QDialog):
         main_layout = QVBoxLayout()
         
         title_label = QLabel("Prompts")
-        title_label.setStyleSheet("color: #E6F3FF; font-size: 16px; font-weight: bold;")
+        set_role(title_label, "title")
         
         self.splitter = QSplitter(Qt.Horizontal)
-        self.splitter.setStyleSheet("QSplitter::handle { background-color: #2C1B47; width: 2px; }")
+        set_role(self.splitter, "split")
         self.file_list = QListWidget()
-        self.file_list.setStyleSheet("""
-            QListWidget {
-                background-color: #2C1B47; 
-                color: #E6F3FF; 
-                border-radius: 5px;
-                outline: none;
-            }
-            QListWidget::item {
-                padding: 8px;
-                border-bottom: 1px solid #3e3e3e;
-                background-color: #2C1B47;
-            }
-            QListWidget::item:hover {
-                background-color: #4a4a4a;
-                color: #E6F3FF;
-            }
-            QListWidget::item:selected {
-                background-color: #4AB8F4;
-                color: #E6F3FF;
-            }
-            QListWidget::item:selected:hover {
-                background-color: #2C1B47;
-                color: #E6F3FF;
-            }
-        """)
+        set_role(self.file_list, "list")
         self.file_list.itemClicked.connect(self.show_file_content)
         
         right_widget = QWidget()
         right_layout = QVBoxLayout()
         
         self.content_viewer = QTextBrowser()
-        self.content_viewer.setStyleSheet("background-color: #2C1B47; color: #E6F3FF; border-radius: 5px; padding: 5px;")
+        set_role(self.content_viewer, "field")
         self.content_viewer.setReadOnly(True)
         self.content_viewer.setPlaceholderText("Select a prompt to view its content")
         
-        self.copy_button = self.create_button("Copy Content", "#4AB8F4")
+        self.copy_button = self.create_button("Copy Content", "primary")
         self.copy_button.clicked.connect(self.copy_content)
         self.copy_button.setEnabled(False)
         
@@ -398,7 +360,7 @@ class PromptViewerDialog(QDialog):
         
         self.splitter.setSizes([30, 70])
         
-        self.close_button = self.create_button("Close", "#2C1B47")
+        self.close_button = self.create_button("Close", "neutral")
         self.close_button.clicked.connect(self.close)
         
         main_layout.addWidget(title_label)
@@ -406,18 +368,14 @@ class PromptViewerDialog(QDialog):
         main_layout.addWidget(self.close_button)
         
         container.setLayout(main_layout)
-        container.setStyleSheet("background-color: #0A1A2F; border-radius: 10px; border: 3px solid #4AB8F4;")
+        set_role(container, "panel")
         
         dialog_layout = QVBoxLayout(self)
         dialog_layout.setContentsMargins(0, 0, 0, 0)
         dialog_layout.addWidget(container)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid #E6F3FF;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def load_prompts(self):
         prompts_dir = "Prompts"
@@ -496,9 +454,9 @@ class FloatingBrowser(QMainWindow):
         self.browser.setUrl(QUrl("https://grok.com"))
         self.browser.setStyleSheet("background-color: #0A1A2F; border-radius: 10px;")
 
-        self.prompt_button = self.create_button("Prompt", "#2C1B47")
-        self.size_button = self.create_button("Size", "#2C1B47")
-        self.close_button = self.create_button("Close", "#4AB8F4")
+        self.prompt_button = self.create_button("Prompt", "submenu")
+        self.size_button = self.create_button("Size", "size")
+        self.close_button = self.create_button("Close", "primary")
         self.close_button.clicked.connect(self.close_callback)
 
         submenu_layout = QHBoxLayout()
@@ -518,7 +476,7 @@ class FloatingBrowser(QMainWindow):
         large_height = int(self.screen_height * 0.8)
         
         self.size_menu = QMenu(self)
-        self.size_menu.setStyleSheet("background-color: #0A1A2F; color: #E6F3FF; border-radius: 10px; border: 2px solid #2C1B47;")
+        set_role(self.size_menu, "size")
 
         small_action = self.create_menu_action("Small", "#2C1B47", self.resize_browser, small_width, small_height)
         medium_action = self.create_menu_action("Medium", "#2C1B47", self.resize_browser, medium_width, medium_height)
@@ -531,7 +489,7 @@ class FloatingBrowser(QMainWindow):
         self.size_button.setMenu(self.size_menu)
         
         self.prompt_menu = QMenu(self)
-        self.prompt_menu.setStyleSheet("background-color: #0A1A2F; color: #E6F3FF; border-radius: 10px; border: 2px solid #2C1B47;")
+        set_role(self.prompt_menu, "submenu")
         
         create_action = self.create_menu_action("Create", "#2C1B47", self.show_prompt_creator)
         open_action = self.create_menu_action("Open", "#2C1B47", self.open_prompt)
@@ -548,7 +506,7 @@ class FloatingBrowser(QMainWindow):
         layout.addWidget(self.close_button)
         
         container.setLayout(layout)
-        container.setStyleSheet("background-color: #0A1A2F; border-radius: 10px; border: 3px solid #4AB8F4;")
+        set_role(container, "panel")
 
         self.setCentralWidget(container)
         
@@ -559,12 +517,8 @@ class FloatingBrowser(QMainWindow):
         self.prompt_menu.setFixedWidth(self.prompt_button.width())
         super().showEvent(event)
     
-    def create_button(self, text, color):
-        button = QPushButton(text)
-        button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        button.enterEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid #E6F3FF;")
-        button.leaveEvent = lambda event: button.setStyleSheet(f"background-color: {color}; color: #E6F3FF; border-radius: 10px; padding: 5px; border: 2px solid transparent;")
-        return button
+    def create_button(self, text, role):
+        return set_role(QPushButton(text), role)
     
     def create_menu_action(self, text, color, slot, *args):
         action = QAction(text, self)
@@ -641,7 +595,7 @@ class FloatingIcon(QWidget):
         
         self.icon_label = QLabel()
         self.icon_label.setPixmap(QPixmap(self.icon_path).scaled(64, 64, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-        self.icon_label.setStyleSheet("border-radius: 32px; background-color: rgba(10, 26, 47, 0.5);")
+        set_role(self.icon_label, "icon")
         layout.addWidget(self.icon_label)
         
         self.setLayout(layout)
@@ -694,6 +648,7 @@ class FloatingIcon(QWidget):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
+    apply_theme(THEME, PALETTE)
     
     icon_path = resource_path("icon.png")
     floating_icon = FloatingIcon(icon_path)
@@ -0,0 +1,66 @@
+import threading
+
+import requests
+from PySide6.QtCore import QObject, Signal
+
+from license_token import is_signed_token, verify_license
+
+# Configuration
+LICENSE_SERVER_URL = "http://127.0.0.1:1111/validate_token"  # Team license server (see Old_version server.py)
+REVALIDATE_INTERVAL = 60 * 60  # Seconds between background license checks
+
+
+def revalidate_token(token, server_url=LICENSE_SERVER_URL):
+    """Ask the server about a token. Returns True/False, or None if the server could not answer."""
+    try:
+        response = requests.post(server_url, json={"token": token}, timeout=5)
+
+        if response.status_code == 200 and response.json().get("valid") == "success":
+            return True
+        if response.status_code == 400:
+            return False
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"Server connection error: {e}")
+
+    return None
+
+
+class LicenseRevalidator(QObject):
+    """Periodically re-checks a token so revoked licenses stop working.
+
+    Only an explicit rejection from the server, or a signed license that has expired, emits
+    ``revoked``; network errors and other server answers leave the license in place.
+    ``confirmed`` is emitted whenever the server vouches for the token. The checks run on a
+    daemon thread, so stopping never waits for a request in flight.
+    """
+    revoked = Signal()
+    confirmed = Signal()
+
+    def __init__(self, token, server_url=LICENSE_SERVER_URL, interval=REVALIDATE_INTERVAL, parent=None):
+        super().__init__(parent)
+        self.token = token
+        self.server_url = server_url
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="license-revalidator", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        # The first check runs straight after launch, then every interval
+        delay = 0
+        while not self.stop_event.wait(delay):
+            delay = self.interval
+            result = revalidate_token(self.token, self.server_url)
+
+            if self.stop_event.is_set():
+                return
+            if result is False or (is_signed_token(self.token) and verify_license(self.token) is None):
+                self.revoked.emit()
+                return
+            if result is True:
+                self.confirmed.emit()
+
+    def stop(self):
+        self.stop_event.set()
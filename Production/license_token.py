@@ -0,0 +1,97 @@
+# license_token.py
+"""Signed license tokens that can be checked without contacting the server.
+
+A token looks like ``EW2.<payload>.<signature>`` where the payload is base64url-encoded
+JSON (``sub``, ``iat``, ``exp``) and the signature is Ed25519 over ``EW2.<payload>``.
+Only the license server holds the private key, so only it can issue tokens; the apps
+carry PUBLIC_KEY and can only verify them. Shared by the Production app and by the
+Old_version server and client.
+"""
+import base64
+import json
+import os
+import time
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+# EW1 tokens were HMAC-signed with a key in the client; they are now only accepted
+# through the server's token list, like any other opaque token
+TOKEN_PREFIX = "EW2"
+# Raw Ed25519 public key, base64url; replace it when the key pair is rotated
+# (python server.py --generate-license-key)
+PUBLIC_KEY = "rwYVgQUO7_aKo_zEdf4ShNdqJHf9a2s4r6IsRWTUmhs"
+SIGNING_KEY_FILE = os.environ.get("LICENSE_SIGNING_KEY_FILE", "license_signing_key.pem")  # Server only
+DEFAULT_LICENSE_DAYS = 30
+
+_public_key = None
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _signed_part(encoded_payload):
+    return f"{TOKEN_PREFIX}.{encoded_payload}".encode("ascii")
+
+
+def public_key():
+    global _public_key
+    if _public_key is None:
+        _public_key = Ed25519PublicKey.from_public_bytes(_b64decode(PUBLIC_KEY))
+    return _public_key
+
+
+def generate_signing_key(path=SIGNING_KEY_FILE):
+    """Write a new private key to ``path`` (readable by the owner only) and return its public key for PUBLIC_KEY."""
+    private_key = Ed25519PrivateKey.generate()
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    raw = private_key.public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return _b64encode(raw)
+
+
+def load_signing_key(path=SIGNING_KEY_FILE):
+    with open(path, "rb") as f:
+        return serialization.load_pem_private_key(f.read(), password=None)
+
+
+def issue_license(subject, days=DEFAULT_LICENSE_DAYS, private_key=None):
+    """Create a signed license token for ``subject`` valid for ``days`` days. Server side only."""
+    private_key = private_key or load_signing_key()
+    now = int(time.time())
+    payload = {"sub": subject, "iat": now, "exp": now + int(days * 86400)}
+    encoded_payload = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    signature = private_key.sign(_signed_part(encoded_payload))
+    return f"{TOKEN_PREFIX}.{encoded_payload}.{_b64encode(signature)}"
+
+
+def is_signed_token(token):
+    return isinstance(token, str) and token.startswith(TOKEN_PREFIX + ".")
+
+
+def verify_license(token, key=None, now=None):
+    """Return the license payload if the signature is valid and it has not expired, else None."""
+    if not is_signed_token(token):
+        return None
+    try:
+        _, encoded_payload, encoded_signature = token.split(".")
+        (key or public_key()).verify(_b64decode(encoded_signature), _signed_part(encoded_payload))
+        payload = json.loads(_b64decode(encoded_payload))
+    except (InvalidSignature, ValueError, TypeError):
+        return None
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("exp"), int):
+        return None
+    if payload["exp"] <= (time.time() if now is None else now):
+        return None
+    return payload
@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+import time
+
+from PySide6.QtCore import QThread, Signal
+
+from metrics import RSS_BYTES
+from process_stats import process_tree_rss
+from runtime_config import load_runtime_config
+
+# Configuration (overridable in config/runtime.json)
+DEFAULT_MEMORY_BUDGET_MB = 1500  # Python process plus all QtWebEngine children
+DEFAULT_SAMPLE_INTERVAL = 30  # Seconds
+MEMORY_METRICS_FILE = os.path.join("config", "memory_samples.jsonl")
+MAX_METRICS_FILE_SIZE = 5 * 2**20  # Rotated to <file>.1 beyond this size
+
+
+class MemoryWatchdog(QThread):
+    """Samples the RSS of the app and its QtWebEngine processes and reports budget overruns.
+
+    The first sample over budget emits ``warning``; if the next one is still over budget,
+    ``reclaim`` is emitted so the GUI thread can discard the hidden page. Neither is emitted
+    again until a sample is back under budget.
+    """
+    warning = Signal(int)
+    reclaim = Signal(int)
+
+    def __init__(self, budget_mb=None, interval=None, metrics_file=MEMORY_METRICS_FILE):
+        super().__init__()
+        config = load_runtime_config()
+        self.budget = int((budget_mb or config.get("memory_budget_mb", DEFAULT_MEMORY_BUDGET_MB)) * 2**20)
+        self.interval = interval or config.get("memory_sample_interval", DEFAULT_SAMPLE_INTERVAL)
+        self.metrics_file = metrics_file
+        self.stop_event = threading.Event()
+
+    @staticmethod
+    def is_supported():
+        return os.path.isdir("/proc")
+
+    def run(self):
+        over_budget_samples = 0
+        while not self.stop_event.wait(self.interval):
+            sample = self.take_sample()
+            self.export_sample(sample)
+            RSS_BYTES.set(sample["python_rss"], process="python")
+            RSS_BYTES.set(sample["webengine_rss"], process="webengine")
+            RSS_BYTES.set(sample["total_rss"], process="total")
+
+            if sample["total_rss"] <= self.budget:
+                over_budget_samples = 0
+                continue
+            over_budget_samples += 1
+            if over_budget_samples == 1:
+                self.warning.emit(sample["total_rss"])
+            elif over_budget_samples == 2:
+                self.reclaim.emit(sample["total_rss"])
+
+    def take_sample(self):
+        tree = process_tree_rss()
+        own_pid = os.getpid()
+        python_rss = tree.get(own_pid, ("", 0))[1]
+        webengine = [rss for pid, (name, rss) in tree.items() if pid != own_pid and name.startswith("QtWebEngine")]
+        return {
+            "time": time.time(),
+            "python_rss": python_rss,
+            "webengine_rss": sum(webengine),
+            "webengine_processes": len(webengine),
+            "total_rss": sum(rss for _, rss in tree.values()),
+            "budget": self.budget,
+        }
+
+    def export_sample(self, sample):
+        try:
+            if os.path.exists(self.metrics_file) and os.path.getsize(self.metrics_file) > MAX_METRICS_FILE_SIZE:
+                os.replace(self.metrics_file, self.metrics_file + ".1")
+            os.makedirs(os.path.dirname(self.metrics_file), exist_ok=True)
+            with open(self.metrics_file, "a") as f:
+                f.write(json.dumps(sample) + "\n")
+        except OSError as e:
+            print(f"Error writing memory sample: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        self.wait()
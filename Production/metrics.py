@@ -0,0 +1,236 @@
+"""In-process counters, gauges and histograms, exposed in the Prometheus text format.
+
+Exporters are configured in config/runtime.json:
+
+    "metrics_port": 9464                    serve http://127.0.0.1:9464/metrics
+    "metrics_file": "config/all_ai.prom"    rewrite the file every "metrics_interval" seconds,
+                                            e.g. for the node exporter's textfile collector
+
+Metrics can be updated from any thread.
+"""
+import http.server
+import os
+import threading
+
+from process_stats import process_rss
+from runtime_config import load_runtime_config
+
+# Configuration (overridable in config/runtime.json)
+DEFAULT_INTERVAL = 15  # Seconds between writes of the metrics file
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # Seconds
+
+_lock = threading.Lock()
+_metrics = {}  # Name -> metric, in registration order
+_collectors = []
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        # Label values -> value; a metric without labels is exported as 0 before its first update
+        self.values = {} if self.labels else {(): 0}
+
+    def key(self, labels):
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def inc(self, amount=1, **labels):
+        key = self.key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self, lines):
+        for key, value in self.values.items():
+            lines.append(f"{self.name}{_labels(self.labels, key)} {_number(value)}")
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self.key(labels)
+        with _lock:
+            self.values[key] = value
+
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.values = {}
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self.key(labels)
+        with _lock:
+            counts, total, observed = self.values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self.values[key] = (counts, total + value, observed + 1)
+
+    def render(self, lines):
+        for key, (counts, total, observed) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket_labels = _labels(self.labels, key, 'le="%g"' % bound)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            # Observations above the last bound only show up in the +Inf bucket
+            bucket_labels = _labels(self.labels, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {observed}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {observed}")
+
+
+def _register(cls, name, *args, **kwargs):
+    with _lock:
+        if name not in _metrics:
+            _metrics[name] = cls(name, *args, **kwargs)
+        return _metrics[name]
+
+
+def counter(name, help_text, labels=()):
+    return _register(Counter, name, help_text, labels)
+
+
+def gauge(name, help_text, labels=()):
+    return _register(Gauge, name, help_text, labels)
+
+
+def histogram(name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+    return _register(Histogram, name, help_text, labels, buckets)
+
+
+def add_collector(function):
+    """Call ``function`` before every export, to refresh gauges that are sampled rather than updated."""
+    _collectors.append(function)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    for collect in _collectors:
+        collect()
+    lines = []
+    with _lock:
+        for metric in _metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            metric.render(lines)
+    return "\n".join(lines) + "\n"
+
+
+# Application metrics
+BROWSER_OPEN_SECONDS = histogram("all_ai_browser_open_seconds",
+                                 "Time from opening the browser until it has faded in", ("assistant",))
+BROWSER_CLOSE_SECONDS = histogram("all_ai_browser_close_seconds",
+                                  "Time from closing the browser until it has faded out", ("assistant",))
+PAGE_LOAD_SECONDS = histogram("all_ai_page_load_seconds", "Assistant page load time", ("assistant", "outcome"))
+PROMPT_COPIES = counter("all_ai_prompt_copies_total", "Saved prompts copied to the clipboard")
+PROMPT_INSERTS = counter("all_ai_prompt_inserts_total", "Prompts inserted into an assistant page", ("assistant",))
+REGISTRATION_ATTEMPTS = counter("all_ai_registration_attempts_total", "License token registration attempts")
+REGISTRATION_FAILURES = counter("all_ai_registration_failures_total", "Failed license token registrations", ("reason",))
+RENDERER_RESTARTS = counter("all_ai_renderer_restarts_total",
+                            "Renderer processes lost to a crash, kill or memory discard and replaced on the next load",
+                            ("assistant", "reason"))
+RSS_BYTES = gauge("all_ai_rss_bytes",
+                  "Resident memory of the app and its QtWebEngine processes; process=\"python\" on Linux and "
+                  "Windows, \"webengine\" and \"total\" only where the memory watchdog runs (Linux)", ("process",))
+
+
+def _sample_own_rss():
+    # Sampled on every export, so the app's own memory is reported where the watchdog can't run
+    rss = process_rss(os.getpid())
+    if rss:
+        RSS_BYTES.set(rss, process="python")
+
+
+add_collector(_sample_own_rss)
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsExporter:
+    """Serves the registry on a localhost port and/or rewrites it to a file, from background threads."""
+
+    def __init__(self, port=None, path=None, interval=None):
+        config = load_runtime_config()
+        self.port = port or config.get("metrics_port")
+        self.path = path or config.get("metrics_file")
+        self.interval = interval or config.get("metrics_interval", DEFAULT_INTERVAL)
+        self.server = None
+        self.stop_event = threading.Event()
+
+    def is_enabled(self):
+        return bool(self.port or self.path)
+
+    def start(self):
+        if self.port:
+            try:
+                # Bound to the loopback interface only; the node agent scrapes it locally
+                self.server = http.server.ThreadingHTTPServer(("127.0.0.1", int(self.port)), _MetricsHandler)
+                self.server.daemon_threads = True
+                threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+            except OSError as e:
+                print(f"Error starting metrics endpoint on port {self.port}: {e}")
+                self.server = None
+        if self.path:
+            threading.Thread(target=self.write_loop, name="metrics-file", daemon=True).start()
+
+    def write_loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.write_file()
+
+    def write_file(self):
+        try:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            # Collectors may read at any time, so never expose a half-written file
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(render())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error writing metrics file: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.path:
+            self.write_file()
@@ -0,0 +1,41 @@
+import os
+import threading
+
+from PySide6.QtGui import QPixmap
+
+# Configuration
+SNAPSHOT_DIR = os.path.join("config", "snapshots")
+SNAPSHOT_QUALITY = 85  # JPEG quality; encodes much faster than PNG for page-sized images
+
+
+def snapshot_path(assistant):
+    return os.path.join(SNAPSHOT_DIR, f"{assistant}.jpg")
+
+
+def save_snapshot(widget, assistant):
+    """Grab ``widget`` now and write it to the cache without blocking the GUI thread.
+
+    Only the grab happens here; QImage is safe to encode on a worker thread.
+    """
+    image = widget.grab().toImage()
+    if image.isNull():
+        return None
+
+    def write():
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        tmp_path = snapshot_path(assistant) + ".tmp"
+        if image.save(tmp_path, "JPG", SNAPSHOT_QUALITY):
+            os.replace(tmp_path, snapshot_path(assistant))
+
+    # Not a daemon thread, so a snapshot taken on quit is still written out
+    thread = threading.Thread(target=write, name="snapshot-writer")
+    thread.start()
+    return thread
+
+
+def load_snapshot(assistant):
+    path = snapshot_path(assistant)
+    if not os.path.exists(path):
+        return None
+    pixmap = QPixmap(path)
+    return None if pixmap.isNull() else pixmap
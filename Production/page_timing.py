@@ -0,0 +1,116 @@
+import json
+import os
+import socket
+import time
+
+# Configuration
+PAGE_TIMINGS_FILE = os.path.join("config", "page_timings.json")
+MAX_SAMPLES_PER_ASSISTANT = 200  # Rolling window kept per assistant
+
+# Runs in the page after loadFinished. Navigation Timing values are relative to navigation start.
+TIMING_SCRIPT = """
+(function () {
+    var nav = performance.getEntriesByType('navigation')[0];
+    var resources = performance.getEntriesByType('resource');
+    var byType = {};
+    var transfer = 0;
+    var slowest = [];
+    for (var i = 0; i < resources.length; i++) {
+        var r = resources[i];
+        byType[r.initiatorType] = (byType[r.initiatorType] || 0) + 1;
+        transfer += r.transferSize || 0;
+        slowest.push([Math.round(r.duration), r.name.split('?')[0].slice(0, 200)]);
+    }
+    slowest.sort(function (a, b) { return b[0] - a[0]; });
+    return JSON.stringify({
+        ttfb_ms: nav ? Math.round(nav.responseStart) : null,
+        tti_ms: nav ? Math.round(nav.domInteractive) : null,
+        dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+        load_event_ms: nav ? Math.round(nav.loadEventEnd) : null,
+        document_bytes: nav ? nav.transferSize : null,
+        resource_count: resources.length,
+        resource_bytes: transfer,
+        resources_by_type: byType,
+        slowest_resources: slowest.slice(0, 5)
+    });
+})();
+"""
+
+
+def current_network():
+    """Identify the network by the local address's /24, so timings can be split per network."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.connect(("8.8.8.8", 80))  # UDP connect sends nothing; it only picks a route
+            address = s.getsockname()[0]
+        return ".".join(address.split(".")[:3]) + ".0/24"
+    except OSError:
+        return "offline"
+
+
+def percentile(values, pct):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class PageTimingStore:
+    """Rolling per-assistant store of page load samples, kept as one small JSON file."""
+
+    def __init__(self, path=PAGE_TIMINGS_FILE):
+        self.path = path
+        self.samples = self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                samples = json.load(f)
+            return samples if isinstance(samples, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def add(self, assistant, sample):
+        entries = self.samples.setdefault(assistant, [])
+        entries.append(sample)
+        del entries[:-MAX_SAMPLES_PER_ASSISTANT]
+        self.save()
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.samples, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Error saving page timings: {e}")
+
+    def summary(self):
+        """Rows of (assistant, network, samples, tti p50, tti p95, load p50) in milliseconds."""
+        rows = []
+        for assistant, entries in sorted(self.samples.items()):
+            networks = {}
+            for entry in entries:
+                networks.setdefault(entry.get("network", "unknown"), []).append(entry)
+            for network, group in sorted(networks.items()):
+                tti = [entry.get("tti_ms") for entry in group]
+                load = [entry.get("load_ms") for entry in group]
+                rows.append((assistant, network, len(group), percentile(tti, 50), percentile(tti, 95), percentile(load, 50)))
+        return rows
+
+
+def new_sample(load_ms, first_progress_ms, ok, timing_json):
+    sample = {
+        "time": time.time(),
+        "network": current_network(),
+        "ok": ok,
+        "load_ms": round(load_ms),
+        "first_progress_ms": round(first_progress_ms) if first_progress_ms is not None else None,
+    }
+    try:
+        sample.update(json.loads(timing_json or "{}"))
+    except ValueError:
+        pass
+    return sample
@@ -0,0 +1,101 @@
+import os
+import sys
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+    PROCESS_VM_READ = 0x0010
+
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    _kernel32.K32GetProcessMemoryInfo.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+    _kernel32.K32GetProcessMemoryInfo.restype = wintypes.BOOL
+
+
+def _windows_rss(pid):
+    """Working set of ``pid`` in bytes, the Windows counterpart of the resident set size."""
+    handle = _kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION | PROCESS_VM_READ, False, pid)
+    if not handle:
+        return 0
+    try:
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if not _kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return 0
+        return counters.WorkingSetSize
+    finally:
+        _kernel32.CloseHandle(handle)
+
+
+def process_rss(pid):
+    """Resident set size of ``pid`` in bytes, from /proc on Linux and the working set on Windows. 0 if unavailable."""
+    if sys.platform == "win32":
+        return _windows_rss(pid)
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def child_pids(pid):
+    """All descendants of ``pid`` (QtWebEngineProcess renderers, GPU and utility processes)."""
+    children = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return []
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so fields are counted from the closing parenthesis
+        fields = stat[stat.rfind(")") + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+
+    descendants = []
+    pending = [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            descendants.append(child)
+            pending.append(child)
+    return descendants
+
+
+def process_name(pid):
+    try:
+        with open(f"/proc/{pid}/comm", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return "?"
+
+
+def process_tree_rss(pid=None):
+    """Return ``{pid: (name, rss_bytes)}`` for ``pid`` (default: this process) and its descendants."""
+    pid = os.getpid() if pid is None else pid
+    return {p: (process_name(p), process_rss(p)) for p in [pid] + child_pids(pid)}
@@ -0,0 +1,103 @@
+import json
+import os
+import re
+
+import requests
+
+# Configuration
+PROMPT_SERVER_URL = "http://127.0.0.1:1111"  # Team prompt server (see Old_version server.py)
+SYNC_STATE_FILE = ".sync_state.json"  # Stored inside the prompts directory
+
+SAFE_NAME_PATTERN = re.compile(r"^[\w\- .]{1,100}$")
+
+
+class PromptSyncClient:
+    """Keeps a local prompts directory in step with the shared catalog on the prompt server.
+
+    Only changes made after the last stored cursor are downloaded, so a refresh of an
+    unchanged catalog costs one small request.
+    """
+
+    def __init__(self, prompts_dir, server_url=PROMPT_SERVER_URL, timeout=5):
+        self.prompts_dir = prompts_dir
+        self.server_url = server_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.state_path = os.path.join(prompts_dir, SYNC_STATE_FILE)
+        self.state = self.load_state()
+
+    def load_state(self):
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+            if isinstance(state.get("cursor"), int) and isinstance(state.get("etags"), dict):
+                return state
+        except (OSError, ValueError):
+            pass
+        return {"cursor": 0, "etags": {}}
+
+    def save_state(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def prompt_path(self, name):
+        if not SAFE_NAME_PATTERN.match(name) or ".." in name:
+            return None
+        if not name.endswith(".txt"):
+            name += ".txt"
+        return os.path.join(self.prompts_dir, name)
+
+    def sync(self):
+        """Apply all pending changes from the server. Returns the number of prompts changed."""
+        os.makedirs(self.prompts_dir, exist_ok=True)
+        changed = 0
+
+        while True:
+            response = self.session.get(
+                f"{self.server_url}/prompts/changes",
+                params={"since": self.state["cursor"]},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            for change in data["changes"]:
+                if self.apply_change(change):
+                    changed += 1
+
+            self.state["cursor"] = data["cursor"]
+            self.save_state()
+            if not data["has_more"]:
+                break
+
+        return changed
+
+    def apply_change(self, change):
+        name = change["name"]
+        path = self.prompt_path(name)
+        if path is None:
+            print(f"Skipping prompt with unsafe name: {name!r}")
+            return False
+
+        # Only files the sync wrote itself (those with an etag) are replaced or deleted;
+        # a prompt the user saved under the same name is left alone
+        synced = name in self.state["etags"]
+        if change["deleted"]:
+            self.state["etags"].pop(name, None)
+            if synced and os.path.exists(path):
+                os.remove(path)
+                return True
+            return False
+
+        if os.path.exists(path) and not synced:
+            print(f"Keeping local prompt {name!r}; the shared version was not synced")
+            return False
+        if self.state["etags"].get(name) == change["etag"] and os.path.exists(path):
+            return False
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(change["content"])
+        self.state["etags"][name] = change["etag"]
+        return True
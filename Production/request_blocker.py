@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+
+from PySide6.QtWebEngineCore import QWebEngineUrlRequestInterceptor, QWebEngineUrlRequestInfo
+
+# Configuration
+BLOCKLIST_FILE = os.path.join("config", "blocklist.txt")  # One domain per line, '#' starts a comment
+BLOCK_STATS_FILE = os.path.join("config", "blocked_requests.json")
+
+# Used when no blocklist file exists. Subdomains of every entry are blocked as well.
+DEFAULT_BLOCKLIST = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "connect.facebook.net",
+    "analytics.twitter.com",
+    "ads-twitter.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "segment.io",
+    "cdn.segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "browser-intake-datadoghq.com",
+    "js.hs-analytics.net",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "cdn.heapanalytics.com",
+]
+
+# Blocked requests never report a size, so bytes saved are estimated from typical sizes
+ESTIMATED_BYTES = {
+    QWebEngineUrlRequestInfo.ResourceType.ResourceTypeScript: 40_000,
+    QWebEngineUrlRequestInfo.ResourceType.ResourceTypeSubFrame: 20_000,
+    QWebEngineUrlRequestInfo.ResourceType.ResourceTypeStylesheet: 10_000,
+    QWebEngineUrlRequestInfo.ResourceType.ResourceTypeXhr: 2_000,
+    QWebEngineUrlRequestInfo.ResourceType.ResourceTypeImage: 1_000,
+    QWebEngineUrlRequestInfo.ResourceType.ResourceTypePing: 500,
+}
+DEFAULT_ESTIMATED_BYTES = 1_000
+
+
+class DomainTrie:
+    """Trie over reversed domain labels; a host matches if it or any parent domain was added."""
+
+    TERMINAL = ""  # Empty label never occurs in a valid host, so it marks the end of an entry
+
+    def __init__(self, domains=()):
+        self.root = {}
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain):
+        labels = domain.strip().lower().strip(".").split(".")
+        if not labels or not all(labels):
+            return
+        node = self.root
+        for label in reversed(labels):
+            node = node.setdefault(label, {})
+        node[self.TERMINAL] = True
+
+    def matches(self, host):
+        node = self.root
+        for label in reversed(host.lower().rstrip(".").split(".")):
+            node = node.get(label)
+            if node is None:
+                return False
+            if self.TERMINAL in node:
+                return True
+        return False
+
+
+def load_blocklist(path=BLOCKLIST_FILE):
+    if not os.path.exists(path):
+        return list(DEFAULT_BLOCKLIST)
+    domains = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                domains.append(line)
+    return domains
+
+
+class RequestBlocker(QWebEngineUrlRequestInterceptor):
+    """Blocks requests to blocklisted domains and counts them per assistant (first-party host)."""
+
+    def __init__(self, domains, parent=None):
+        super().__init__(parent)
+        self.trie = DomainTrie(domains)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.saved = {}  # Counters already added to the totals on disk
+
+    def interceptRequest(self, info):
+        host = info.requestUrl().host()
+        if not host or not self.trie.matches(host):
+            return
+
+        info.block(True)
+        assistant = info.firstPartyUrl().host() or "unknown"
+        estimate = ESTIMATED_BYTES.get(info.resourceType(), DEFAULT_ESTIMATED_BYTES)
+        with self.lock:
+            stats = self.stats.setdefault(assistant, {"blocked_requests": 0, "bytes_saved": 0})
+            stats["blocked_requests"] += 1
+            stats["bytes_saved"] += estimate
+
+    def snapshot(self):
+        with self.lock:
+            return {assistant: dict(stats) for assistant, stats in self.stats.items()}
+
+    def save_stats(self, path=BLOCK_STATS_FILE):
+        """Add the counters gathered since the last save to the totals stored on disk."""
+        totals = {}
+        try:
+            with open(path, "r") as f:
+                totals = json.load(f)
+        except (OSError, ValueError):
+            pass
+        if not isinstance(totals, dict):
+            totals = {}
+
+        snapshot = self.snapshot()
+        for assistant, stats in snapshot.items():
+            saved = self.saved.get(assistant, {"blocked_requests": 0, "bytes_saved": 0})
+            entry = totals.setdefault(assistant, {"blocked_requests": 0, "bytes_saved": 0})
+            entry["blocked_requests"] += stats["blocked_requests"] - saved["blocked_requests"]
+            entry["bytes_saved"] += stats["bytes_saved"] - saved["bytes_saved"]
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(totals, f, indent=2)
+        self.saved = snapshot
+
+
+_request_blocker = None
+
+
+def install_request_blocker(profile):
+    """Install the shared blocker on ``profile`` once; it must outlive every page using it."""
+    global _request_blocker
+    if _request_blocker is None:
+        _request_blocker = RequestBlocker(load_blocklist())
+        profile.setUrlRequestInterceptor(_request_blocker)
+    return _request_blocker
@@ -0,0 +1,15 @@
+import json
+import os
+
+# Configuration
+RUNTIME_CONFIG_FILE = os.path.join("config", "runtime.json")  # e.g. {"chromium_profile": "low-memory"}
+
+
+def load_runtime_config(path=RUNTIME_CONFIG_FILE):
+    """Settings read at startup; a missing or unreadable file means all defaults."""
+    try:
+        with open(path, "r") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
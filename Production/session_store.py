@@ -0,0 +1,121 @@
+import base64
+import json
+import os
+
+from PySide6.QtCore import QByteArray, QDataStream, QIODevice
+
+# Configuration
+SESSION_DIR = os.path.join("config", "sessions")
+WINDOW_SIZES_FILE = os.path.join("config", "window_sizes.json")  # Browser size per assistant
+
+# Chat pages scroll an inner container rather than the window. Record the most scrolled element
+# as a CSS path of nth-of-type steps so it can be found again after the page reloads.
+SCROLL_CAPTURE_SCRIPT = """
+(function () {
+    function cssPath(el) {
+        var parts = [];
+        while (el && el.nodeType === 1 && el !== document.body) {
+            var index = 1, sibling = el;
+            while ((sibling = sibling.previousElementSibling)) {
+                if (sibling.tagName === el.tagName) index++;
+            }
+            parts.unshift(el.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+            el = el.parentElement;
+        }
+        return parts.length ? 'body > ' + parts.join(' > ') : 'body';
+    }
+    var best = null;
+    var all = document.querySelectorAll('main, main *, [class*="scroll"], [class*="overflow"]');
+    for (var i = 0; i < all.length; i++) {
+        if (all[i].scrollTop > 0 && (!best || all[i].scrollTop > best.scrollTop)) best = all[i];
+    }
+    return JSON.stringify({
+        window: window.scrollY,
+        container: best ? {path: cssPath(best), top: best.scrollTop} : null
+    });
+})();
+"""
+
+SCROLL_RESTORE_TEMPLATE = """
+(function (state) {
+    if (state.window) window.scrollTo(0, state.window);
+    if (!state.container) return true;
+    var el = document.querySelector(state.container.path);
+    if (!el || el.scrollHeight < state.container.top) return false;
+    el.scrollTop = state.container.top;
+    return true;
+})(%s);
+"""
+
+
+def session_path(assistant):
+    return os.path.join(SESSION_DIR, f"{assistant}.json")
+
+
+def load_session(assistant):
+    try:
+        with open(session_path(assistant), "r") as f:
+            session = json.load(f)
+        return session if isinstance(session, dict) else None
+    except (OSError, ValueError):
+        return None
+
+
+def save_session(assistant, session):
+    try:
+        os.makedirs(SESSION_DIR, exist_ok=True)
+        tmp_path = session_path(assistant) + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(session, f)
+        os.replace(tmp_path, session_path(assistant))
+    except OSError as e:
+        print(f"Error saving session: {e}")
+
+
+def history_to_text(history):
+    """Serialize the back/forward list of a QWebEngineHistory."""
+    data = QByteArray()
+    stream = QDataStream(data, QIODevice.WriteOnly)
+    stream << history
+    return base64.b64encode(bytes(data)).decode("ascii")
+
+
+def restore_history(history, text):
+    """Load a serialized history; QtWebEngine then navigates once, to its current item."""
+    data = QByteArray(base64.b64decode(text))
+    stream = QDataStream(data, QIODevice.ReadOnly)
+    stream >> history
+    return stream.status() == QDataStream.Status.Ok
+
+
+def scroll_restore_script(scroll):
+    return SCROLL_RESTORE_TEMPLATE % json.dumps(scroll)
+
+
+def load_window_size(assistant):
+    """The browser size last chosen for ``assistant`` as (width, height), or None."""
+    try:
+        with open(WINDOW_SIZES_FILE, "r") as f:
+            size = json.load(f).get(assistant)
+        return int(size[0]), int(size[1])
+    except (OSError, ValueError, AttributeError, TypeError, IndexError):
+        return None
+
+
+def save_window_size(assistant, width, height):
+    try:
+        with open(WINDOW_SIZES_FILE, "r") as f:
+            sizes = json.load(f)
+    except (OSError, ValueError):
+        sizes = {}
+    if not isinstance(sizes, dict):
+        sizes = {}
+    sizes[assistant] = [width, height]
+    try:
+        os.makedirs(os.path.dirname(WINDOW_SIZES_FILE), exist_ok=True)
+        tmp_path = WINDOW_SIZES_FILE + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(sizes, f)
+        os.replace(tmp_path, WINDOW_SIZES_FILE)
+    except OSError as e:
+        print(f"Error saving window size: {e}")
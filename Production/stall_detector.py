@@ -0,0 +1,156 @@
+"""Detect GUI-thread stalls and record where the main thread was stuck.
+
+A timer on the GUI thread beats every HEARTBEAT_MS; a watcher thread notices when the beats stop
+and samples the main thread's Python stack until they resume. Rank the worst call sites with:
+
+    python stall_detector.py --top 20
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+
+from PySide6.QtCore import QTimer
+
+from runtime_config import load_runtime_config
+
+# Configuration (overridable in config/runtime.json)
+DEFAULT_THRESHOLD_MS = 100  # Event loop delay reported as a stall
+HEARTBEAT_MS = 50
+POLL_INTERVAL = 0.02  # Seconds between checks of the heartbeat
+SAMPLE_INTERVAL = 0.25  # Seconds between stack samples during one stall
+MAX_STACKS = 8  # Stack samples kept per stall
+MAX_STALL_SECONDS = 300  # Longer gaps are a suspended machine, not a stall
+STALL_LOG_FILE = os.path.join("config", "stalls.jsonl")
+MAX_LOG_FILE_SIZE = 5 * 2**20  # Rotated to <file>.1 beyond this size
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class StallDetector:
+    """Logs every event-loop stall longer than the threshold with samples of the main thread's stack.
+
+    Must be created on the GUI thread. All file I/O happens on the watcher thread.
+    """
+
+    def __init__(self, threshold_ms=None, log_file=STALL_LOG_FILE):
+        config = load_runtime_config()
+        self.threshold = (threshold_ms or config.get("stall_threshold_ms", DEFAULT_THRESHOLD_MS)) / 1000
+        self.log_file = log_file
+        self.main_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.heartbeat = QTimer()
+        self.heartbeat.setInterval(HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self.beat)
+        self.stop_event = threading.Event()
+        self.watcher = threading.Thread(target=self.watch, name="stall-detector", daemon=True)
+
+    @staticmethod
+    def is_enabled():
+        return load_runtime_config().get("stall_detector", True)
+
+    def start(self):
+        self.last_beat = time.monotonic()
+        self.heartbeat.start()
+        self.watcher.start()
+
+    def beat(self):
+        self.last_beat = time.monotonic()
+
+    def watch(self):
+        interval = HEARTBEAT_MS / 1000
+        stall_beat = None  # Last beat before the stall being recorded
+        stacks = []
+        next_sample = 0
+        while not self.stop_event.wait(POLL_INTERVAL):
+            beat = self.last_beat
+            now = time.monotonic()
+            if stall_beat is not None and beat != stall_beat:
+                # The event loop is running again; the stall lasted until this beat
+                duration = beat - stall_beat - interval
+                if duration < MAX_STALL_SECONDS:
+                    self.record(duration, stacks)
+                stall_beat = None
+            if now - beat - interval < self.threshold:
+                continue
+            if stall_beat is None:
+                stall_beat, stacks, next_sample = beat, [], now
+            if now >= next_sample and len(stacks) < MAX_STACKS:
+                stack = self.main_stack()
+                if stack:
+                    stacks.append(stack)
+                next_sample = now + SAMPLE_INTERVAL
+
+    def main_stack(self):
+        frame = sys._current_frames().get(self.main_thread_id)
+        if frame is None:
+            return None
+        return [[entry.filename, entry.lineno, entry.name] for entry in traceback.extract_stack(frame)]
+
+    def record(self, duration, stacks):
+        entry = {"time": time.time(), "duration_ms": round(duration * 1000, 1), "stacks": stacks}
+        try:
+            if os.path.exists(self.log_file) and os.path.getsize(self.log_file) > MAX_LOG_FILE_SIZE:
+                os.replace(self.log_file, self.log_file + ".1")
+            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
+            with open(self.log_file, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"Error writing stall log: {e}")
+
+    def stop(self):
+        self.heartbeat.stop()
+        self.stop_event.set()
+        self.watcher.join(timeout=1)
+
+
+def call_site(stack):
+    """The innermost frame of the app's own code, or the innermost frame if none is."""
+    for filename, line, function in reversed(stack):
+        if os.path.dirname(os.path.abspath(filename)) == APP_DIR:
+            break
+    else:
+        filename, line, function = stack[-1]
+    return f"{os.path.basename(filename)}:{line} in {function}"
+
+
+def summarize(path, top):
+    """Rank call sites by total stall time; each stall counts against where it was first sampled."""
+    sites = {}  # call site -> [stalls, total ms, worst ms]
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                duration = float(entry["duration_ms"])
+                site = call_site(entry["stacks"][0]) if entry["stacks"] else "(no Python frame sampled)"
+            except (ValueError, KeyError, TypeError, IndexError):
+                continue
+            stats = sites.setdefault(site, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+
+    if not sites:
+        print("No stalls recorded")
+        return
+    print(f"{sum(s[0] for s in sites.values())} stalls, {sum(s[1] for s in sites.values()) / 1000:,.1f} s in total\n")
+    print(f"{'total ms':>10} {'stalls':>7} {'worst ms':>9}  call site")
+    for site, (count, total, worst) in sorted(sites.items(), key=lambda item: item[1][1], reverse=True)[:top]:
+        print(f"{total:>10,.0f} {count:>7} {worst:>9,.0f}  {site}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank the call sites of recorded GUI-thread stalls")
+    parser.add_argument("--log", default=STALL_LOG_FILE)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    try:
+        summarize(args.log, args.top)
+    except OSError as e:
+        sys.exit(f"Cannot read {args.log}: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from functools import lru_cache
+
+from PySide6.QtWidgets import QApplication
+
+# Colours that don't depend on the selected assistant
+APP_PALETTE = {
+    "text": "#F5F5F5",
+    "background": "#1E1E1E",
+    "field": "#2A2A2A",
+    "field_border": "#4A4A4A",  # None for fields without their own border
+    "hover": "#3A3A3A",
+    "neutral": "#2A2A2A",  # Secondary buttons such as Close and Cancel
+    "panel_border": 2,
+    "toast_background": "rgba(30, 30, 30, 0.9)",
+    "icon_background": "rgba(30, 30, 30, 0.5)",
+}
+
+# Widgets opt in with a dynamic "role" property. Panel and toast declarations also apply to
+# their descendants, like the unscoped per-widget stylesheets they replace; the role rules
+# for buttons and fields are more specific and win over them.
+TEMPLATE = """
+*[role="panel"], *[role="panel"] * {{
+    background-color: {background}; color: {text}; border-radius: 10px; border: {panel_border}px solid {border_color};
+}}
+*[role="window"], *[role="window"] * {{ background-color: {background}; color: {text}; }}
+QLabel[role="title"] {{ font-size: 16px; font-weight: bold; }}
+QLabel[role="heading"] {{ font-size: 14px; font-weight: bold; }}
+QPushButton[role] {{ color: {text}; border-radius: 10px; padding: 5px; border: 2px solid transparent; }}
+QPushButton[role]:hover {{ border: 2px solid {text}; }}
+QPushButton[role="primary"] {{ background-color: {button_color}; }}
+QPushButton[role="neutral"] {{ background-color: {neutral}; }}
+QPushButton[role="submenu"] {{ background-color: {submenu_color}; }}
+QPushButton[role="size"] {{ background-color: {size_color}; }}
+QLineEdit[role="field"], QTextEdit[role="field"], QTextBrowser[role="field"], QListWidget[role="field"] {{
+    background-color: {field}; color: {text}; border-radius: 5px; padding: 5px;{field_border_rule}
+}}
+QListWidget[role="list"] {{ background-color: {field}; color: {text}; border-radius: 5px; outline: none;{field_border_rule} }}
+QListWidget[role="list"]::item {{ padding: 8px; border-bottom: 1px solid {field_border_or_hover}; background-color: {field}; }}
+QListWidget[role="list"]::item:hover {{ background-color: {hover}; color: {text}; }}
+QListWidget[role="list"]::item:selected {{ background-color: {button_color}; color: {text}; }}
+QListWidget[role="list"]::item:selected:hover {{ background-color: {submenu_color}; color: {text}; }}
+QSplitter[role="split"]::handle {{ background-color: {submenu_color}; width: 2px; }}
+QMenu[role="submenu"], QMenu[role="size"] {{ background-color: {background}; color: {text}; border-radius: 10px; }}
+QMenu[role="submenu"] {{ border: 2px solid {submenu_color}; }}
+QMenu[role="size"] {{ border: 2px solid {size_color}; }}
+*[role="toast"], *[role="toast"] * {{ background-color: {toast_background}; border-radius: 15px; border: 2px solid {border_color}; }}
+*[role="toast"] QLabel {{ color: {text}; font-size: 12px; font-weight: bold; }}
+QLabel[role="icon"] {{ border-radius: 32px; background-color: {icon_background}; }}
+"""
+
+
+@lru_cache(maxsize=16)
+def _compile(theme_items, palette_items):
+    values = dict(palette_items)
+    values.update(theme_items)
+    border = values["field_border"]
+    values["field_border_rule"] = f" border: 1px solid {border};" if border else ""
+    values["field_border_or_hover"] = border or values["hover"]
+    return TEMPLATE.format(**values)
+
+
+def compile_stylesheet(theme, palette=APP_PALETTE):
+    """The application stylesheet for an assistant theme (border, button, submenu and size colours)."""
+    return _compile(tuple(sorted(theme.items())), tuple(sorted(palette.items())))
+
+
+def apply_theme(theme, palette=APP_PALETTE):
+    """Restyle the whole application; Qt re-parses one stylesheet instead of one per widget."""
+    app = QApplication.instance()
+    stylesheet = compile_stylesheet(theme, palette)
+    if app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
+
+
+def set_role(widget, role):
+    widget.setProperty("role", role)
+    return widget
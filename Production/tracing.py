@@ -0,0 +1,127 @@
+"""Span instrumentation exported as Chrome trace-event JSON (open in ui.perfetto.dev or chrome://tracing).
+
+Enabled by "trace_file" in config/runtime.json, e.g. {"trace_file": "config/trace.json"}; the trace is
+written when the app exits. The setting is read once at import: when it is off, ``traced`` returns
+the function unchanged and the other helpers return after one flag check.
+"""
+import atexit
+import contextlib
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+
+from runtime_config import load_runtime_config
+
+# Configuration
+MAX_EVENTS = 500_000  # Later events are dropped so a long session can't grow without bound
+
+TRACE_FILE = load_runtime_config().get("trace_file")
+ENABLED = bool(TRACE_FILE)
+
+_events = []
+_ids = itertools.count(1)
+_start_ns = time.perf_counter_ns()
+_pid = os.getpid()
+_NO_SPAN = contextlib.nullcontext()
+
+
+def _now_us():
+    return (time.perf_counter_ns() - _start_ns) / 1000
+
+
+def _add(event):
+    if len(_events) < MAX_EVENTS:
+        event["pid"] = _pid
+        event["tid"] = threading.get_ident()
+        _events.append(event)  # list.append is atomic, so worker threads can record too
+
+
+class _Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, *exc_info):
+        event = {"name": self.name, "cat": self.category, "ph": "X", "ts": self.start, "dur": _now_us() - self.start}
+        if self.args:
+            event["args"] = self.args
+        _add(event)
+        return False
+
+
+def span(name, category="app", **args):
+    """Context manager timing the enclosed block."""
+    if not ENABLED:
+        return _NO_SPAN
+    return _Span(name, category, args)
+
+
+def traced(name=None, category="app"):
+    """Decorator timing every call of a function; a no-op when tracing is off.
+
+    Not for slots connected to signals with arguments the function doesn't take: the wrapper
+    accepts anything, so Qt would pass them all. Use ``span`` inside such slots instead.
+    """
+    def decorate(function):
+        if not ENABLED:
+            return function
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with _Span(label, category, None):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin(name, category="app", **args):
+    """Start a span that ends in a later event-loop callback; pass the returned id to ``end``."""
+    if not ENABLED:
+        return None
+    span_id = next(_ids)
+    _add({"name": name, "cat": category, "ph": "b", "id": span_id, "ts": _now_us(), "args": args})
+    return span_id
+
+
+def end(span_id, name, category="app", **args):
+    if not ENABLED or span_id is None:
+        return
+    _add({"name": name, "cat": category, "ph": "e", "id": span_id, "ts": _now_us(), "args": args})
+
+
+def trace_animation(animation, name):
+    """Record ``animation`` from now until it finishes."""
+    if not ENABLED:
+        return
+    span_id = begin(name, "animation")
+    animation.finished.connect(lambda: end(span_id, name, "animation"))
+
+
+def save_trace(path=None):
+    path = path or TRACE_FILE
+    if not path:
+        return
+    metadata = [{"name": "thread_name", "ph": "M", "pid": _pid, "tid": thread.ident, "args": {"name": thread.name}}
+                for thread in threading.enumerate()]
+    try:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": metadata + _events, "displayTimeUnit": "ms"}, f)
+    except OSError as e:
+        print(f"Error writing trace: {e}")
+
+
+if ENABLED:
+    atexit.register(save_trace)
@@ -0,0 +1,132 @@
+from PySide6.QtCore import QEvent, QObject, QPoint, Qt, QTimer, Signal
+from PySide6.QtWidgets import QApplication
+
+
+class WindowGroup(QObject):
+    """Moves top-level windows as one unit, anchored on one of them.
+
+    Drags only record where the group should go; the windows are moved at most once per
+    display frame, so a burst of mouse events costs one move per window. Moves made by the
+    group are never echoed back by the windows' own move handling.
+    """
+
+    moved = Signal()
+
+    def __init__(self, anchor, parent=None):
+        super().__init__(parent)
+        self.anchor = anchor
+        self.members = []
+        self.followed = {}  # followed window -> its size at the last move
+        self.handles = {}  # handle widget -> callback for a click that wasn't a drag
+        self.offsets = {}  # member -> offset from the anchor, taken when a move starts
+        self.target = None
+        self.source = None
+        self.applying = False
+        self.press_pos = None
+        self.drag_offset = None
+        self.dragging = False
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setTimerType(Qt.PreciseTimer)
+        self.frame_timer.timeout.connect(self.flush)
+        self.update_frame_interval()
+
+    def update_frame_interval(self):
+        screen = self.anchor.screen() or QApplication.primaryScreen()
+        rate = screen.refreshRate() if screen else 60
+        self.frame_timer.setInterval(max(1, round(1000 / (rate or 60))))
+
+    def attach(self, window, follow=False):
+        """Add ``window`` to the group; with ``follow``, moving it by other means (such as a
+        native title bar) moves the group too."""
+        if window not in self.members:
+            self.members.append(window)
+        if follow and window not in self.followed:
+            self.followed[window] = window.size()
+            window.installEventFilter(self)
+
+    def detach(self, window):
+        if window in self.members:
+            self.members.remove(window)
+        self.offsets.pop(window, None)
+        for handle in [handle for handle in self.handles if handle.window() is window]:
+            handle.removeEventFilter(self)
+            del self.handles[handle]
+        if window in self.followed:
+            del self.followed[window]
+            window.removeEventFilter(self)
+
+    def add_handle(self, widget, on_click=None):
+        """Dragging ``widget`` moves the group; a press and release without a drag calls on_click."""
+        self.handles[widget] = on_click
+        widget.installEventFilter(self)
+
+    def move_to(self, pos):
+        """Request the anchor at ``pos``; the first move of a burst is applied at once, the rest per frame."""
+        if self.target is None:
+            self.offsets = {window: window.pos() - self.anchor.pos() for window in self.members}
+        self.schedule(pos)
+
+    def schedule(self, pos, source=None):
+        self.target = QPoint(pos)
+        self.source = source
+        if not self.frame_timer.isActive():
+            self.flush()
+
+    def flush(self):
+        if self.target is None:
+            return
+        target, source = self.target, self.source
+        self.target = self.source = None
+        self.applying = True
+        try:
+            if source is not self.anchor:
+                self.anchor.move(target)
+            for window, offset in self.offsets.items():
+                if window is not source:
+                    window.move(target + offset)
+        finally:
+            self.applying = False
+        self.frame_timer.start()
+        self.moved.emit()
+
+    def follow(self, window, old_pos):
+        if self.target is None:
+            self.offsets = {member: member.pos() - self.anchor.pos() for member in self.members}
+            self.offsets[window] = old_pos - self.anchor.pos()
+        self.schedule(window.pos() - self.offsets[window], window)
+
+    def eventFilter(self, watched, event):
+        kind = event.type()
+        if kind == QEvent.Move and watched in self.followed:
+            # A move that comes with a new size is a resize (the window's own, or an edge drag), not a drag
+            size = watched.size()
+            resized = size != self.followed[watched]
+            self.followed[watched] = size
+            if not resized and not self.applying and watched.isVisible():
+                self.follow(watched, event.oldPos())
+            return False
+        if watched not in self.handles:
+            return False
+        if kind == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            self.press_pos = event.globalPosition().toPoint()
+            self.drag_offset = self.press_pos - self.anchor.pos()
+            self.dragging = False
+            self.update_frame_interval()
+            return True
+        if kind == QEvent.MouseMove and self.press_pos is not None and event.buttons() & Qt.LeftButton:
+            pos = event.globalPosition().toPoint()
+            if not self.dragging and (pos - self.press_pos).manhattanLength() < QApplication.startDragDistance():
+                return True
+            self.dragging = True
+            self.move_to(pos - self.drag_offset)
+            return True
+        if kind == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and self.press_pos is not None:
+            self.press_pos = None
+            if self.dragging:
+                self.flush()  # Land exactly where the button was released
+            elif self.handles[watched]:
+                self.handles[watched]()
+            return True
+        return False